@@ -2,12 +2,15 @@ from __future__ import annotations
 
 import os
 import sys
+import json
 import math
+import time
 import unittest
 import threading
 import dataclasses
 from typing import Iterable
 from pathlib import Path
+from unittest import mock
 
 # Webots specific library
 from controller import (
@@ -23,7 +26,13 @@ sys.path.insert(1, str(REPO_ROOT / 'modules'))
 
 from sr.robot3.coordinates import Position, Vector  # isort:skip
 from sr.robot3.vision import Orientation, markers_from_objects  # isort:skip
-from sr.robot3.camera import Camera, Marker  # isort:skip
+from sr.robot3.camera import (  # isort:skip
+    Camera,
+    Marker,
+    see_all,
+    HAS_NUMPY,
+    Detections,
+)
 from sr.robot3.utils import get_robot_device  # isort:skip
 
 ROBOT: WebotsRobot
@@ -81,7 +90,7 @@ class TestCamera(unittest.TestCase):
     webot: WebotsRobot
 
     def get_cameras(self, names: Iterable[str]) -> dict[str, Camera]:
-        cameras = {
+        return {
             name: Camera(
                 self.webot,
                 get_robot_device(self.webot, name, WebotCamera),
@@ -89,11 +98,6 @@ class TestCamera(unittest.TestCase):
             )
             for name in names
         }
-        # Warm up the cameras
-        with self.lock:
-            self.webot.step(TIMESTEP)
-            self.webot.step(TIMESTEP)
-        return cameras
 
     def get_camera(self, name: str) -> Camera:
         return self.get_cameras([name])[name]
@@ -103,7 +107,7 @@ class TestCamera(unittest.TestCase):
         cls.webot = ROBOT
 
     def setUp(self) -> None:
-        self.lock = threading.Lock()
+        self.lock = threading.RLock()
 
     def test_full(self) -> None:
         camera = self.get_camera('camera-marker-straight-ahead')
@@ -126,6 +130,105 @@ class TestCamera(unittest.TestCase):
             markers,
         )
 
+    def test_not_eager(self) -> None:
+        camera = self.get_camera('camera-marker-straight-ahead')
+
+        markers = camera.see()
+        time = self.webot.getTime()
+
+        cached_markers = camera.see(eager=False)
+
+        self.assertEqual(time, self.webot.getTime(), "Should not have advanced time")
+        self.assertEqual(time, cached_markers.timestamp, "Wrong frame timestamp")
+        self.assertEqual(markers, cached_markers)
+
+        cached_markers.clear()
+        self.assertEqual(markers, camera.see(eager=False), "Cached frame was modified")
+
+    def test_stream(self) -> None:
+        camera = self.get_camera('camera-marker-straight-ahead')
+
+        stream = camera.stream()
+        frames = [next(stream) for _ in range(3)]
+        stream.close()
+
+        timestamps = [x.timestamp for x in frames]
+        self.assertEqual(sorted(set(timestamps)), timestamps, "Frames should be new")
+        for frame in frames:
+            self.assertEqual([2], [x.id for x in frame])
+
+    def test_frame_callbacks(self) -> None:
+        camera = self.get_camera('camera-marker-straight-ahead')
+
+        frames: list[Detections] = []
+        camera.on_frame(frames.append)
+
+        first = camera.see()
+        second = camera.see()
+
+        camera.remove_frame_callback(frames.append)
+        camera.see()
+
+        self.assertEqual([first, second], frames)
+        self.assertEqual(
+            [first.timestamp, second.timestamp],
+            [x.timestamp for x in frames],
+        )
+
+    def test_see_all(self) -> None:
+        cameras = self.get_cameras([
+            'camera-marker-straight-ahead',
+            'camera-marker-oblique-control',
+        ])
+        cameras['camera-marker-straight-ahead'].see()
+
+        with self.lock:
+            frames = see_all(self.webot, list(cameras.values()))
+
+        self.assertEqual(set(cameras), set(frames))
+        self.assertEqual(
+            {self.webot.getTime()},
+            {x.timestamp for x in frames.values()},
+            "Frames should all be captured at the same time",
+        )
+        for name, frame in frames.items():
+            with self.subTest(name):
+                self.assertEqual(cameras[name].see(eager=False), frame)
+
+    def test_filters(self) -> None:
+        camera = self.get_camera('camera-marker-straight-ahead')
+
+        marker, = camera.see()
+
+        self.assertEqual([marker], camera.see(ids={marker.id}))
+        self.assertEqual([], camera.see(ids={marker.id + 1}))
+        self.assertEqual([], camera.see(max_distance=marker.position.distance - 1))
+        self.assertEqual([marker], camera.see(max_distance=marker.position.distance))
+        self.assertEqual([], camera.see(limit=0))
+
+    @unittest.skipUnless(HAS_NUMPY, "NumPy is not installed")
+    def test_capture(self) -> None:
+        camera = self.get_camera('camera-marker-straight-ahead')
+        webot_camera = camera.camera
+
+        image = camera.capture()
+
+        width = webot_camera.getWidth()
+        height = webot_camera.getHeight()
+        self.assertEqual((height, width, 3), image.shape)
+        self.assertIs(image, camera.capture(eager=False), "Should reuse the image")
+
+        raw = webot_camera.getImage()
+        x, y = width // 2, height // 2
+        self.assertEqual(
+            [
+                WebotCamera.imageGetBlue(raw, width, x, y),
+                WebotCamera.imageGetGreen(raw, width, x, y),
+                WebotCamera.imageGetRed(raw, width, x, y),
+            ],
+            image[y, x].tolist(),
+        )
+
     def test_positions(self) -> None:
         REFERENCE_DISTANCE = 1000
         OFFSET = 200
@@ -351,6 +454,7 @@ class TestCamera(unittest.TestCase):
             with self.subTest(name):
                 camera = cameras[name]
 
+                marker, = camera.see()
                 obj, = camera.camera.getRecognitionObjects()
 
                 (fiducial_marker, _), = markers_from_objects(
@@ -369,7 +473,6 @@ class TestCamera(unittest.TestCase):
                     f"Wrong top midpoint (model: {obj.getModel()})",
                 )
 
-                marker, = camera.see()
                 self.assertEqual(
                     marker_id,
                     marker.id,
@@ -581,9 +684,8 @@ class TestCamera(unittest.TestCase):
             with self.subTest(name):
                 camera = cameras[name]
 
-                obj, = camera.camera.getRecognitionObjects()
-
                 marker, = camera.see()
+                obj, = camera.camera.getRecognitionObjects()
                 self.assertEqual(
                     marker_id,
                     marker.id,
@@ -627,6 +729,98 @@ class TestCamera(unittest.TestCase):
                 )
 
 
+BENCHMARK_CAMERA = 'camera-benchmark'
+BENCHMARK_MARKER_COUNTS = (1, 5, 10, 20, 50)
+BENCHMARK_CALLS = 50
+
+BENCHMARK_MARKER_TEMPLATE = '''
+WallMarker {{
+  translation -3 {y} {z}
+  rotation 0 0 1 3.141592653589793
+  name "benchmark-marker-{marker_id}"
+  model "F{marker_id}"
+  texture_url [
+    "../textures/arena-markers/{texture_id}.png"
+  ]
+}}
+'''
+
+
+def benchmark_marker(marker_id: int) -> str:
+    """
+    Build a marker in a grid facing the benchmark camera, which is at (0, 0, 1)
+    looking along the negative x axis. The grid is 10 markers wide and 5 high.
+    """
+    row, column = divmod(marker_id, 10)
+    return BENCHMARK_MARKER_TEMPLATE.format(
+        y=round(0.22 * (column - 4.5), 3),
+        z=round(1 + 0.22 * (row - 2), 3),
+        marker_id=marker_id,
+        # There are only textures for the arena's markers.
+        texture_id=marker_id % 28,
+    )
+
+
+def run_benchmark(supervisor: Supervisor, output: Path) -> None:
+    """
+    Time `Camera.see` with increasing numbers of markers in view, splitting the
+    time spent in each call between stepping Webots (which includes rendering
+    and recognition) and processing in Python.
+    """
+    children = supervisor.getRoot().getField('children')
+    step_time = 0.
+
+    def timed_step(duration: int) -> int:
+        nonlocal step_time
+        start = time.perf_counter()
+        result = original_step(duration)
+        step_time += time.perf_counter() - start
+        return result
+
+    original_step = supervisor.step
+    camera = Camera(
+        supervisor,
+        get_robot_device(supervisor, BENCHMARK_CAMERA, WebotCamera),
+        threading.RLock(),
+    )
+
+    results = []
+    with mock.patch.object(supervisor, 'step', side_effect=timed_step):
+        spawned = 0
+        for count in BENCHMARK_MARKER_COUNTS:
+            for marker_id in range(spawned, count):
+                children.importMFNodeFromString(-1, benchmark_marker(marker_id))
+            spawned = count
+
+            # Let the new markers settle before timing anything.
+            seen = len(camera.see())
+
+            step_time = 0.
+            start = time.perf_counter()
+            for _ in range(BENCHMARK_CALLS):
+                camera.see()
+            wall_time = time.perf_counter() - start
+
+            results.append({
+                'markers': count,
+                'seen': seen,
+                'calls': BENCHMARK_CALLS,
+                'wall_seconds_per_call': wall_time / BENCHMARK_CALLS,
+                'step_seconds_per_call': step_time / BENCHMARK_CALLS,
+                'python_seconds_per_call': (wall_time - step_time) / BENCHMARK_CALLS,
+            })
+            print(f"Benchmarked {count} markers ({seen} seen)")  # noqa: T201
+
+    output.write_text(json.dumps(
+        {
+            'frame_rate': camera.frame_rate,
+            'numpy': HAS_NUMPY,
+            'results': results,
+        },
+        indent=2,
+    ) + '\n')
+
+
 def main() -> None:
     global ROBOT, TIMESTEP
     ROBOT = supervisor = Supervisor()
@@ -634,18 +828,20 @@ def main() -> None:
 
     supervisor.step(TIMESTEP)
 
-    tests = unittest.main(exit=False, buffer=True)
+    benchmark_output = os.environ.get('CAMERA_BENCHMARK_OUTPUT')
+    if benchmark_output:
+        run_benchmark(supervisor, Path(benchmark_output))
+        success = True
+    else:
+        tests = unittest.main(exit=False, buffer=True)
+        success = tests.result.wasSuccessful()
 
     # Ensure our printed output actually makes it to the console
     supervisor.step(TIMESTEP)
     supervisor.step(TIMESTEP)
 
     if os.environ.get('EXIT_AFTER_TESTS'):
-        supervisor.simulationQuit(status=(
-            0
-            if tests.result.wasSuccessful()
-            else 1
-        ))
+        supervisor.simulationQuit(status=0 if success else 1)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,265 @@
+"""
+An asyncio interface to the robot, driven by simulation time.
+
+Rather than each thread taking the step lock to advance the simulation, tasks
+on a `SimulationEventLoop` share a single clock: when every task is waiting,
+the loop advances Webots straight to the next time any of them needs to wake,
+in one step, however many tasks are waiting.
+
+Usage:
+
+    import asyncio
+    from sr.robot3 import A5, Robot
+    from sr.robot3.aio import AsyncRobot
+
+    robot = AsyncRobot(Robot())
+
+    async def drive() -> None:
+        while True:
+            distance = await robot.read(robot.robot.arduino.pins[A5].analog_read)
+            ...
+
+    async def vision() -> None:
+        while True:
+            markers = await robot.camera.see()
+            ...
+
+    async def main() -> None:
+        await asyncio.gather(drive(), vision())
+
+    robot.run(main())
+
+Tasks must not call the blocking parts of the robot API (such as
+`Robot.sleep`) since those stop every other task until they return.
+"""
+
+from __future__ import annotations
+
+import math
+import asyncio
+import selectors
+from typing import TypeVar, Callable, Awaitable, Container
+
+from sr.robot3.robot import Robot
+from sr.robot3.camera import Camera, Detections
+
+T = TypeVar('T')
+
+
+class _SimulationSelector(selectors.DefaultSelector):
+    """
+    A selector which advances the simulation instead of blocking.
+
+    Any file descriptors registered with the loop are still polled, once per
+    advance of the simulation.
+
+    Once the simulation ends, `on_end` is called instead of advancing it.
+    """
+
+    def __init__(self, robot: Robot, on_end: Callable[[], None]) -> None:
+        super().__init__()
+        self._robot = robot
+        self._on_end = on_end
+        self.ended = False
+
+    # `SelectorKey` has a field typed as `Any`
+    def select(  # type: ignore[explicit-any]
+        self,
+        timeout: float | None = None,
+    ) -> list[tuple[selectors.SelectorKey, int]]:
+        timestep = self._robot._timestep
+
+        if timeout is None:
+            # Nothing is scheduled, but the simulation must keep going
+            n_steps = 1
+        else:
+            # Round off floating point errors, which would otherwise cost a
+            # whole extra step.
+            n_steps = math.ceil(round(timeout * 1000, 6) / timestep)
+
+        if n_steps > 0:
+            if not self.ended:
+                self.ended = not self._robot.webots_step_and_should_continue(
+                    n_steps * timestep,
+                )
+
+            if self.ended:
+                # Time can no longer advance, so anything still waiting for it
+                # would wait forever.
+                self._on_end()
+
+        return super().select(0)
+
+
+class SimulationEventLoop(asyncio.SelectorEventLoop):
+    """
+    An event loop whose clock is the simulation time and which advances the
+    simulation whenever all its tasks are waiting.
+
+    Once the simulation ends, any tasks which wait for it to advance are
+    cancelled.
+    """
+
+    def __init__(self, robot: Robot) -> None:
+        super().__init__(_SimulationSelector(robot, self._cancel_all_tasks))
+        self._robot = robot
+
+    def _cancel_all_tasks(self) -> None:
+        for task in asyncio.all_tasks(self):
+            task.cancel()
+
+    def time(self) -> float:
+        return self._robot._webot.getTime()
+
+
+class AsyncCamera:
+    def __init__(self, robot: AsyncRobot, camera: Camera) -> None:
+        self._robot = robot
+        self.camera = camera
+
+    @property
+    def name(self) -> str:
+        return self.camera.name
+
+    async def see(
+        self,
+        *,
+        ids: Container[int] | None = None,
+        max_distance: float | None = None,
+        limit: int | None = None,
+    ) -> Detections:
+        """
+        Wait for the camera's next frame and return the markers in it, as for
+        `Camera.see`.
+        """
+        await asyncio.sleep(self.camera.time_to_next_frame())
+
+        return self.camera.see(
+            eager=False,
+            ids=ids,
+            max_distance=max_distance,
+            limit=limit,
+        )
+
+
+class AsyncRobot:
+    """
+    Wraps a `Robot` to provide awaitable versions of the parts of its API
+    which wait for the simulation to advance.
+
+    The underlying robot remains available as `robot`, for the parts of the
+    API which don't wait (such as setting motor powers).
+    """
+
+    def __init__(self, robot: Robot) -> None:
+        self.robot = robot
+        self._cameras = {
+            name: AsyncCamera(self, camera)
+            for name, camera in robot.cameras.items()
+        }
+
+    @property
+    def cameras(self) -> dict[str, AsyncCamera]:
+        return dict(self._cameras)
+
+    @property
+    def camera(self) -> AsyncCamera:
+        return self._cameras[self.robot.camera.name]
+
+    def time(self) -> float:
+        """
+        Roughly equivalent to `time.time` but for simulation time.
+        """
+        return self.robot.time()
+
+    async def sleep(self, secs: float) -> None:
+        """
+        Roughly equivalent to `asyncio.sleep` but accounting for simulation
+        time. As for `Robot.sleep` the delay is rounded up to a whole number of
+        simulation steps.
+        """
+        if secs < 0:
+            raise ValueError('sleep length must be non-negative')
+
+        await asyncio.sleep(secs)
+
+    async def next_step(self) -> None:
+        """
+        Wait for the simulation to advance by one step, after which the
+        sensors will have new values.
+        """
+        await asyncio.sleep(self.robot._timestep / 1000)
+
+    async def read(self, read: Callable[[], T]) -> T:
+        """
+        Wait for the simulation to advance by one step, then return the result
+        of the given sensor read. For example:
+
+            distance = await robot.read(robot.robot.arduino.pins[A5].analog_read)
+        """
+        await self.next_step()
+        return read()
+
+    async def wait_until(
+        self,
+        predicate: Callable[[], bool],
+        *,
+        timeout: float | None = None,
+        check_every: float = 0,
+    ) -> float:
+        """
+        Wait until the given predicate returns true, returning how much
+        simulation time passed, in seconds. As for `Robot.run_until`, but
+        allowing other tasks to run while waiting.
+        """
+        if timeout is not None and timeout < 0:
+            raise ValueError('timeout must be non-negative')
+        if check_every < 0:
+            raise ValueError('check_every must be non-negative')
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        # The loop rounds this up to a whole number of steps
+        interval_ms = max(check_every * 1000, self.robot._timestep)
+
+        def elapsed_ms() -> int:
+            return round((loop.time() - start) * 1000)
+
+        while not predicate():
+            delay_ms = interval_ms
+            if timeout is not None:
+                remaining_ms = math.ceil(timeout * 1000) - elapsed_ms()
+                if remaining_ms <= 0:
+                    raise TimeoutError(
+                        f"Predicate did not become true within {timeout} seconds",
+                    )
+                delay_ms = min(delay_ms, remaining_ms)
+
+            await asyncio.sleep(delay_ms / 1000)
+
+        return elapsed_ms() / 1000
+
+    def run(self, main: Awaitable[T]) -> T:
+        """
+        Run the given coroutine to completion on a `SimulationEventLoop`,
+        returning its result. Any other tasks still running when it completes
+        are cancelled.
+
+        If the simulation ends first, the coroutine is cancelled, so this
+        raises `asyncio.CancelledError`.
+        """
+        loop = SimulationEventLoop(self.robot)
+        try:
+            return loop.run_until_complete(main)
+        finally:
+            try:
+                tasks = asyncio.all_tasks(loop)
+                for task in tasks:
+                    task.cancel()
+                if tasks:
+                    loop.run_until_complete(
+                        asyncio.gather(*tasks, return_exceptions=True),
+                    )
+                loop.run_until_complete(loop.shutdown_asyncgens())
+            finally:
+                loop.close()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+
+"""
+Benchmarks for the camera's vision pipeline which can be run without Webots.
+
+The recognition objects which Webots would provide are replaced by synthetic
+ones at random poses, so this needs the stubs on the path:
+
+    PYTHONPATH=stubs:modules python -m sr.robot3.benchmark
+
+Results are written as JSON so that runs can be compared.
+"""
+
+from __future__ import annotations
+
+import sys
+import json
+import math
+import random
+import argparse
+import platform
+import threading
+from typing import Callable, Sequence, NamedTuple
+
+from sr.robot3 import camera
+from sr.robot3.fakes import (
+    FakeWebotsRobot,
+    FakeWebotsCamera,
+    FakeRecognitionObject,
+)
+from sr.robot3.vision import convert, markers_from_objects
+from sr.robot3.coordinates import backend
+from sr.robot3.coordinates.benchmark import time_call
+
+DEFAULT_COUNTS = (1, 10, 100, 500)
+
+# Broadly matches the camera on the robot.
+IMAGE_WIDTH = 800
+IMAGE_HEIGHT = 600
+FIELD_OF_VIEW = 1
+
+MARKER_SIZE_M = 0.2
+
+
+def random_recognition_object(rand: random.Random) -> FakeRecognitionObject:
+    """
+    Build a recognition object for a marker somewhere in front of the camera,
+    facing in a random direction.
+    """
+    distance = rand.uniform(0.3, 5)
+    half_fov = FIELD_OF_VIEW / 2
+    horizontal_angle = rand.uniform(-half_fov, half_fov)
+    vertical_angle = rand.uniform(-half_fov, half_fov) * IMAGE_HEIGHT / IMAGE_WIDTH
+
+    position = (
+        distance,
+        distance * math.tan(horizontal_angle),
+        distance * math.tan(vertical_angle),
+    )
+
+    axis = [rand.gauss(0, 1) for _ in range(3)]
+    length = math.sqrt(sum(x ** 2 for x in axis))
+    x, y, z = (x / length for x in axis)
+    orientation = (x, y, z, rand.uniform(-math.pi, math.pi))
+
+    # Project the marker onto the image.
+    focal_length = (IMAGE_WIDTH / 2) / math.tan(half_fov)
+    centre = (
+        int(IMAGE_WIDTH / 2 - focal_length * position[1] / distance),
+        int(IMAGE_HEIGHT / 2 - focal_length * position[2] / distance),
+    )
+    size = max(1, int(focal_length * MARKER_SIZE_M / distance))
+
+    return FakeRecognitionObject(
+        model=f'F{rand.randrange(100)}',
+        position=position,
+        orientation=orientation,
+        position_on_image=centre,
+        size_on_image=(size, size),
+    )
+
+
+class Result(NamedTuple):
+    name: str
+    markers: int
+    seconds_per_op: float
+
+    @property
+    def ops_per_second(self) -> float:
+        return 1 / self.seconds_per_op
+
+    @property
+    def seconds_per_marker(self) -> float:
+        return self.seconds_per_op / self.markers
+
+    def as_json(self) -> dict[str, str | int | float]:
+        return {
+            'name': self.name,
+            'markers': self.markers,
+            'seconds_per_op': self.seconds_per_op,
+            'ops_per_second': self.ops_per_second,
+            'seconds_per_marker': self.seconds_per_marker,
+        }
+
+
+def build_benchmarks(
+    objects: Sequence[FakeRecognitionObject],
+) -> dict[str, Callable[[], object]]:
+    marker_infos = [
+        info
+        for info in (camera.parse_marker_info(x) for x in objects)
+        if info is not None
+    ]
+    orientations = [convert.WebotsOrientation(*x.getOrientation()) for x in objects]
+
+    synthetic_camera = camera.Camera(
+        FakeWebotsRobot(timestep=8),
+        FakeWebotsCamera(objects=objects),
+        threading.RLock(),
+    )
+
+    def parse_marker_info() -> None:
+        for recognition_object in objects:
+            camera.parse_marker_info(recognition_object)
+
+    def rotation_matrix_from_axis_and_angle() -> None:
+        for orientation in orientations:
+            convert.rotation_matrix_from_axis_and_angle(orientation)
+
+    def yaw_pitch_roll_from_axis_and_angle() -> None:
+        for orientation in orientations:
+            convert.yaw_pitch_roll_from_axis_and_angle(orientation)
+
+    return {
+        'parse_marker_info': parse_marker_info,
+        'markers_from_objects': lambda: markers_from_objects(marker_infos),
+        'Camera._see': synthetic_camera._see,
+        'convert.rotation_matrix_from_axis_and_angle': rotation_matrix_from_axis_and_angle,
+        'convert.yaw_pitch_roll_from_axis_and_angle': yaw_pitch_roll_from_axis_and_angle,
+    }
+
+
+def run_benchmarks(
+    counts: Sequence[int] = DEFAULT_COUNTS,
+    *,
+    seed: int = 0,
+    repeat: int = 5,
+) -> list[Result]:
+    rand = random.Random(seed)
+
+    results = []
+    for count in counts:
+        objects = [random_recognition_object(rand) for _ in range(count)]
+        for name, func in build_benchmarks(objects).items():
+            results.append(Result(name, count, time_call(func, repeat)))
+
+    return results
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--counts',
+        type=int,
+        nargs='+',
+        default=DEFAULT_COUNTS,
+        help="Numbers of markers to benchmark with (default: %(default)s)",
+    )
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument(
+        '--output',
+        type=argparse.FileType(mode='w'),
+        default=sys.stdout,
+        help="Where to write the JSON results (default: stdout)",
+    )
+    return parser.parse_args()
+
+
+def main(args: argparse.Namespace) -> None:
+    results = run_benchmarks(args.counts, seed=args.seed, repeat=args.repeat)
+
+    json.dump(
+        {
+            'python': platform.python_version(),
+            'numpy_backend': backend.USE_NUMPY,
+            'compiled': backend.COMPILED,
+            'seed': args.seed,
+            'results': [x.as_json() for x in results],
+        },
+        args.output,
+        indent=2,
+    )
+    args.output.write('\n')
+
+
+if __name__ == '__main__':
+    main(parse_args())
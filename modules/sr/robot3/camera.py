@@ -1,8 +1,23 @@
 from __future__ import annotations
 
 import re
-import threading
-from typing import Container, NamedTuple
+import math
+import functools
+import collections
+from typing import (
+    List,
+    Callable,
+    Iterable,
+    Iterator,
+    Sequence,
+    Container,
+    Generator,
+    NamedTuple,
+    TYPE_CHECKING,
+)
+from pathlib import Path
+from contextlib import AbstractContextManager
+from collections import UserDict
 
 from controller import (
     Robot,
@@ -10,9 +25,24 @@ from controller import (
     CameraRecognitionObject as WebotsRecognitionObject,
 )
 from sr.robot3.vision import convert, Orientation, markers_from_objects
-from sr.robot3.coordinates import Position
+from sr.robot3.coordinates import Position, Quaternion
+
+from .utils import get_robot_devices
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+try:
+    from PIL import Image
+    HAS_PILLOW = True
+except ImportError:
+    HAS_PILLOW = False
 
-from .utils import maybe_get_robot_device
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
 
 MARKER_MODEL_RE = re.compile(r'^F(?P<id>\d{1,3})$')
 
@@ -29,22 +59,111 @@ class MarkerInfo(NamedTuple):
         return self.size_mm / 1000
 
 
-MARKER_SIZES: dict[Container[int], int] = {
+if TYPE_CHECKING:
+    _MarkerSizesBase = UserDict[Container[int], int]
+else:
+    _MarkerSizesBase = UserDict
+
+
+class MarkerSizes(_MarkerSizesBase):
+    """
+    Mapping of buckets of marker ids to the size of those markers, in
+    millimetres.
+
+    This keeps track of changes to its content so that lookups derived from it
+    know when to be rebuilt.
+    """
+
+    version = 0
+
+    def __setitem__(self, key: Container[int], value: int) -> None:
+        super().__setitem__(key, value)
+        self.version += 1
+
+    def __delitem__(self, key: Container[int]) -> None:
+        super().__delitem__(key)
+        self.version += 1
+
+
+MARKER_SIZES = MarkerSizes({
     range(50): 150,  # 0-49 = 150mm
     range(50, 100): 200,  # 50-99 = 200mm
     range(100, 200): 80,  # 100-199 = 80mm
-}
+})
 
+# The largest id which `MARKER_MODEL_RE` can match.
+MAX_MARKER_ID = 999
 
-def get_marker_size_mm(marker_id: int) -> int:
+
+class _MarkerTables(NamedTuple):
     """
-    Return the marker size in millimetres.
+    Lookups derived from a particular version of `MARKER_SIZES`.
     """
+
+    marker_sizes: MarkerSizes
+    version: int
+
+    # Marker sizes indexed by marker id, `None` for unknown ids.
+    size_by_id: list[int | None]
+
+    # Parsed `(code, size_mm)` by model name, `None` for non-marker models.
+    info_by_model: dict[str, tuple[int, int] | None]
+
+
+_marker_tables: _MarkerTables | None = None
+
+
+def _get_marker_tables() -> _MarkerTables:
+    global _marker_tables
+
+    tables = _marker_tables
+    if (
+        tables is None or
+        tables.marker_sizes is not MARKER_SIZES or
+        tables.version != MARKER_SIZES.version
+    ):
+        tables = _marker_tables = _MarkerTables(
+            marker_sizes=MARKER_SIZES,
+            version=MARKER_SIZES.version,
+            size_by_id=[_find_marker_size_mm(x) for x in range(MAX_MARKER_ID + 1)],
+            info_by_model={},
+        )
+
+    return tables
+
+
+def _find_marker_size_mm(marker_id: int) -> int | None:
     for bucket, size in MARKER_SIZES.items():
         if marker_id in bucket:
             return size
+    return None
 
-    raise ValueError(f"Unknown marker id {marker_id}")
+
+def get_marker_size_mm(marker_id: int) -> int:
+    """
+    Return the marker size in millimetres.
+    """
+    size_by_id = _get_marker_tables().size_by_id
+
+    if 0 <= marker_id < len(size_by_id):
+        size = size_by_id[marker_id]
+    else:
+        size = _find_marker_size_mm(marker_id)
+
+    if size is None:
+        raise ValueError(f"Unknown marker id {marker_id}")
+
+    return size
+
+
+def _parse_model(model: str) -> tuple[int, int] | None:
+    match = MARKER_MODEL_RE.match(model)
+    if match is None:
+        return None
+
+    code = int(match['id'])
+
+    return code, get_marker_size_mm(code)
 
 
 def parse_marker_info(recognition_object: WebotsRecognitionObject) -> MarkerInfo | None:
@@ -57,38 +176,178 @@ def parse_marker_info(recognition_object: WebotsRecognitionObject) -> MarkerInfo
     properties visible in the API.
 
     Examples: 'F00', 'F01', ...
+
+    The results of parsing each model (including models which are not markers)
+    are cached.
     """
 
-    match = MARKER_MODEL_RE.match(recognition_object.getModel())
-    if match is None:
+    model = recognition_object.getModel()
+    info_by_model = _get_marker_tables().info_by_model
+
+    try:
+        info = info_by_model[model]
+    except KeyError:
+        info = info_by_model[model] = _parse_model(model)
+
+    if info is None:
         return None
 
-    code = int(match['id'])
+    code, size_mm = info
 
     return MarkerInfo(
         recognition_object=recognition_object,
         code=code,
-        size_mm=get_marker_size_mm(code),
+        size_mm=size_mm,
     )
 
 
-class Marker(NamedTuple):
+# Build the lookups up front rather than during the first frame.
+_get_marker_tables()
+
+
+DEFAULT_POSITION = Position(0, 0, 0)
+DEFAULT_ORIENTATION = Orientation(0, 0, 0)
+
+
+class Marker:
     """
     Wrapper of a marker detection with axis and rotation calculated.
 
+    The position and orientation of markers created from Webots' data are only
+    calculated when first accessed. Otherwise this behaves as a `NamedTuple`
+    with the fields `id`, `size`, `position` and `orientation` (including
+    comparing equal to the equivalent tuple), except that it is not a `tuple`
+    subclass and so doesn't support tuple operators such as `+` and `<`.
+
     :param id: The ID of the detected marker
     :param size: The physical size of the marker in millimetres
     :param position: Position information of the marker relative to the camera
     :param orientation: Orientation information of the marker
     """
 
-    id: int  # noqa: A003 # match kit
-    size: int
+    __slots__ = (
+        '_id',
+        '_size',
+        '_position',
+        '_orientation',
+        '_webots_position',
+        '_rotation',
+    )
 
-    # Note: we are _not_ supporting image-related properties, so no `pixel_*`.
+    _fields = ('id', 'size', 'position', 'orientation')
+
+    _webots_position: tuple[float, float, float]
+    _rotation: Quaternion
+
+    def __init__(
+        self,
+        id: int,  # noqa: A002 # match kit
+        size: int,
+        # Note: we are _not_ supporting image-related properties, so no `pixel_*`.
+        position: Position = DEFAULT_POSITION,
+        orientation: Orientation = DEFAULT_ORIENTATION,
+    ) -> None:
+        self._id = id
+        self._size = size
+        self._position: Position | None = position
+        self._orientation: Orientation | None = orientation
+
+    @classmethod
+    def from_webots(
+        cls,
+        id: int,  # noqa: A002 # match kit
+        size: int,
+        position: tuple[float, float, float],
+        rotation: Quaternion,
+    ) -> Marker:
+        """
+        Construct an instance from a position (in metres) as reported by Webots
+        and the marker's rotation.
+        """
+        marker = cls.__new__(cls)
+        marker._id = id
+        marker._size = size
+        marker._position = None
+        marker._orientation = None
+        marker._webots_position = position
+        marker._rotation = rotation
+        return marker
 
-    position: Position = Position(0, 0, 0)
-    orientation: Orientation = Orientation(0, 0, 0)
+    @property
+    def id(self) -> int:  # noqa: A003 # match kit
+        return self._id
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def position(self) -> Position:
+        if self._position is None:
+            self._position = Position.from_cartesian_metres(self._webots_position)
+        return self._position
+
+    @property
+    def orientation(self) -> Orientation:
+        if self._orientation is None:
+            self._orientation = convert.yaw_pitch_roll_from_quaternion(self._rotation)
+        return self._orientation
+
+    @classmethod
+    def _make(cls, iterable: Iterable[int | Position | Orientation]) -> Marker:
+        values = tuple(iterable)
+        if len(values) != len(cls._fields):
+            raise TypeError(f"Expected {len(cls._fields)} arguments, got {len(values)}")
+        return cls(*values)  # type: ignore[arg-type]
+
+    def _astuple(self) -> tuple[int, int, Position, Orientation]:
+        return (self.id, self.size, self.position, self.orientation)
+
+    def _asdict(self) -> dict[str, int | Position | Orientation]:
+        return dict(zip(self._fields, self._astuple()))
+
+    def _replace(
+        self,
+        *,
+        id: int | None = None,  # noqa: A002 # match kit
+        size: int | None = None,
+        position: Position | None = None,
+        orientation: Orientation | None = None,
+    ) -> Marker:
+        return Marker(
+            id=self.id if id is None else id,
+            size=self.size if size is None else size,
+            position=self.position if position is None else position,
+            orientation=self.orientation if orientation is None else orientation,
+        )
+
+    def __iter__(self) -> Iterator[int | Position | Orientation]:
+        return iter(self._astuple())
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __getitem__(self, index: int) -> int | Position | Orientation:
+        return self._astuple()[index]
+
+    def count(self, value: object) -> int:
+        return self._astuple().count(value)
+
+    def index(self, value: object) -> int:
+        return self._astuple().index(value)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Marker):
+            return self._astuple() == other._astuple()
+        if isinstance(other, tuple):
+            return self._astuple() == other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self._astuple())
+
+    def __reduce__(self) -> tuple[type[Marker], tuple[int, int, Position, Orientation]]:
+        return (self.__class__, self._astuple())
 
     def __repr__(self) -> str:
         return (
@@ -98,21 +357,137 @@ class Marker(NamedTuple):
         )
 
 
+class Detections(List[Marker]):
+    """
+    The markers identified in a single camera frame, nearest first.
+
+    :param timestamp: The simulation time at which the frame was captured, in
+                      seconds.
+    """
+
+    def __init__(self, markers: Iterable[Marker] = (), *, timestamp: float) -> None:
+        super().__init__(markers)
+        self.timestamp = timestamp
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({super().__repr__()}, timestamp={self.timestamp})"
+
+
+class _MarkerQuery(NamedTuple):
+    """
+    Restrictions on which markers `Camera.see` returns.
+    """
+
+    ids: Container[int] | None = None
+    max_distance: float | None = None
+    limit: int | None = None
+
+    def max_distance_m(self) -> float | None:
+        """
+        The exclusive upper bound on the true distance (in metres) of markers
+        which match, or `None` if there isn't one.
+        """
+        if self.max_distance is None:
+            return None
+        # `Position.distance` is truncated to whole millimetres.
+        return (math.floor(self.max_distance) + 1) / 1000
+
+    def includes(self, marker_info: MarkerInfo) -> bool:
+        return self.ids is None or marker_info.code in self.ids
+
+    def apply(self, markers: Iterable[Marker]) -> list[Marker]:
+        """
+        Filter already processed markers, which must be nearest first.
+        """
+        matching = [
+            x
+            for x in markers
+            if (
+                (self.ids is None or x.id in self.ids) and
+                (self.max_distance is None or x.position.distance <= self.max_distance)
+            )
+        ]
+        return matching[:self.limit]
+
+
+_NO_QUERY = _MarkerQuery()
+
+
+# Approximately the frame rate of the camera in the kit, in frames per second.
+DEFAULT_FRAME_RATE = 30
+
+# How long the camera can go unused before it is switched off, in seconds.
+DEFAULT_IDLE_TIMEOUT = 2
+
+# How many frames `Camera.stream` queues up for a slow consumer, which is
+# about a second's worth at the default frame rate.
+DEFAULT_MAX_QUEUED_FRAMES = 30
+
+
 class Camera:
-    def __init__(self, webot: Robot, camera: WebotCamera, lock: threading.Lock) -> None:
+    def __init__(
+        self,
+        webot: Robot,
+        camera: WebotCamera,
+        lock: AbstractContextManager[object],
+        *,
+        frame_rate: float = DEFAULT_FRAME_RATE,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    ) -> None:
         self._webot = webot
         self._timestep = int(webot.getBasicTimeStep())
 
         self.camera = camera
-        self.camera.enable(self._timestep)
-        self.camera.recognitionEnable(self._timestep)
-
+        self.name = camera.getName()
         self._lock = lock
 
-    def see(self, *, eager: bool = True) -> list[Marker]:
+        # Rendering the camera and running recognition are expensive, so
+        # Webots is only asked to do them while the camera is in use. This is
+        # the simulation time (in milliseconds) at which the camera was last
+        # enabled, or `None` if it is currently disabled.
+        self._enabled_at_ms: int | None = None
+        self._last_used_ms = 0
+
+        self.frame_rate = frame_rate
+        self.idle_timeout = idle_timeout
+
+        # The most recently processed frame, keyed by its timestamp.
+        self._frame: Detections | None = None
+        self._image: tuple[int | None, NDArray[np.uint8]] | None = None
+
+        self._frame_callbacks: list[Callable[[Detections], None]] = []
+        # Frames which have been captured for the callbacks but not yet passed
+        # to them, since that must wait until the step lock is released.
+        self._pending_frames: list[Detections] = []
+        self._last_pending_timestamp: float | None = None
+
+        # The cameras (including this one) which share this camera's robot.
+        # All of them need to be told about the frames which pass while this
+        # camera is advancing the simulation.
+        self._peers: Sequence[Camera] = (self,)
+
+    def see(
+        self,
+        *,
+        eager: bool = True,
+        ids: Container[int] | None = None,
+        max_distance: float | None = None,
+        limit: int | None = None,
+    ) -> Detections:
         """
         Identify items which the camera can see and return a list of `Marker`
-        instances describing them.
+        instances describing them, nearest first.
+
+        :param eager: When true (the default) the simulation is advanced to
+                      capture a new frame. Otherwise the markers from the most
+                      recent frame are returned without advancing the simulation.
+        :param ids: Only return markers with these ids.
+        :param max_distance: Only return markers at most this far away, in
+                             millimetres.
+        :param limit: Return at most this many markers.
+
+        Filtering here rather than afterwards avoids processing markers which
+        would be discarded. Excluded markers still hide those behind them.
         """
         # Webots appears not to like it if you try to hang on to a
         # `CameraRecognitionObject` after another time-step has passed. However
@@ -122,10 +497,283 @@ class Camera:
         # processing. The objects which we pass back to the caller are safe to
         # use because they don't refer to Webots' objects at all.
         with self._lock:
-            self._webot.step(self._timestep)
-            return self._see()
+            self._step_for_frame(eager)
+            frame = self._get_frame(_MarkerQuery(ids, max_distance, limit))
+
+        dispatch_frames(self._peers)
+
+        # Copy the frame so that callers are free to modify what they're given.
+        return Detections(frame, timestamp=frame.timestamp)
+
+    def capture(self, *, eager: bool = True) -> NDArray[np.uint8]:
+        """
+        Take a photo with the camera and return it as a (height, width, 3)
+        array of BGR pixel values, as used by OpenCV.
+
+        The array is a read-only view onto the image which Webots provides;
+        copy it before modifying it. Requires NumPy.
+
+        :param eager: When true (the default) the simulation is advanced to
+                      capture a new frame. Otherwise the most recent frame is
+                      returned without advancing the simulation.
+        """
+        if not HAS_NUMPY:
+            raise RuntimeError("Capturing images requires NumPy to be installed")
+
+        with self._lock:
+            self._step_for_frame(eager)
+            image = self._get_image()
+
+        dispatch_frames(self._peers)
+        return image
+
+    def save(self, path: Path | str, *, frame: NDArray[np.uint8] | None = None) -> None:
+        """
+        Save an image from the camera to the given path. Requires Pillow.
+
+        :param frame: A previously captured image to save. If not given then a
+                      new image is captured.
+        """
+        if not HAS_PILLOW:
+            raise RuntimeError("Saving images requires Pillow to be installed")
+
+        if frame is None:
+            frame = self.capture()
+
+        # Reverse the channels to get RGB, which is what Pillow expects.
+        Image.fromarray(frame[:, :, ::-1]).save(path)
+
+    @property
+    def frame_rate(self) -> float:
+        """
+        The rate at which the camera captures frames, in frames per second.
+
+        Frames can only be captured at multiples of the simulation's time step,
+        so the actual rate may differ slightly from what was requested.
+        """
+        return 1000 / self._frame_period_ms
+
+    @frame_rate.setter
+    def frame_rate(self, frame_rate: float) -> None:
+        if frame_rate <= 0:
+            raise ValueError(f"Frame rate must be positive, not {frame_rate!r}")
+
+        n_steps = max(1, round(1000 / frame_rate / self._timestep))
+
+        with self._lock:
+            self._frame_period_ms = n_steps * self._timestep
+            if self._enabled_at_ms is not None:
+                self._enable()
+
+    def time_to_next_frame(self) -> float:
+        """
+        How much simulation time, in seconds, until the camera next captures a
+        frame. This doesn't advance the simulation, but does enable the camera
+        if needed, as though it were being used.
+        """
+        with self._lock:
+            self._mark_used()
+            return self._ms_to_next_frame() / 1000
+
+    def on_frame(self, callback: Callable[[Detections], None]) -> None:
+        """
+        Register a callback to be passed the markers from each new camera frame
+        as the simulation advances, however that happens.
+
+        Callbacks are run by whichever thread advanced the simulation, after it
+        has done so. The camera is kept enabled while it has callbacks.
+        """
+        with self._lock:
+            self._mark_used()
+            self._frame_callbacks.append(callback)
+
+    def remove_frame_callback(self, callback: Callable[[Detections], None]) -> None:
+        """
+        Unregister a callback previously registered with `on_frame`.
+        """
+        with self._lock:
+            self._frame_callbacks.remove(callback)
+
+    def stream(
+        self,
+        *,
+        max_queued: int = DEFAULT_MAX_QUEUED_FRAMES,
+    ) -> Generator[Detections, None, None]:
+        """
+        Yield the markers from each new camera frame in turn.
+
+        Frames which pass while the simulation is being advanced by other means
+        (for example `Robot.sleep`) are queued up and yielded in order. When no
+        frames are waiting, the simulation is advanced to the next one.
+
+        The stream ends if the simulation does. The camera is kept enabled
+        until the stream is closed (or garbage collected).
+
+        :param max_queued: The most frames to queue up; beyond this the oldest
+                           frames are dropped.
+        """
+        if max_queued < 1:
+            raise ValueError(f"max_queued must be at least 1, not {max_queued!r}")
+
+        frames: collections.deque[Detections] = collections.deque(maxlen=max_queued)
+        self.on_frame(frames.append)
+        try:
+            while True:
+                if not frames and not self._step_to_next_frame():
+                    return
+                yield frames.popleft()
+        finally:
+            self.remove_frame_callback(frames.append)
+
+    def _now_ms(self) -> int:
+        return round(self._webot.getTime() * 1000)
+
+    def _enable(self) -> None:
+        self.camera.enable(self._frame_period_ms)
+        self.camera.recognitionEnable(self._frame_period_ms)
+        self._enabled_at_ms = self._now_ms()
+        self._frame = None
+        self._image = None
+
+    def _disable(self) -> None:
+        self.camera.disable()
+        self.camera.recognitionDisable()
+        self._enabled_at_ms = None
+        self._frame = None
+        self._image = None
+
+    def _mark_used(self) -> None:
+        """
+        Note that the camera is in use, enabling it if needed.
+
+        The caller must hold the step lock.
+        """
+        self._last_used_ms = self._now_ms()
+        if self._enabled_at_ms is None:
+            self._enable()
+
+    def _disable_if_idle(self) -> None:
+        """
+        Disable the camera if it has not been used recently.
+
+        The caller must hold the step lock.
+        """
+        if (
+            self._enabled_at_ms is not None and
+            not self._frame_callbacks and
+            self._now_ms() - self._last_used_ms > self.idle_timeout * 1000
+        ):
+            self._disable()
+
+    def _ms_since_enabled(self) -> int:
+        assert self._enabled_at_ms is not None, "Camera is not enabled"
+        return self._now_ms() - self._enabled_at_ms
+
+    def _ms_to_next_frame(self) -> int:
+        # Webots captures the first frame one period after the camera is
+        # enabled, then once each period after that.
+        return self._frame_period_ms - self._ms_since_enabled() % self._frame_period_ms
+
+    def _last_frame_ms(self) -> int | None:
+        """
+        The simulation time at which the most recent frame was captured, or
+        `None` if no frame has been captured since the camera was enabled.
+        """
+        ms_since_enabled = self._ms_since_enabled()
+        if ms_since_enabled < self._frame_period_ms:
+            return None
+        return self._now_ms() - ms_since_enabled % self._frame_period_ms
+
+    def _step_for_frame(self, eager: bool) -> None:
+        """
+        Advance the simulation to the next frame if `eager` or if there isn't
+        a current frame.
+
+        The caller must hold the step lock.
+        """
+        self._mark_used()
+        if eager or self._last_frame_ms() is None:
+            step_cameras(self._webot, self._peers, self._ms_to_next_frame())
+
+    def _step_to_next_frame(self) -> bool:
+        """
+        Advance the simulation to the start of the next frame, returning
+        whether or not the simulation should continue.
+        """
+        with self._lock:
+            self._mark_used()
+            result = step_cameras(self._webot, self._peers, self._ms_to_next_frame())
+        dispatch_frames(self._peers)
+        return result != -1
+
+    def _capture_pending_frame(self) -> None:
+        """
+        Capture the current frame for the callbacks, if it is a new frame.
+
+        The caller must hold the step lock.
+        """
+        if self._last_frame_ms() != self._now_ms():
+            # Not at a frame boundary
+            return
+
+        frame = self._get_frame()
+        if frame.timestamp != self._last_pending_timestamp:
+            self._pending_frames.append(frame)
+            self._last_pending_timestamp = frame.timestamp
+
+    def _dispatch_pending_frames(self) -> None:
+        frames, self._pending_frames = self._pending_frames, []
+        for frame in frames:
+            # Iterate over a copy so that callbacks can unregister themselves.
+            for callback in list(self._frame_callbacks):
+                callback(Detections(frame, timestamp=frame.timestamp))
+
+    def _get_frame(self, query: _MarkerQuery = _NO_QUERY) -> Detections:
+        """
+        Get the markers in the current frame which match the query, processing
+        them only if that has not already been done for this frame.
+
+        The caller must hold the step lock.
+        """
+        frame_ms = self._last_frame_ms()
+        if frame_ms is None:
+            # The simulation ended before the first frame was captured.
+            return Detections(timestamp=self._webot.getTime())
+
+        timestamp = frame_ms / 1000
+        if self._frame is not None and self._frame.timestamp == timestamp:
+            if query == _NO_QUERY:
+                return self._frame
+            return Detections(query.apply(self._frame), timestamp=timestamp)
+
+        markers = self._see(query)
+        if query == _NO_QUERY:
+            # Only complete frames are worth keeping.
+            self._frame = Detections(markers, timestamp=timestamp)
+            return self._frame
+        return Detections(markers, timestamp=timestamp)
+
+    def _get_image(self) -> NDArray[np.uint8]:
+        """
+        Get the image for the current frame, reusing the one already built if
+        it is for the same frame.
+
+        The caller must hold the step lock.
+        """
+        frame_ms = self._last_frame_ms()
+        if self._image is None or self._image[0] != frame_ms:
+            width = self.camera.getWidth()
+            height = self.camera.getHeight()
+
+            # Webots provides the image as BGRA bytes; wrap them rather than
+            # copying, then slice off the alpha channel (which is also a view).
+            bgra = np.frombuffer(self.camera.getImage(), dtype=np.uint8)
+            image = bgra.reshape(height, width, 4)[:, :, :3]
+            self._image = (frame_ms, image)
+
+        return self._image[1]
 
-    def _see(self) -> list[Marker]:
+    def _see(self, query: _MarkerQuery = _NO_QUERY) -> list[Marker]:
         marker_infos = []
 
         for recognition_object in self.camera.getRecognitionObjects():
@@ -133,30 +781,112 @@ class Camera:
             if marker_info:
                 marker_infos.append(marker_info)
 
-        fiducial_markers = markers_from_objects(marker_infos)
-
-        markers = [
-            Marker(
+        include = None if query.ids is None else query.includes
+
+        markers = []
+        for fiducial_marker, marker_info in markers_from_objects(
+            marker_infos,
+            include=include,
+            max_distance=query.max_distance_m(),
+            limit=query.limit,
+        ):
+            x, y, z = fiducial_marker.position.data
+            markers.append(Marker.from_webots(
                 id=marker_info.code,
                 size=marker_info.size_mm,
-                position=Position.from_cartesian_metres(
-                    fiducial_marker.position.data,  # type: ignore[arg-type]
-                ),
-                orientation=convert.yaw_pitch_roll_from_axis_and_angle(
-                    convert.WebotsOrientation(
-                        *marker_info.recognition_object.getOrientation(),
-                    ),
-                ),
-            )
-            for fiducial_marker, marker_info in fiducial_markers
-        ]
+                position=(x, y, z),
+                rotation=fiducial_marker.rotation,
+            ))
+
         return markers
 
-    # The simulator does not emulate the `capture` or `save` methods.
 
+def step_cameras(webot: Robot, cameras: Sequence[Camera], duration_ms: int) -> int:
+    """
+    Advance the simulation by the given duration, capturing each frame which
+    passes along the way for any cameras which have frame callbacks and
+    disabling any cameras which have gone unused.
+
+    Returns the result of the last Webots step. The caller must hold the step
+    lock and should call `dispatch_frames` once it has released it.
+    """
+    listening = [x for x in cameras if x._frame_callbacks]
+    if not listening:
+        result = webot.step(duration_ms)
+    else:
+        remaining = duration_ms
+        while True:
+            duration = min(remaining, *(x._ms_to_next_frame() for x in listening))
+            result = webot.step(duration)
+            remaining -= duration
 
-def init_cameras(webot: Robot, lock: threading.Lock) -> list[Camera]:
-    camera = maybe_get_robot_device(webot, 'camera', WebotCamera)
-    if camera is None:
-        return []
-    return [Camera(webot, camera, lock)]
+            for camera in listening:
+                camera._capture_pending_frame()
+
+            if result == -1 or remaining <= 0:
+                break
+
+    for camera in cameras:
+        camera._disable_if_idle()
+
+    return result
+
+
+def dispatch_frames(cameras: Sequence[Camera]) -> None:
+    """
+    Pass the frames captured by `step_cameras` to the cameras' callbacks.
+
+    The callbacks run in the calling thread, so where possible the caller
+    should release the step lock first to avoid blocking other threads.
+    """
+    for camera in cameras:
+        camera._dispatch_pending_frames()
+
+
+def see_all(webot: Robot, cameras: Sequence[Camera]) -> dict[str, Detections]:
+    """
+    Advance the simulation to the next frame which all the cameras capture and
+    return what each of them sees in it, keyed by camera name.
+
+    Cameras which are disabled or which were enabled at different times are
+    (re-)enabled together so that their frames are captured at the same time.
+    Cameras with different frame rates only capture frames at the same time
+    once every least common multiple of their frame periods, so that is how
+    far apart the frames this returns may be.
+
+    The caller must hold the step lock and should call `dispatch_frames` once
+    it has released it.
+    """
+    if not cameras:
+        return {}
+
+    for camera in cameras:
+        camera._mark_used()
+
+    if len({x._enabled_at_ms for x in cameras}) > 1:
+        for camera in cameras:
+            camera._enable()
+
+    common_period_ms = functools.reduce(
+        lambda a, b: a * b // math.gcd(a, b),
+        (x._frame_period_ms for x in cameras),
+    )
+    ms_since_enabled = cameras[0]._ms_since_enabled()
+    step_cameras(webot, cameras, common_period_ms - ms_since_enabled % common_period_ms)
+
+    frames = {}
+    for camera in cameras:
+        frame = camera._get_frame()
+        # Copy the frame so that callers are free to modify what they're given.
+        frames[camera.name] = Detections(frame, timestamp=frame.timestamp)
+    return frames
+
+
+def init_cameras(webot: Robot, lock: AbstractContextManager[object]) -> list[Camera]:
+    cameras = [
+        Camera(webot, camera, lock)
+        for camera in get_robot_devices(webot, WebotCamera)
+    ]
+    for x in cameras:
+        x._peers = cameras
+    return cameras
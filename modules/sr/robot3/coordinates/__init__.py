@@ -1,9 +1,15 @@
 from __future__ import annotations
 
-from .vectors import Vector
+from .vectors import Vec3, Vector
+from .transform import Transform, FrameGraph
+from .quaternion import Quaternion
 from .twin_angle import Position
 
 __all__ = (
+    'Vec3',
     'Vector',
     'Position',
+    'Quaternion',
+    'Transform',
+    'FrameGraph',
 )
@@ -0,0 +1,283 @@
+"""
+NumPy implementations of `Vector` and `Matrix`.
+
+These have the same interface and equality semantics as the pure Python
+versions in `vectors` and `matrix`, which they replace when the NumPy backend
+is selected (see `backend`). They are not intended to be imported directly.
+
+The three-dimensional `Vec3` and `Mat3` keep their pure Python bases, so are
+registered as virtual subclasses of these instead.
+"""
+
+from __future__ import annotations
+
+import abc
+import math
+from typing import Iterable, overload
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+def _as_array(vector: Vector) -> NDArray[np.float64]:
+    # Subclasses (such as `Vec3`) store their values as a tuple instead.
+    if type(vector) is Vector:
+        return vector._array
+    return np.array(vector.data, dtype=np.float64)
+
+
+def _as_matrix_array(matrix: Matrix) -> NDArray[np.float64]:
+    # Subclasses (such as `Mat3`) store their values as tuples instead.
+    if type(matrix) is Matrix:
+        return matrix._array
+    return np.array(matrix.data, dtype=np.float64)
+
+
+# Only abstract so that `Vec3` can be registered as a subclass
+class Vector(metaclass=abc.ABCMeta):  # noqa: B024
+    """
+    An arbitrary length vector of floating point values.
+
+    In addition to the usual Python niceties, this supports scalar
+    multiplication & division, vector addition and vector multiplication (dot
+    product).
+    """
+
+    __slots__ = ('_array', '_data')
+
+    def __init__(self, data: Iterable[float] | NDArray[np.float64]) -> None:
+        if isinstance(data, np.ndarray):
+            self._array = data
+        else:
+            self._array = np.array(tuple(data), dtype=np.float64)
+        self._data: tuple[float, ...] | None = None
+
+    @property
+    def data(self) -> tuple[float, ...]:
+        if self._data is None:
+            self._data = tuple(self._array.tolist())
+        return self._data
+
+    def magnitude(self) -> float:
+        return math.sqrt(float(self._array @ self._array))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Vector):
+            return NotImplemented
+
+        return self.data == other.data
+
+    def __hash__(self) -> int:
+        return hash(self.data)
+
+    def __repr__(self) -> str:
+        return f'Vector({self.data!r})'
+
+    def __len__(self) -> int:
+        return len(self._array)
+
+    def __round__(self, precision: int) -> Vector:
+        return Vector(round(x, precision) for x in self.data)
+
+    def __neg__(self) -> Vector:
+        return Vector(-self._array)
+
+    def __add__(self, other: Vector) -> Vector:
+        if not isinstance(other, Vector):
+            return NotImplemented
+
+        if type(other) is not Vector:
+            # Let the reflected method of a registered subclass handle this,
+            # as Python would were it a real subclass.
+            return NotImplemented
+
+        if len(self) != len(other):
+            raise ValueError("Dimension mismatch: cannot add {} to {}".format(
+                len(self),
+                len(other),
+            ))
+
+        return Vector(self._array + _as_array(other))
+
+    def __sub__(self, other: Vector) -> Vector:
+        if not isinstance(other, Vector):
+            return NotImplemented
+
+        if type(other) is not Vector:
+            # Let the reflected method of a registered subclass handle this,
+            # as Python would were it a real subclass.
+            return NotImplemented
+
+        if len(self) != len(other):
+            raise ValueError("Dimension mismatch: cannot subtract {} from {}".format(
+                len(other),
+                len(self),
+            ))
+
+        return Vector(self._array - _as_array(other))
+
+    @overload
+    def __mul__(self, other: float) -> Vector:
+        ...
+
+    @overload
+    def __mul__(self, other: Vector) -> float:
+        ...
+
+    def __mul__(self, value: Vector | float) -> Vector | float:
+        if isinstance(value, (float, int)):
+            return Vector(self._array * value)
+
+        if not isinstance(value, Vector):
+            return NotImplemented
+
+        if len(self) != len(value):
+            raise ValueError("Dimension mismatch: cannot multiply {} by {}".format(
+                len(self),
+                len(value),
+            ))
+
+        return float(self._array @ _as_array(value))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other: float) -> Vector:
+        if not isinstance(other, (float, int)):
+            return NotImplemented
+
+        return Vector(self._array / other)
+
+
+# Only abstract so that `Mat3` can be registered as a subclass
+class Matrix(metaclass=abc.ABCMeta):  # noqa: B024
+    """
+    An arbitrary size matrix of floating point values.
+
+    In addition to the usual Python niceties, this supports scalar
+    multiplication, matrix addition and vector multiplication (dot product).
+    """
+
+    __slots__ = ('_array', '_data')
+
+    def __init__(self, data: Iterable[Iterable[float]] | NDArray[np.float64]) -> None:
+        if isinstance(data, np.ndarray):
+            self._array = data
+        else:
+            tuple_data = tuple(tuple(x) for x in data)
+
+            lengths = {len(x) for x in tuple_data}
+
+            if len(lengths) != 1:
+                raise ValueError(f"Malformed input to Matrix: {tuple_data!r}")
+
+            self._array = np.array(tuple_data, dtype=np.float64)
+
+        self._data: tuple[tuple[float, ...], ...] | None = None
+
+    @property
+    def data(self) -> tuple[tuple[float, ...], ...]:
+        if self._data is None:
+            self._data = tuple(tuple(row) for row in self._array.tolist())
+        return self._data
+
+    @property
+    def dimensions(self) -> tuple[int, int]:
+        rows, columns = self._array.shape
+        return rows, columns
+
+    def transpose(self) -> Matrix:
+        return Matrix(self._array.T)
+
+    def __round__(self, precision: int) -> Matrix:
+        return Matrix(
+            (round(x, precision) for x in row)
+            for row in self.data
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Matrix):
+            return NotImplemented
+
+        return self.data == other.data
+
+    def __hash__(self) -> int:
+        return hash(self.data)
+
+    def __repr__(self) -> str:
+        return 'Matrix((\n    {},\n))'.format(
+            ',\n    '.join(repr(x) for x in self.data),
+        )
+
+    def __neg__(self) -> Matrix:
+        return Matrix(-self._array)
+
+    def __add__(self, other: Matrix) -> Matrix:
+        if not isinstance(other, Matrix):
+            return NotImplemented
+
+        if type(other) is not Matrix:
+            # Let the reflected method of a registered subclass handle this,
+            # as Python would were it a real subclass.
+            return NotImplemented
+
+        if self.dimensions != other.dimensions:
+            raise ValueError("Dimension mismatch: cannot add {} to {}".format(
+                self.dimensions,
+                other.dimensions,
+            ))
+
+        return Matrix(self._array + _as_matrix_array(other))
+
+    def __sub__(self, other: Matrix) -> Matrix:
+        if not isinstance(other, Matrix):
+            return NotImplemented
+
+        if type(other) is not Matrix:
+            # Let the reflected method of a registered subclass handle this,
+            # as Python would were it a real subclass.
+            return NotImplemented
+
+        return self.__add__(-other)
+
+    @overload
+    def __mul__(self, vector: Vector) -> Vector:
+        ...
+
+    @overload
+    def __mul__(self, vector: tuple[float, ...]) -> tuple[float, ...]:
+        ...
+
+    def __mul__(
+        self,
+        vector: Vector | tuple[float, ...],
+    ) -> Vector | tuple[float, ...]:
+        if len(vector) != self.dimensions[1]:
+            raise ValueError("Dimension mismatch: cannot multiply {} by {}".format(
+                self.dimensions,
+                len(vector),
+            ))
+
+        if isinstance(vector, Vector):
+            return Vector(self._array @ _as_array(vector))
+
+        values: list[float] = (self._array @ np.array(vector, dtype=np.float64)).tolist()
+        return tuple(values)
+
+    __rmul__ = __mul__
+
+    def __matmul__(self, other: Matrix) -> Matrix:
+        if not isinstance(other, Matrix):
+            return NotImplemented
+
+        if type(other) is not Matrix:
+            # Let the reflected method of a registered subclass handle this,
+            # as Python would were it a real subclass.
+            return NotImplemented
+
+        if self.dimensions[1] != other.dimensions[0]:
+            raise ValueError("Dimension mismatch: cannot multiply {} by {}".format(
+                self.dimensions,
+                other.dimensions,
+            ))
+
+        return Matrix(self._array @ _as_matrix_array(other))
@@ -0,0 +1,58 @@
+"""
+Selection of the implementation used for `Vector` and `Matrix`.
+
+Both have a pure Python implementation and a NumPy one with the same interface.
+Which is used is decided once, at import time, from the `SR_COORDINATES_BACKEND`
+environment variable:
+
+- `python` (the default): use the pure Python implementation
+- `numpy`: use the NumPy implementation, failing if NumPy is missing
+
+The pure Python implementation is the default since it is the faster of the two
+for the small vectors and matrices the robot works with; the overhead of
+creating each NumPy array outweighs any saving on the arithmetic.
+
+When the package has been compiled with mypyc (see `script/compile/build`) only
+the compiled pure Python implementation can be used, since compiled code binds
+to its classes directly and cannot have them swapped out.
+"""
+
+from __future__ import annotations
+
+import os
+from importlib.machinery import EXTENSION_SUFFIXES
+
+BACKEND_ENV_VAR = 'SR_COORDINATES_BACKEND'
+
+BACKENDS = ('python', 'numpy')
+
+# Whether this module (and the rest of the package) has been compiled by mypyc,
+# in which case it is loaded from an extension module rather than source (or
+# bytecode, which is still the pure Python module).
+COMPILED = __file__.endswith(tuple(EXTENSION_SUFFIXES))
+
+
+def _use_numpy() -> bool:
+    choice = os.environ.get(BACKEND_ENV_VAR, 'python')
+    if choice not in BACKENDS:
+        raise ValueError(
+            f"Unknown coordinates backend {choice!r} (from {BACKEND_ENV_VAR}), "
+            f"expected one of {', '.join(BACKENDS)}",
+        )
+
+    if choice == 'python':
+        return False
+
+    if COMPILED:
+        raise ValueError(
+            f"Cannot use the numpy coordinates backend (from {BACKEND_ENV_VAR}) "
+            "with the compiled package",
+        )
+
+    # Fail here, rather than on first use, if NumPy is missing.
+    import numpy  # noqa: F401
+
+    return True
+
+
+USE_NUMPY: bool = _use_numpy()
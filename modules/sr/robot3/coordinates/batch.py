@@ -0,0 +1,101 @@
+"""
+Vectorised equivalents of the coordinate conversions in `twin_angle` and
+`polar`.
+
+These take an (N, 3) array (or a sequence of 3-tuples) of cartesian points and
+return the converted values as a column per field, which avoids the per-call
+overheads of converting the points one at a time.
+
+This module requires NumPy, which is not a hard dependency of the simulator.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Tuple, Iterable, NamedTuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+Points = Iterable[Tuple[float, float, float]]
+
+
+class PositionColumns(NamedTuple):
+    """
+    The fields of a number of `Position`s, one array per field.
+    """
+
+    distance: NDArray[np.int64]
+    horizontal_angle: NDArray[np.float64]
+    vertical_angle: NDArray[np.float64]
+
+
+class PolarColumns(NamedTuple):
+    """
+    The fields of a number of `PolarCoord`s, one array per field.
+    """
+
+    length: NDArray[np.float64]
+    rot_x: NDArray[np.float64]
+    rot_y: NDArray[np.float64]
+
+
+def as_points(cartesians: NDArray[np.float64] | Points) -> NDArray[np.float64]:
+    """
+    Convert the given points to an (N, 3) array.
+    """
+    if isinstance(cartesians, np.ndarray):
+        points = cartesians.astype(np.float64, copy=False)
+    else:
+        points = np.array(list(cartesians), dtype=np.float64)
+
+    if points.size == 0:
+        return points.reshape(0, 3)
+
+    if points.ndim != 2 or points.shape[1] != 3:
+        raise ValueError(f"Expected an (N, 3) array of points, not {points.shape}")
+
+    return points
+
+
+def positions_from_cartesian_metres(
+    cartesians: NDArray[np.float64] | Points,
+) -> PositionColumns:
+    """
+    Vectorised `Position.from_cartesian_metres`.
+    """
+    points = as_points(cartesians)
+    x, y, z = points.T
+
+    scaled = np.sqrt(np.einsum('ij,ij->i', points, points)) * 1000
+
+    # The distances are truncated, so must match `math.hypot` exactly. The two
+    # can differ in the last place, which only matters for values very close
+    # to a whole number of millimetres, so recompute those the slow way.
+    near_integer, = np.nonzero(np.abs(scaled - np.rint(scaled)) <= scaled * 1e-12)
+    for index in near_integer.tolist():
+        scaled[index] = math.hypot(*points[index].tolist()) * 1000
+
+    return PositionColumns(
+        distance=scaled.astype(np.int64),
+        horizontal_angle=np.arctan2(-y, x),
+        vertical_angle=np.arctan2(z, x),
+    )
+
+
+def polar_coords_from_cartesian(cartesians: NDArray[np.float64] | Points) -> PolarColumns:
+    """
+    Vectorised `polar_from_cartesian`.
+    """
+    points = as_points(cartesians)
+    x, y, z = points.T
+
+    length = np.sqrt(np.einsum('ij,ij->i', points, points))
+    if not np.all(length):
+        raise ZeroDivisionError("Cannot convert the zero vector to polar coordinates")
+
+    return PolarColumns(
+        length=length,
+        rot_x=np.arcsin(y / length),
+        rot_y=np.arctan2(x, z),
+    )
@@ -0,0 +1,285 @@
+#!/usr/bin/env python
+
+"""
+Benchmarks for the coordinate utilities and the orientation conversions used
+by the vision pipeline, which can be run without Webots.
+
+Importing the `sr.robot3` package needs the stubs on the path:
+
+    PYTHONPATH=stubs:modules python -m sr.robot3.coordinates.benchmark --output baseline.json
+
+Later runs can then be compared against that baseline, reporting (and exiting
+non-zero for) any benchmarks which have slowed down by more than a threshold:
+
+    PYTHONPATH=stubs:modules python -m sr.robot3.coordinates.benchmark --compare baseline.json
+
+Comparing a run of the modules compiled by `script/compile/build` against a
+baseline of the pure Python modules shows the speedup from compiling them.
+"""
+
+from __future__ import annotations
+
+import sys
+import json
+import math
+import random
+import timeit
+import argparse
+import platform
+from typing import Dict, Callable, Sequence, NamedTuple
+
+from sr.robot3.vision import convert
+
+from . import backend, vectors
+from .polar import polar_from_cartesian
+from .matrix import Matrix
+from .vectors import Vector
+from .twin_angle import Position
+
+# Each benchmark runs its operation over this many inputs, which keeps the
+# overhead of the timing loop out of the per-operation results.
+INPUTS_PER_RUN = 100
+
+# Slowdowns larger than this fraction are reported as regressions. This allows
+# for the noise between runs on a typical machine.
+DEFAULT_THRESHOLD = 0.25
+
+Results = Dict[str, float]
+
+
+class Comparison(NamedTuple):
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        """
+        The fractional change in time per operation; positive is slower.
+        """
+        return self.current / self.baseline - 1
+
+
+def random_unit_axis(rand: random.Random) -> tuple[float, float, float]:
+    axis = [rand.gauss(0, 1) for _ in range(3)]
+    length = math.sqrt(sum(x ** 2 for x in axis))
+    x, y, z = (x / length for x in axis)
+    return x, y, z
+
+
+def time_call(func: Callable[[], object], repeat: int) -> float:
+    """
+    Time the given function, returning the fastest time for a single call.
+
+    Each of the `repeat` runs calls the function enough times to take at least
+    0.2 seconds, which keeps timer resolution from dominating fast functions.
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def build_benchmarks(rand: random.Random) -> dict[str, Callable[[], object]]:
+    points = [
+        (rand.uniform(0.1, 5), rand.uniform(-5, 5), rand.uniform(-5, 5))
+        for _ in range(INPUTS_PER_RUN)
+    ]
+    pairs = list(zip(
+        [Vector(x) for x in points],
+        [Vector(x) for x in reversed(points)],
+    ))
+    matrices = [
+        Matrix((
+            (rand.uniform(-1, 1), rand.uniform(-1, 1), rand.uniform(-1, 1))
+            for _ in range(3)
+        ))
+        for _ in range(INPUTS_PER_RUN)
+    ]
+    orientations = [
+        convert.WebotsOrientation(*random_unit_axis(rand), rand.uniform(-math.pi, math.pi))
+        for _ in range(INPUTS_PER_RUN)
+    ]
+
+    def vector_add() -> None:
+        for a, b in pairs:
+            _ = a + b
+
+    def vector_dot_product() -> None:
+        for a, b in pairs:
+            _ = a * b
+
+    def vector_scale() -> None:
+        for a, _ in pairs:
+            _ = a * 2.5
+
+    def vector_magnitude() -> None:
+        for a, _ in pairs:
+            a.magnitude()
+
+    def matrix_multiply_vector() -> None:
+        for matrix, (a, _) in zip(matrices, pairs):
+            _ = matrix * a
+
+    def matrix_multiply_matrix() -> None:
+        for a, b in zip(matrices, reversed(matrices)):
+            _ = a @ b
+
+    def angle_between() -> None:
+        for a, b in pairs:
+            vectors.angle_between(a, b)
+
+    def unit_vector() -> None:
+        for a, _ in pairs:
+            vectors.unit_vector(a)
+
+    def polar() -> None:
+        for a, _ in pairs:
+            polar_from_cartesian(a)
+
+    def position() -> None:
+        for point in points:
+            Position.from_cartesian_metres(point)
+
+    def rotation_matrix_from_axis_and_angle() -> None:
+        for orientation in orientations:
+            convert.rotation_matrix_from_axis_and_angle(orientation)
+
+    def yaw_pitch_roll_from_axis_and_angle() -> None:
+        for orientation in orientations:
+            convert.yaw_pitch_roll_from_axis_and_angle(orientation)
+
+    return {
+        'Vector.__add__': vector_add,
+        'Vector.__mul__(Vector)': vector_dot_product,
+        'Vector.__mul__(float)': vector_scale,
+        'Vector.magnitude': vector_magnitude,
+        'Matrix.__mul__': matrix_multiply_vector,
+        'Matrix.__matmul__': matrix_multiply_matrix,
+        'vectors.angle_between': angle_between,
+        'vectors.unit_vector': unit_vector,
+        'polar.polar_from_cartesian': polar,
+        'Position.from_cartesian_metres': position,
+        'convert.rotation_matrix_from_axis_and_angle': rotation_matrix_from_axis_and_angle,
+        'convert.yaw_pitch_roll_from_axis_and_angle': yaw_pitch_roll_from_axis_and_angle,
+    }
+
+
+def run_benchmarks(*, seed: int = 0, repeat: int = 5) -> Results:
+    """
+    Run the benchmarks, returning the time per operation for each, in seconds.
+    """
+    benchmarks = build_benchmarks(random.Random(seed))
+    return {
+        name: time_call(func, repeat) / INPUTS_PER_RUN
+        for name, func in benchmarks.items()
+    }
+
+
+def compare(baseline: Results, current: Results) -> list[Comparison]:
+    """
+    Compare the results of the benchmarks which appear in both runs.
+    """
+    return [
+        Comparison(name, baseline[name], current[name])
+        for name in current
+        if name in baseline
+    ]
+
+
+def report(comparisons: Sequence[Comparison], threshold: float) -> bool:
+    """
+    Print a table of the given comparisons, returning whether any of them have
+    slowed down by more than the threshold.
+    """
+    regressed = False
+    print(f"{'benchmark':<45} {'baseline':>10} {'current':>10} {'change':>8}")  # noqa: T201
+    for comparison in comparisons:
+        flag = ''
+        if comparison.change > threshold:
+            flag = '  SLOWER'
+            regressed = True
+        print(  # noqa: T201
+            f"{comparison.name:<45} "
+            f"{comparison.baseline * 1e6:>8.3f}us "
+            f"{comparison.current * 1e6:>8.3f}us "
+            f"{comparison.change:>+8.1%}{flag}",
+        )
+    return regressed
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument(
+        '--output',
+        type=argparse.FileType(mode='w'),
+        help=(
+            "Where to write the JSON results, for use as a baseline "
+            "(default: stdout, unless comparing)"
+        ),
+    )
+    parser.add_argument(
+        '--compare',
+        type=argparse.FileType(mode='r'),
+        metavar='BASELINE',
+        help="A previous JSON output to compare against",
+    )
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=(
+            "The fractional slowdown beyond which a benchmark counts as having "
+            "regressed (default: %(default)s)"
+        ),
+    )
+    return parser.parse_args()
+
+
+def main(args: argparse.Namespace) -> None:
+    results = run_benchmarks(seed=args.seed, repeat=args.repeat)
+
+    output = args.output
+    if output is None and args.compare is None:
+        output = sys.stdout
+
+    if output is not None:
+        json.dump(
+            {
+                'python': platform.python_version(),
+                'numpy_backend': backend.USE_NUMPY,
+                'compiled': backend.COMPILED,
+                'seed': args.seed,
+                'results': results,
+            },
+            output,
+            indent=2,
+        )
+        output.write('\n')
+
+    if args.compare is not None:
+        baseline = json.load(args.compare)
+        if baseline['numpy_backend'] != backend.USE_NUMPY:
+            print(  # noqa: T201
+                "Warning: baseline was run with a different coordinates backend",
+                file=sys.stderr,
+            )
+        baseline_compiled = baseline.get('compiled', False)
+        if baseline_compiled != backend.COMPILED:
+            print(  # noqa: T201
+                "Note: baseline was run with {} modules".format(
+                    'compiled' if baseline_compiled else 'pure Python',
+                ),
+                file=sys.stderr,
+            )
+        regressed = report(compare(baseline['results'], results), args.threshold)
+        if regressed:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main(parse_args())
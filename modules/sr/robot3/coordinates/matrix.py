@@ -4,9 +4,10 @@ Matrix utilities.
 
 from __future__ import annotations
 
-from typing import Iterable, overload
+from typing import Iterable, overload, TYPE_CHECKING
 
-from .vectors import Vector
+from .backend import USE_NUMPY
+from .vectors import Vec3, Vector
 
 
 class Matrix:
@@ -111,22 +112,241 @@ class Matrix:
         else:
             return tuple(values)
 
-    __rmul__ = __mul__
+    @overload
+    def __rmul__(self, vector: Vector) -> Vector:
+        ...
+
+    @overload
+    def __rmul__(self, vector: tuple[float, ...]) -> tuple[float, ...]:
+        ...
+
+    def __rmul__(
+        self,
+        vector: Vector | tuple[float, ...],
+    ) -> Vector | tuple[float, ...]:
+        # Not an alias of `__mul__`, which mypyc would compile as an attribute
+        return self.__mul__(vector)
 
     def __matmul__(self, other: Matrix) -> Matrix:
         if not isinstance(other, Matrix):
             return NotImplemented  # type: ignore[unreachable]
 
-        if self.dimensions != tuple(reversed(other.dimensions)):
+        if self.dimensions[1] != other.dimensions[0]:
             raise ValueError("Dimension mismatch: cannot multiply {} by {}".format(
                 self.dimensions,
                 other.dimensions,
             ))
 
+        columns = tuple(zip(*other.data))
+
         return Matrix(
             (
-                sum(x * y for x, y in zip(row_self, row_other))
-                for row_other in other.transpose().data
+                sum(x * y for x, y in zip(row_self, column))
+                for column in columns
             )
             for row_self in self.data
         )
+
+
+# See the equivalent handling in `vectors`.
+_TupleMatrix = Matrix
+
+if USE_NUMPY and not TYPE_CHECKING:
+    # Replace the pure Python implementation above; see `backend`.
+    from ._numpy_backend import Matrix
+
+
+class Mat3(_TupleMatrix):
+    """
+    A 3x3 matrix of floating point values.
+
+    This behaves like (and compares equal to) a `Matrix` with the same values,
+    but has its arithmetic written out for three dimensions to avoid the
+    overheads of the generic implementation. Multiplying a `Mat3` by a vector
+    produces a `Vec3`.
+
+    Instances are treated as immutable.
+    """
+
+    __slots__ = ('data',)
+
+    def __init__(self, data: Iterable[Iterable[float]]) -> None:
+        try:
+            (a, b, c), (d, e, f), (g, h, i) = data
+        except ValueError:
+            raise ValueError(f"Malformed input to Mat3: {data!r}") from None
+
+        self.data = ((a, b, c), (d, e, f), (g, h, i))
+
+    @classmethod
+    def from_matrix(cls, matrix: Matrix) -> Mat3:
+        """
+        Convert a generic 3x3 matrix to a `Mat3`.
+        """
+        if isinstance(matrix, Mat3):
+            return matrix
+
+        if matrix.dimensions != (3, 3):
+            raise ValueError(f"Cannot convert a {matrix.dimensions} matrix to a Mat3")
+
+        return cls(matrix.data)
+
+    @property
+    def dimensions(self) -> tuple[int, int]:
+        return 3, 3
+
+    def transpose(self) -> Mat3:
+        (a, b, c), (d, e, f), (g, h, i) = self.data
+        return Mat3(((a, d, g), (b, e, h), (c, f, i)))
+
+    def __round__(self, precision: int) -> Mat3:
+        return Mat3(
+            (round(x, precision) for x in row)
+            for row in self.data
+        )
+
+    def __repr__(self) -> str:
+        return 'Mat3((\n    {},\n))'.format(
+            ',\n    '.join(repr(x) for x in self.data),
+        )
+
+    def __neg__(self) -> Mat3:
+        (a, b, c), (d, e, f), (g, h, i) = self.data
+        return Mat3(((-a, -b, -c), (-d, -e, -f), (-g, -h, -i)))
+
+    def __add__(self, other: Matrix) -> Mat3:
+        if not isinstance(other, Matrix):
+            return NotImplemented
+
+        if other.dimensions != (3, 3):
+            raise ValueError("Dimension mismatch: cannot add {} to {}".format(
+                self.dimensions,
+                other.dimensions,
+            ))
+
+        (a, b, c), (d, e, f), (g, h, i) = self.data
+        (j, k, l), (m, n, o), (p, q, r) = other.data
+
+        return Mat3((
+            (a + j, b + k, c + l),
+            (d + m, e + n, f + o),
+            (g + p, h + q, i + r),
+        ))
+
+    def __radd__(self, other: Matrix) -> Mat3:
+        return self.__add__(other)
+
+    def __sub__(self, other: Matrix) -> Mat3:
+        if not isinstance(other, Matrix):
+            return NotImplemented
+
+        return self.__add__(-other)
+
+    def __rsub__(self, other: Matrix) -> Mat3:
+        if not isinstance(other, Matrix):
+            return NotImplemented
+
+        return (-self).__add__(other)
+
+    @overload
+    def __mul__(self, vector: Vector) -> Vec3:
+        ...
+
+    @overload
+    def __mul__(self, vector: tuple[float, ...]) -> tuple[float, ...]:
+        ...
+
+    def __mul__(
+        self,
+        vector: Vector | tuple[float, ...],
+    ) -> Vec3 | tuple[float, ...]:
+        if isinstance(vector, Vector):
+            data = vector.data
+        else:
+            data = vector
+
+        try:
+            x, y, z = data
+        except ValueError:
+            raise ValueError("Dimension mismatch: cannot multiply {} by {}".format(
+                self.dimensions,
+                len(vector),
+            )) from None
+
+        (a, b, c), (d, e, f), (g, h, i) = self.data
+        values = (
+            a * x + b * y + c * z,
+            d * x + e * y + f * z,
+            g * x + h * y + i * z,
+        )
+
+        if isinstance(vector, Vector):
+            return Vec3(*values)
+        else:
+            return values
+
+    @overload
+    def __rmul__(self, vector: Vector) -> Vec3:
+        ...
+
+    @overload
+    def __rmul__(self, vector: tuple[float, ...]) -> tuple[float, ...]:
+        ...
+
+    def __rmul__(
+        self,
+        vector: Vector | tuple[float, ...],
+    ) -> Vec3 | tuple[float, ...]:
+        return self.__mul__(vector)
+
+    @overload
+    def __matmul__(self, other: Mat3) -> Mat3:
+        ...
+
+    @overload
+    def __matmul__(self, other: Matrix) -> Matrix:
+        ...
+
+    def __matmul__(self, other: Matrix) -> Matrix:
+        if not isinstance(other, Matrix):
+            return NotImplemented
+
+        if other.dimensions != (3, 3):
+            # A valid product if `other` has three rows, which the generic
+            # implementation handles (or rejects).
+            return Matrix(self.data) @ other
+
+        return _matmul3(self.data, other.data)
+
+    def __rmatmul__(self, other: Matrix) -> Matrix:
+        if not isinstance(other, Matrix):
+            return NotImplemented
+
+        if other.dimensions != (3, 3):
+            # Python tries this before `other.__matmul__` since `Mat3` is a
+            # subclass of `Matrix`, but the product may still be valid if
+            # `other` has three columns, which the generic implementation
+            # handles (or rejects). This is equivalent to returning
+            # `NotImplemented`, which mypyc doesn't allow here.
+            return other @ Matrix(self.data)
+
+        return _matmul3(other.data, self.data)
+
+
+if USE_NUMPY and not TYPE_CHECKING:
+    # A `Mat3` doesn't derive from the NumPy `Matrix`, but is still one.
+    Matrix.register(Mat3)
+
+
+def _matmul3(
+    left: tuple[tuple[float, ...], ...],
+    right: tuple[tuple[float, ...], ...],
+) -> Mat3:
+    (a, b, c), (d, e, f), (g, h, i) = left
+    (j, k, l), (m, n, o), (p, q, r) = right
+
+    return Mat3((
+        (a * j + b * m + c * p, a * k + b * n + c * q, a * l + b * o + c * r),
+        (d * j + e * m + f * p, d * k + e * n + f * q, d * l + e * o + f * r),
+        (g * j + h * m + i * p, g * k + h * n + i * q, g * l + h * o + i * r),
+    ))
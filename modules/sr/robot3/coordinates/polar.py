@@ -5,10 +5,16 @@ Polar coordinate utilities.
 from __future__ import annotations
 
 import math
-from typing import NamedTuple
+from typing import Iterable, NamedTuple
 
 from .vectors import Vector
 
+try:
+    from . import batch
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 
 class PolarCoord(NamedTuple):
     length: float
@@ -39,3 +45,20 @@ def polar_from_cartesian(cartesian: Vector) -> PolarCoord:
         rot_y=rot_y,
         rot_x=rot_x,
     )
+
+
+def polar_from_cartesian_batch(
+    cartesians: Iterable[tuple[float, float, float]],
+) -> list[PolarCoord]:
+    """
+    Compute `PolarCoord`s for a number of 3-vectors, as `polar_from_cartesian`.
+
+    The vectors can be given as a sequence of tuples or, if NumPy is installed,
+    as an (N, 3) array. The conversion is vectorised when NumPy is installed;
+    see `batch.polar_coords_from_cartesian` for a version which returns arrays.
+    """
+    if not HAS_NUMPY:
+        return [polar_from_cartesian(Vector(x)) for x in cartesians]
+
+    columns = batch.polar_coords_from_cartesian(cartesians)
+    return list(map(PolarCoord, *(x.tolist() for x in columns)))
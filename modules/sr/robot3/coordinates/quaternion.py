@@ -0,0 +1,189 @@
+"""
+Quaternion utilities.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Iterator
+
+from .matrix import Mat3, Matrix
+from .vectors import Vec3, Vector
+
+# How far from orthonormal (with determinant one) a matrix may be and still be
+# treated as a rotation, allowing for the rounding in matrices built from
+# Webots' orientations.
+ROTATION_TOLERANCE = 1e-4
+
+
+class Quaternion:
+    """
+    A rotation in three dimensions, represented as a unit quaternion.
+
+    Rotations compose by multiplication: ``a * b`` is the rotation which
+    applies `b` and then `a`, matching the order used for rotation matrices.
+
+    Note that `q` and `-q` represent the same rotation, though they do not
+    compare equal. Instances are treated as immutable.
+    """
+
+    __slots__ = ('w', 'x', 'y', 'z')
+
+    def __init__(self, w: float, x: float, y: float, z: float) -> None:
+        self.w = w
+        self.x = x
+        self.y = y
+        self.z = z
+
+    @classmethod
+    def identity(cls) -> Quaternion:
+        return cls(1, 0, 0, 0)
+
+    @classmethod
+    def from_axis_angle(cls, axis: tuple[float, float, float], angle: float) -> Quaternion:
+        """
+        The rotation by `angle` radians anticlockwise about the given axis,
+        which must be a unit vector.
+        """
+        x, y, z = axis
+        half_angle = angle / 2
+        sin_half_angle = math.sin(half_angle)
+        return cls(
+            math.cos(half_angle),
+            x * sin_half_angle,
+            y * sin_half_angle,
+            z * sin_half_angle,
+        )
+
+    @classmethod
+    def from_matrix(cls, matrix: Matrix) -> Quaternion:
+        """
+        The rotation described by the given 3x3 rotation matrix.
+
+        A `ValueError` is raised if the matrix is not a rotation (for example
+        if it also scales, shears or reflects), since there is no quaternion
+        which describes it.
+        """
+        mat3 = Mat3.from_matrix(matrix)
+        (a, b, c), (d, e, f), (g, h, i) = mat3.data
+
+        # A rotation's transpose is its inverse and it preserves handedness.
+        orthonormality_error = max(
+            abs(x - (1 if row == column else 0))
+            for row, values in enumerate((mat3.transpose() @ mat3).data)
+            for column, x in enumerate(values)
+        )
+        determinant = a * (e * i - f * h) - b * (d * i - f * g) + c * (d * h - e * g)
+        if (
+            orthonormality_error > ROTATION_TOLERANCE or
+            abs(determinant - 1) > ROTATION_TOLERANCE
+        ):
+            raise ValueError(f"Not a rotation matrix: {matrix!r}")
+
+        # Work from the largest of the diagonal terms to keep the square root
+        # well away from zero.
+        trace = a + e + i
+        if trace > 0:
+            s = 2 * math.sqrt(1 + trace)
+            return cls(s / 4, (h - f) / s, (c - g) / s, (d - b) / s)
+        elif a > e and a > i:
+            s = 2 * math.sqrt(1 + a - e - i)
+            return cls((h - f) / s, s / 4, (b + d) / s, (c + g) / s)
+        elif e > i:
+            s = 2 * math.sqrt(1 + e - a - i)
+            return cls((c - g) / s, (b + d) / s, s / 4, (f + h) / s)
+        else:
+            s = 2 * math.sqrt(1 + i - a - e)
+            return cls((d - b) / s, (c + g) / s, (f + h) / s, s / 4)
+
+    def conjugate(self) -> Quaternion:
+        """
+        The inverse of this rotation.
+        """
+        return Quaternion(self.w, -self.x, -self.y, -self.z)
+
+    def rotate(self, vector: Vector) -> Vec3:
+        """
+        Rotate the given 3-vector by this rotation.
+        """
+        v_x, v_y, v_z = vector.data
+        w, x, y, z = self.w, self.x, self.y, self.z
+
+        # v' = v + w t + (q × t), where t = 2 (q × v)
+        t_x = 2 * (y * v_z - z * v_y)
+        t_y = 2 * (z * v_x - x * v_z)
+        t_z = 2 * (x * v_y - y * v_x)
+
+        return Vec3(
+            v_x + w * t_x + (y * t_z - z * t_y),
+            v_y + w * t_y + (z * t_x - x * t_z),
+            v_z + w * t_z + (x * t_y - y * t_x),
+        )
+
+    def to_matrix(self) -> Mat3:
+        """
+        The rotation matrix equivalent to this rotation.
+        """
+        w, x, y, z = self.w, self.x, self.y, self.z
+
+        xx, yy, zz = x * x, y * y, z * z
+        xy, xz, yz = x * y, x * z, y * z
+        wx, wy, wz = w * x, w * y, w * z
+
+        return Mat3((
+            (1 - 2 * (yy + zz), 2 * (xy - wz), 2 * (xz + wy)),
+            (2 * (xy + wz), 1 - 2 * (xx + zz), 2 * (yz - wx)),
+            (2 * (xz - wy), 2 * (yz + wx), 1 - 2 * (xx + yy)),
+        ))
+
+    def euler_angles(self) -> tuple[float, float, float]:
+        """
+        The angles `(a, b, c)`, in radians, of the rotations about the x, y and
+        z axes which together are equivalent to this rotation.
+
+        The rotations are intrinsic, applied in the order x, y', z'' -- i.e. the
+        rotation matrix is ``Rx(a) Ry(b) Rz(c)``.
+        """
+        w, x, y, z = self.w, self.x, self.y, self.z
+
+        a = math.atan2(2 * (w * x - y * z), 1 - 2 * (x * x + y * y))
+        # Clamp to cope with floating point errors near the poles
+        b = math.asin(max(-1, min(1, 2 * (x * z + w * y))))
+        c = math.atan2(2 * (w * z - x * y), 1 - 2 * (y * y + z * z))
+
+        return a, b, c
+
+    def __mul__(self, other: Quaternion) -> Quaternion:
+        if not isinstance(other, Quaternion):
+            return NotImplemented
+
+        a_w, a_x, a_y, a_z = self.w, self.x, self.y, self.z
+        b_w, b_x, b_y, b_z = other.w, other.x, other.y, other.z
+
+        return Quaternion(
+            a_w * b_w - a_x * b_x - a_y * b_y - a_z * b_z,
+            a_w * b_x + a_x * b_w + a_y * b_z - a_z * b_y,
+            a_w * b_y - a_x * b_z + a_y * b_w + a_z * b_x,
+            a_w * b_z + a_x * b_y - a_y * b_x + a_z * b_w,
+        )
+
+    def __neg__(self) -> Quaternion:
+        return Quaternion(-self.w, -self.x, -self.y, -self.z)
+
+    def __iter__(self) -> Iterator[float]:
+        return iter((self.w, self.x, self.y, self.z))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Quaternion):
+            return NotImplemented
+
+        return tuple(self) == tuple(other)
+
+    def __hash__(self) -> int:
+        return hash(tuple(self))
+
+    def __repr__(self) -> str:
+        return f'Quaternion(w={self.w!r}, x={self.x!r}, y={self.y!r}, z={self.z!r})'
+
+    def __round__(self, precision: int) -> Quaternion:
+        return Quaternion(*(round(x, precision) for x in self))
@@ -3,15 +3,26 @@
 from __future__ import annotations
 
 import math
+import random
 import unittest
 from typing import Tuple
 
-from . import vectors
-from .polar import PolarCoord, polar_from_cartesian
-from .matrix import Matrix
-from .vectors import Vector
+from . import vectors, benchmark
+from .polar import PolarCoord, polar_from_cartesian, polar_from_cartesian_batch
+from .matrix import Mat3, Matrix
+from .vectors import Vec3, Vector
+from .transform import Transform, FrameGraph
+from .quaternion import Quaternion
 from .twin_angle import Position
 
+try:
+    import numpy as np
+
+    from . import batch, _numpy_backend
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 SimpleVector = Tuple[float, float, float]
 
 
@@ -93,6 +104,29 @@ class MatrixTests(unittest.TestCase):
 
         self.assertEqual(E, C)
 
+    def test_multiply_non_square(self) -> None:
+        A = Matrix((
+            (1, 2, 3),
+            (4, 5, 6),
+        ))
+        B = Matrix((
+            (1, 0, 1, 0),
+            (0, 1, 0, 1),
+            (1, 1, 0, 0),
+        ))
+
+        C = A @ B
+
+        E = Matrix((
+            (4, 5, 1, 2),
+            (10, 11, 4, 5),
+        ))
+
+        self.assertEqual(E, C)
+
+        with self.assertRaises(ValueError):
+            B @ A
+
     def test_identity_multiply_simple_vector(self) -> None:
         A = Matrix((
             (1, 0, 0),
@@ -365,6 +399,354 @@ class VectorTests(unittest.TestCase):
                 )
 
 
+class Vec3Tests(unittest.TestCase):
+    def test_equal_to_vector(self) -> None:
+        self.assertEqual(Vector((1, 2, 3)), Vec3(1, 2, 3))
+        self.assertEqual(Vec3(1, 2, 3), Vector((1, 2, 3)))
+        self.assertEqual(hash(Vector((1, 2, 3))), hash(Vec3(1, 2, 3)))
+        self.assertNotEqual(Vec3(1, 2, 3), Vector((1, 2, 4)))
+
+    def test_operations_match_vector(self) -> None:
+        a = Vec3(1, -2, 3.5)
+        b = Vec3(-4, 5, 0.25)
+        generic_a = Vector(a.data)
+        generic_b = Vector(b.data)
+
+        self.assertEqual(generic_a + generic_b, a + b)
+        self.assertEqual(generic_a - generic_b, a - b)
+        self.assertEqual(-generic_a, -a)
+        self.assertEqual(generic_a * 3, a * 3)
+        self.assertEqual(3 * generic_a, 3 * a)
+        self.assertEqual(generic_a / 2, a / 2)
+        self.assertEqual(generic_a * generic_b, a * b)
+        self.assertEqual(generic_a.magnitude(), a.magnitude())
+        self.assertEqual(round(generic_a, 1), round(a, 1))
+
+    def test_mixed_operations(self) -> None:
+        a = Vec3(1, 2, 3)
+        b = Vector((4, 5, 6))
+
+        for result in (a + b, b + a, a - b, b - a, a * 2, 2 * a):
+            with self.subTest(result):
+                self.assertIsInstance(result, Vec3)
+
+        self.assertEqual(Vector((5, 7, 9)), b + a)
+        self.assertEqual(Vector((3, 3, 3)), b - a)
+        self.assertEqual(32, b * a)
+
+    def test_dimension_mismatch(self) -> None:
+        with self.assertRaises(ValueError):
+            Vec3(1, 2, 3) + Vector((1, 2))
+
+        with self.assertRaisesRegex(ValueError, "cannot subtract 2 from 3"):
+            Vec3(1, 2, 3) - Vector((1, 2))
+
+        with self.assertRaises(ValueError):
+            Vec3(1, 2, 3) * Vector((1, 2, 3, 4))
+
+        with self.assertRaises(ValueError):
+            Vec3.from_vector(Vector((1, 2)))
+
+    def test_is_vector(self) -> None:
+        a = Vec3(1, 2, 3)
+        self.assertIsInstance(a, Vector)
+        # Whichever backend is in use, the values are only stored as a tuple
+        self.assertFalse(hasattr(a, '_array'))
+
+    def test_from_vector(self) -> None:
+        a = Vec3(1, 2, 3)
+        self.assertIs(a, Vec3.from_vector(a))
+        self.assertEqual(a, Vec3.from_vector(Vector((1, 2, 3))))
+
+
+class Mat3Tests(unittest.TestCase):
+    A = ((1, 2, 3), (-4, 5, 6), (7, 8, -9.5))
+    B = ((0.5, 0, 1), (2, -1, 0), (3, 1, 1))
+
+    def test_is_matrix(self) -> None:
+        a = Mat3(self.A)
+        self.assertIsInstance(a, Matrix)
+        # Whichever backend is in use, the values are only stored as tuples
+        self.assertFalse(hasattr(a, '_array'))
+
+    def test_equal_to_matrix(self) -> None:
+        self.assertEqual(Matrix(self.A), Mat3(self.A))
+        self.assertEqual(Mat3(self.A), Matrix(self.A))
+        self.assertEqual(hash(Matrix(self.A)), hash(Mat3(self.A)))
+
+    def test_operations_match_matrix(self) -> None:
+        a, b = Mat3(self.A), Mat3(self.B)
+        generic_a, generic_b = Matrix(self.A), Matrix(self.B)
+
+        self.assertEqual(generic_a.transpose(), a.transpose())
+        self.assertEqual(generic_a + generic_b, a + b)
+        self.assertEqual(generic_a - generic_b, a - b)
+        self.assertEqual(-generic_a, -a)
+        self.assertEqual(generic_a @ generic_b, a @ b)
+        self.assertEqual(generic_a @ generic_b, generic_a @ b)
+        self.assertEqual(generic_a @ generic_b, a @ generic_b)
+        self.assertEqual(
+            generic_a * Vector((1, 2, 3)),
+            a * Vector((1, 2, 3)),
+        )
+        self.assertEqual(generic_a * (1, 2, 3), a * (1, 2, 3))
+
+    def test_multiply_vector_gives_vec3(self) -> None:
+        self.assertIsInstance(Mat3(self.A) * Vector((1, 2, 3)), Vec3)
+        self.assertIsInstance(Mat3(self.A) @ Matrix(self.B), Mat3)
+        self.assertIsInstance(Matrix(self.A) @ Mat3(self.B), Mat3)
+
+    def test_multiply_non_square(self) -> None:
+        C = ((1, 0, 2), (-1, 3, 1))
+        D = ((1, 2), (0, -1), (3, 0.5))
+
+        self.assertEqual(Matrix(C) @ Matrix(self.A), Matrix(C) @ Mat3(self.A))
+        self.assertEqual((2, 3), (Matrix(C) @ Mat3(self.A)).dimensions)
+
+        self.assertEqual(Matrix(self.A) @ Matrix(D), Mat3(self.A) @ Matrix(D))
+        self.assertEqual((3, 2), (Mat3(self.A) @ Matrix(D)).dimensions)
+
+        with self.assertRaises(ValueError):
+            Matrix(D) @ Mat3(self.A)
+
+        with self.assertRaises(ValueError):
+            Mat3(self.A) @ Matrix(C)
+
+    def test_malformed(self) -> None:
+        with self.assertRaises(ValueError):
+            Mat3(((1, 2), (3, 4)))
+
+        with self.assertRaises(ValueError):
+            Mat3.from_matrix(Matrix(((1, 2), (3, 4))))
+
+        with self.assertRaises(ValueError):
+            Mat3(self.A) * (1, 2)
+
+
+def rotation_about_z(angle: float) -> Matrix:
+    return Matrix((
+        (math.cos(angle), -math.sin(angle), 0),
+        (math.sin(angle), math.cos(angle), 0),
+        (0, 0, 1),
+    ))
+
+
+def rotation_about_x(angle: float) -> Matrix:
+    return Matrix((
+        (1, 0, 0),
+        (0, math.cos(angle), -math.sin(angle)),
+        (0, math.sin(angle), math.cos(angle)),
+    ))
+
+
+class QuaternionTests(unittest.TestCase):
+    def assertMatrixAlmostEqual(self, expected: Matrix, actual: Matrix) -> None:
+        for expected_row, actual_row in zip(expected.data, actual.data):
+            for expected_value, actual_value in zip(expected_row, actual_row):
+                self.assertAlmostEqual(expected_value, actual_value)
+
+    def assertVectorAlmostEqual(self, expected: Vector, actual: Vector) -> None:
+        for expected_value, actual_value in zip(expected.data, actual.data):
+            self.assertAlmostEqual(expected_value, actual_value)
+
+    def test_identity(self) -> None:
+        self.assertEqual(
+            Matrix(((1, 0, 0), (0, 1, 0), (0, 0, 1))),
+            Quaternion.identity().to_matrix(),
+        )
+
+    def test_to_matrix(self) -> None:
+        quaternion = Quaternion.from_axis_angle((0, 0, 1), 0.3)
+        self.assertMatrixAlmostEqual(rotation_about_z(0.3), quaternion.to_matrix())
+
+    def test_from_matrix(self) -> None:
+        for axis, angle in (
+            ((0, 0, 1), 0.3),
+            ((1, 0, 0), math.pi),
+            ((0, 1, 0), -math.pi),
+            ((0, 0, 1), math.pi),
+            ((0.6, 0, 0.8), 2),
+        ):
+            with self.subTest((axis, angle)):
+                quaternion = Quaternion.from_axis_angle(axis, angle)
+                actual = Quaternion.from_matrix(quaternion.to_matrix())
+                self.assertMatrixAlmostEqual(quaternion.to_matrix(), actual.to_matrix())
+
+    def test_from_non_rotation_matrix(self) -> None:
+        for matrix in (
+            # Scaling
+            Matrix(((2, 0, 0), (0, 2, 0), (0, 0, 2))),
+            # Shearing
+            Matrix(((1, 0.5, 0), (0, 1, 0), (0, 0, 1))),
+            # Reflection
+            Matrix(((-1, 0, 0), (0, 1, 0), (0, 0, 1))),
+            # Rotation and scaling
+            Matrix(((0, -1.1, 0), (1.1, 0, 0), (0, 0, 1))),
+        ):
+            with self.subTest(matrix):
+                with self.assertRaises(ValueError):
+                    Quaternion.from_matrix(matrix)
+
+        with self.assertRaises(ValueError):
+            Quaternion.from_matrix(Matrix(((1, 0), (0, 1))))
+
+    def test_compose(self) -> None:
+        a = Quaternion.from_axis_angle((0, 0, 1), 0.3)
+        b = Quaternion.from_axis_angle((1, 0, 0), 1.2)
+
+        self.assertMatrixAlmostEqual(
+            rotation_about_z(0.3) @ rotation_about_x(1.2),
+            (a * b).to_matrix(),
+        )
+
+    def test_rotate(self) -> None:
+        quaternion = Quaternion.from_axis_angle((0.6, 0, 0.8), 2)
+        vector = Vector((1, -2, 3))
+
+        rotated = quaternion.rotate(vector)
+
+        self.assertIsInstance(rotated, Vec3)
+        self.assertVectorAlmostEqual(quaternion.to_matrix() * vector, rotated)
+        self.assertVectorAlmostEqual(vector, quaternion.conjugate().rotate(rotated))
+
+    def test_euler_angles(self) -> None:
+        quaternion = Quaternion.from_axis_angle((0.6, 0, 0.8), 2)
+        a, b, c = quaternion.euler_angles()
+
+        rotation_about_y = Matrix((
+            (math.cos(b), 0, math.sin(b)),
+            (0, 1, 0),
+            (-math.sin(b), 0, math.cos(b)),
+        ))
+
+        self.assertMatrixAlmostEqual(
+            quaternion.to_matrix(),
+            rotation_about_x(a) @ rotation_about_y @ rotation_about_z(c),
+        )
+
+
+class TransformTests(unittest.TestCase):
+    def assertVectorAlmostEqual(self, expected: Vector, actual: Vector) -> None:
+        for expected_value, actual_value in zip(expected.data, actual.data):
+            self.assertAlmostEqual(expected_value, actual_value)
+
+    def test_apply(self) -> None:
+        transform = Transform(
+            Quaternion.from_axis_angle((0, 0, 1), math.pi / 2),
+            Vector((1, 2, 3)),
+        )
+
+        self.assertVectorAlmostEqual(Vector((1, 3, 3)), transform * Vector((1, 0, 0)))
+        self.assertVectorAlmostEqual(
+            Vector((0, 1, 0)),
+            transform.rotate(Vector((1, 0, 0))),
+        )
+
+    def test_matches_homogeneous_matrix(self) -> None:
+        a = Transform(Quaternion.from_axis_angle((0.6, 0, 0.8), 2), Vector((1, -2, 0.5)))
+        b = Transform(Quaternion.from_axis_angle((0, 1, 0), -1), Vector((0, 3, 1)))
+
+        expected = a.to_matrix() @ b.to_matrix()
+        actual = (a @ b).to_matrix()
+
+        for expected_row, actual_row in zip(expected.data, actual.data):
+            for expected_value, actual_value in zip(expected_row, actual_row):
+                self.assertAlmostEqual(expected_value, actual_value)
+
+        point = Vector((4, 5, 6))
+        x, y, z, _ = expected * (4, 5, 6, 1)
+        self.assertVectorAlmostEqual(Vector((x, y, z)), (a @ b) * point)
+
+    def test_inverse(self) -> None:
+        transform = Transform(
+            Quaternion.from_axis_angle((0.6, 0, 0.8), 2),
+            Vector((1, -2, 0.5)),
+        )
+        point = Vector((4, 5, 6))
+
+        self.assertVectorAlmostEqual(point, transform.inverse() * (transform * point))
+
+    def test_from_matrix(self) -> None:
+        transform = Transform(Quaternion.from_axis_angle((0, 1, 0), 1), Vector((1, 2, 3)))
+
+        self.assertEqual(transform, Transform.from_matrix(transform.to_matrix()))
+
+        with self.assertRaises(ValueError):
+            Transform.from_matrix(Matrix(((1, 0, 0, 0),) * 4))
+
+
+class FrameGraphTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.frames = FrameGraph('arena')
+        self.frames.add_frame(
+            'robot',
+            'arena',
+            Transform(Quaternion.from_axis_angle((0, 0, 1), math.pi / 2), Vector((1, 1, 0))),
+        )
+        self.frames.add_frame('camera', 'robot', Transform(translation=Vector((0.5, 0, 0.25))))
+        self.frames.add_frame('lidar', 'robot', Transform(translation=Vector((0, 0, 1))))
+        self.frames.add_frame('wall', 'arena', Transform(translation=Vector((3, 0, 0))))
+
+    def assertVectorAlmostEqual(self, expected: Vector, actual: Vector) -> None:
+        for expected_value, actual_value in zip(expected.data, actual.data):
+            self.assertAlmostEqual(expected_value, actual_value)
+
+    def test_chain(self) -> None:
+        camera_to_arena = self.frames.get_transform('camera', 'arena')
+
+        # Facing along the arena's y axis, 0.5 in front of (1, 1)
+        self.assertVectorAlmostEqual(
+            Vector((1, 3.5, 0.25)),
+            camera_to_arena * Vector((2, 0, 0)),
+        )
+
+    def test_between_branches(self) -> None:
+        camera_to_wall = self.frames.get_transform('camera', 'wall')
+        expected = (
+            self.frames.get_transform('arena', 'wall') @
+            self.frames.get_transform('camera', 'arena')
+        )
+
+        point = Vector((1, 2, 3))
+        self.assertVectorAlmostEqual(expected * point, camera_to_wall * point)
+        self.assertVectorAlmostEqual(
+            point,
+            self.frames.get_transform('wall', 'camera') * (camera_to_wall * point),
+        )
+
+    def test_cached(self) -> None:
+        first = self.frames.get_transform('camera', 'arena')
+        self.assertIs(first, self.frames.get_transform('camera', 'arena'))
+
+    def test_update_invalidates_subtree_only(self) -> None:
+        camera = self.frames.get_transform('camera', 'arena')
+        wall = self.frames.get_transform('wall', 'arena')
+
+        self.frames.set_transform('robot', Transform(translation=Vector((2, 0, 0))))
+
+        self.assertIs(wall, self.frames.get_transform('wall', 'arena'))
+        self.assertIsNot(camera, self.frames.get_transform('camera', 'arena'))
+        self.assertVectorAlmostEqual(
+            Vector((2.5, 0, 0.25)),
+            self.frames.get_transform('camera', 'arena') * Vector((0, 0, 0)),
+        )
+
+    def test_errors(self) -> None:
+        self.frames.add_frame('other', 'arena')
+        with self.assertRaises(ValueError):
+            self.frames.add_frame('other', 'arena')
+
+        with self.assertRaises(KeyError):
+            self.frames.add_frame('gripper', 'arm')
+
+        with self.assertRaises(ValueError):
+            self.frames.set_transform('arena', Transform())
+
+        frames = FrameGraph('a', 'b')
+        with self.assertRaises(ValueError):
+            frames.get_transform('a', 'b')
+
+
 class PolarTests(unittest.TestCase):
     def test_polar(self) -> None:
         cases = [
@@ -459,5 +841,156 @@ class PositionTests(unittest.TestCase):
                 self.assertEqual(expected, actual)
 
 
+@unittest.skipUnless(HAS_NUMPY, "NumPy is not installed")
+class NumpyBackendTests(unittest.TestCase):
+    def test_vector_operations(self) -> None:
+        a = _numpy_backend.Vector((1, 2, 3))
+        b = _numpy_backend.Vector((4, 5, 6))
+
+        self.assertEqual(_numpy_backend.Vector((5, 7, 9)), a + b)
+        self.assertEqual(_numpy_backend.Vector((-3, -3, -3)), a - b)
+        self.assertEqual(_numpy_backend.Vector((2, 4, 6)), a * 2)
+        self.assertEqual(_numpy_backend.Vector((2, 4, 6)), 2 * a)
+        self.assertEqual(_numpy_backend.Vector((0.5, 1, 1.5)), a / 2)
+        self.assertEqual(32, a * b)
+        self.assertEqual(math.sqrt(14), a.magnitude())
+        self.assertEqual((1.0, 2.0, 3.0), a.data)
+        self.assertEqual(hash(a), hash(_numpy_backend.Vector((1, 2, 3))))
+
+    def test_vector_dimension_mismatch(self) -> None:
+        a = _numpy_backend.Vector((1, 2, 3))
+        b = _numpy_backend.Vector((1, 2))
+
+        with self.assertRaises(ValueError):
+            a + b
+
+        with self.assertRaises(ValueError):
+            a * b
+
+    def test_matrix_operations(self) -> None:
+        A = _numpy_backend.Matrix((
+            (1, 2, 3),
+            (4, 5, 6),
+        ))
+        B = _numpy_backend.Matrix((
+            (1, 0),
+            (0, 1),
+            (1, 1),
+        ))
+
+        self.assertEqual((2, 3), A.dimensions)
+        self.assertEqual(
+            _numpy_backend.Matrix(((1, 4), (2, 5), (3, 6))),
+            A.transpose(),
+        )
+        self.assertEqual(
+            _numpy_backend.Matrix(((4, 5), (10, 11))),
+            A @ B,
+        )
+        self.assertEqual(
+            _numpy_backend.Vector((14, 32)),
+            A * _numpy_backend.Vector((1, 2, 3)),
+        )
+        self.assertEqual((14.0, 32.0), A * (1, 2, 3))
+
+    def test_malformed_matrix(self) -> None:
+        with self.assertRaises(ValueError):
+            _numpy_backend.Matrix(((1, 2), (3,)))
+
+
+class BatchConversionTests(unittest.TestCase):
+    POINTS = [
+        (1, 0, 0),
+        (0.3, 0.4, 0),
+        (0.6, -0.8, 0.0001),
+        (2.5, 1.25, -0.75),
+        (-1, -2, 3),
+        (0.001, 0.002, 0.003),
+    ]
+
+    def test_positions_match(self) -> None:
+        expected = [Position.from_cartesian_metres(x) for x in self.POINTS]
+        actual = Position.from_cartesian_metres_batch(self.POINTS)
+
+        self.assertEqual([x.distance for x in expected], [x.distance for x in actual])
+        for expected_position, actual_position in zip(expected, actual):
+            for expected_value, actual_value in zip(expected_position, actual_position):
+                self.assertAlmostEqual(expected_value, actual_value)
+
+    def test_polar_match(self) -> None:
+        expected = [polar_from_cartesian(Vector(x)) for x in self.POINTS]
+        actual = polar_from_cartesian_batch(self.POINTS)
+
+        for expected_polar, actual_polar in zip(expected, actual):
+            for expected_value, actual_value in zip(expected_polar, actual_polar):
+                self.assertAlmostEqual(expected_value, actual_value)
+
+    def test_empty(self) -> None:
+        self.assertEqual([], Position.from_cartesian_metres_batch([]))
+        self.assertEqual([], polar_from_cartesian_batch([]))
+
+
+@unittest.skipUnless(HAS_NUMPY, "NumPy is not installed")
+class BatchColumnTests(unittest.TestCase):
+    def test_array_input(self) -> None:
+        points = np.array(BatchConversionTests.POINTS)
+
+        columns = batch.positions_from_cartesian_metres(points)
+
+        self.assertEqual(
+            [Position.from_cartesian_metres(x).distance for x in BatchConversionTests.POINTS],
+            columns.distance.tolist(),
+        )
+        self.assertEqual(
+            Position.from_cartesian_metres_batch(BatchConversionTests.POINTS),
+            Position.from_cartesian_metres_batch(points),
+        )
+
+    def test_whole_millimetres(self) -> None:
+        # These are on (or within rounding of) a millimetre boundary, where
+        # differences in the last place would change the truncated distance.
+        points = [(x / 1000, 0, 0) for x in range(1, 3000)] + [
+            (2 * k / 3, k / 3, 2 * k / 3)
+            for k in (x / 1000 for x in range(1, 3000))
+        ]
+
+        columns = batch.positions_from_cartesian_metres(points)
+
+        self.assertEqual(
+            [Position.from_cartesian_metres(x).distance for x in points],
+            columns.distance.tolist(),
+        )
+
+    def test_bad_shape(self) -> None:
+        with self.assertRaises(ValueError):
+            batch.positions_from_cartesian_metres(np.zeros((2, 4)))
+
+        with self.assertRaises(ValueError):
+            batch.polar_coords_from_cartesian(np.zeros(3))
+
+    def test_polar_zero_vector(self) -> None:
+        with self.assertRaises(ZeroDivisionError):
+            polar_from_cartesian(Vector((0, 0, 0)))
+
+        with self.assertRaises(ZeroDivisionError):
+            batch.polar_coords_from_cartesian([(1, 0, 0), (0, 0, 0)])
+
+
+class BenchmarkTests(unittest.TestCase):
+    def test_benchmarks_run(self) -> None:
+        for name, func in benchmark.build_benchmarks(random.Random(0)).items():
+            with self.subTest(name):
+                func()
+
+    def test_compare(self) -> None:
+        comparisons = benchmark.compare(
+            {'a': 1.0, 'b': 2.0, 'removed': 1.0},
+            {'a': 1.5, 'b': 1.0, 'added': 1.0},
+        )
+
+        self.assertEqual(['a', 'b'], [x.name for x in comparisons])
+        self.assertEqual([0.5, -0.5], [x.change for x in comparisons])
+
+
 if __name__ == '__main__':
     unittest.main()
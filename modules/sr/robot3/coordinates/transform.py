@@ -0,0 +1,251 @@
+"""
+Rigid transforms and graphs of coordinate frames.
+"""
+
+from __future__ import annotations
+
+from typing import Iterator
+
+from .matrix import Mat3, Matrix
+from .vectors import Vec3, Vector
+from .quaternion import Quaternion
+
+_IDENTITY_ROTATION = Mat3((
+    (1, 0, 0),
+    (0, 1, 0),
+    (0, 0, 1),
+))
+_ZERO = Vec3(0, 0, 0)
+
+
+class Transform:
+    """
+    A rigid transform: a rotation followed by a translation.
+
+    This is equivalent to the 4x4 homogeneous matrix ``[[R, t], [0, 1]]`` (see
+    `to_matrix`), but is stored as the 3x3 rotation and the translation so that
+    composing and applying transforms only does the necessary work.
+
+    Transforms compose with `@` in the same order as matrices: ``a @ b`` is the
+    transform which applies `b` and then `a`. Points are transformed with `*`.
+
+    Instances are treated as immutable.
+    """
+
+    __slots__ = ('rotation', 'translation')
+
+    def __init__(
+        self,
+        rotation: Quaternion | Matrix = _IDENTITY_ROTATION,
+        translation: Vector = _ZERO,
+    ) -> None:
+        if isinstance(rotation, Quaternion):
+            self.rotation = rotation.to_matrix()
+        else:
+            self.rotation = Mat3.from_matrix(rotation)
+        self.translation = Vec3.from_vector(translation)
+
+    @classmethod
+    def from_matrix(cls, matrix: Matrix) -> Transform:
+        """
+        Construct an instance from a 4x4 homogeneous matrix.
+        """
+        if matrix.dimensions != (4, 4):
+            raise ValueError(f"Cannot build a transform from a {matrix.dimensions} matrix")
+
+        (a, b, c, x), (d, e, f, y), (g, h, i, z), bottom = matrix.data
+        if list(bottom) != [0, 0, 0, 1]:
+            raise ValueError(f"Not a rigid transform: bottom row is {bottom!r}")
+
+        return cls(Mat3(((a, b, c), (d, e, f), (g, h, i))), Vec3(x, y, z))
+
+    def to_matrix(self) -> Matrix:
+        """
+        The 4x4 homogeneous matrix equivalent to this transform.
+        """
+        (a, b, c), (d, e, f), (g, h, i) = self.rotation.data
+        x, y, z = self.translation.data
+        return Matrix((
+            (a, b, c, x),
+            (d, e, f, y),
+            (g, h, i, z),
+            (0, 0, 0, 1),
+        ))
+
+    def inverse(self) -> Transform:
+        """
+        The transform which undoes this one.
+        """
+        # The inverse of a rotation is its transpose.
+        rotation = self.rotation.transpose()
+        return Transform(rotation, -(rotation * self.translation))
+
+    def rotate(self, vector: Vector) -> Vec3:
+        """
+        Apply just the rotation part of the transform to the given vector, as
+        is appropriate for directions rather than points.
+        """
+        return self.rotation * vector
+
+    def __mul__(self, point: Vector) -> Vec3:
+        if not isinstance(point, Vector):
+            return NotImplemented
+
+        return self.rotation * point + self.translation
+
+    def __matmul__(self, other: Transform) -> Transform:
+        if not isinstance(other, Transform):
+            return NotImplemented
+
+        return Transform(
+            self.rotation @ other.rotation,
+            self.rotation * other.translation + self.translation,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Transform):
+            return NotImplemented
+
+        return (self.rotation, self.translation) == (other.rotation, other.translation)
+
+    def __hash__(self) -> int:
+        return hash((self.rotation, self.translation))
+
+    def __repr__(self) -> str:
+        return f'Transform({self.rotation!r}, {self.translation!r})'
+
+
+IDENTITY = Transform()
+
+
+class FrameGraph:
+    """
+    A tree of named coordinate frames, each positioned relative to its parent.
+
+    The transform for a frame maps coordinates in that frame to coordinates in
+    its parent. The transforms between each frame and the root of its tree are
+    cached, and updating a frame's transform only invalidates the cache for
+    that frame and the frames below it.
+
+    Usage:
+
+        frames = FrameGraph('arena')
+        frames.add_frame('robot', 'arena')
+        frames.add_frame('camera', 'robot', Transform(translation=Vec3(0.2, 0, 0.3)))
+
+        while True:
+            frames.set_transform('robot', robot_pose)
+            camera_to_arena = frames.get_transform('camera', 'arena')
+            ...
+
+    :param roots: The names of the frames which have no parent.
+    """
+
+    def __init__(self, *roots: str) -> None:
+        self._parents: dict[str, str | None] = {}
+        self._transforms: dict[str, Transform] = {}
+        self._children: dict[str, list[str]] = {}
+
+        # The transform from each frame to the root of its tree.
+        self._to_root: dict[str, Transform] = {}
+
+        # The composed transforms between pairs of frames, along with the
+        # transforms to the root they were built from.
+        self._between: dict[tuple[str, str], tuple[Transform, Transform, Transform]] = {}
+
+        for root in roots:
+            self._add(root, None, IDENTITY)
+
+    def _add(self, name: str, parent: str | None, transform: Transform) -> None:
+        if name in self._parents:
+            raise ValueError(f"Frame {name!r} already exists")
+
+        self._parents[name] = parent
+        self._transforms[name] = transform
+        self._children[name] = []
+        if parent is not None:
+            self._children[parent].append(name)
+
+    def add_frame(self, name: str, parent: str, transform: Transform = IDENTITY) -> None:
+        """
+        Add a frame, positioned relative to an existing frame.
+        """
+        if parent not in self._parents:
+            raise KeyError(f"Unknown parent frame {parent!r}")
+
+        self._add(name, parent, transform)
+
+    def set_transform(self, name: str, transform: Transform) -> None:
+        """
+        Update the position of a frame relative to its parent.
+        """
+        if self._parents[name] is None:
+            raise ValueError(f"Cannot move root frame {name!r}")
+
+        self._transforms[name] = transform
+
+        # Frames are only cached once their parents are, so there's no need to
+        # look below frames which aren't cached.
+        stale = [name]
+        while stale:
+            frame = stale.pop()
+            if self._to_root.pop(frame, None) is not None:
+                stale.extend(self._children[frame])
+
+    def parent(self, name: str) -> str | None:
+        return self._parents[name]
+
+    def root(self, name: str) -> str:
+        """
+        The root of the tree containing the given frame.
+        """
+        while True:
+            parent = self._parents[name]
+            if parent is None:
+                return name
+            name = parent
+
+    def _get_to_root(self, name: str) -> Transform:
+        to_root = self._to_root.get(name)
+        if to_root is None:
+            parent = self._parents[name]
+            if parent is None:
+                to_root = IDENTITY
+            else:
+                to_root = self._get_to_root(parent) @ self._transforms[name]
+            self._to_root[name] = to_root
+        return to_root
+
+    def get_transform(self, source: str, target: str) -> Transform:
+        """
+        The transform which maps coordinates in the `source` frame to
+        coordinates in the `target` frame.
+        """
+        source_to_root = self._get_to_root(source)
+        target_to_root = self._get_to_root(target)
+
+        cached = self._between.get((source, target))
+        if cached is not None:
+            cached_source, cached_target, transform = cached
+            if cached_source is source_to_root and cached_target is target_to_root:
+                return transform
+
+        if self.root(source) != self.root(target):
+            raise ValueError(f"Frames {source!r} and {target!r} are not connected")
+
+        if target_to_root is IDENTITY:
+            # The target is the root
+            transform = source_to_root
+        else:
+            transform = target_to_root.inverse() @ source_to_root
+        self._between[(source, target)] = (source_to_root, target_to_root, transform)
+        return transform
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._parents
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._parents)
+
+    def __len__(self) -> int:
+        return len(self._parents)
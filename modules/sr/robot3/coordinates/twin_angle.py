@@ -8,7 +8,13 @@ to the two angles being independent from one another.
 from __future__ import annotations
 
 import math
-from typing import NamedTuple
+from typing import Iterable, NamedTuple
+
+try:
+    from . import batch
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
 
 
 class Position(NamedTuple):
@@ -50,3 +56,23 @@ class Position(NamedTuple):
             horizontal_angle=math.atan2(-y, x),
             vertical_angle=math.atan2(z, x),
         )
+
+    @classmethod
+    def from_cartesian_metres_batch(
+        cls,
+        cartesians: Iterable[tuple[float, float, float]],
+    ) -> list[Position]:
+        """
+        Construct instances for a number of cartesian positions expressed in
+        metres, as `from_cartesian_metres`.
+
+        The positions can be given as a sequence of tuples or, if NumPy is
+        installed, as an (N, 3) array. The conversion is vectorised when NumPy
+        is installed; see `batch.positions_from_cartesian_metres` for a version
+        which returns arrays.
+        """
+        if not HAS_NUMPY:
+            return [cls.from_cartesian_metres(x) for x in cartesians]
+
+        columns = batch.positions_from_cartesian_metres(cartesians)
+        return list(map(cls, *(x.tolist() for x in columns)))
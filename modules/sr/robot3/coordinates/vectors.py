@@ -5,7 +5,9 @@ Vector utilities.
 from __future__ import annotations
 
 import math
-from typing import Iterable, overload
+from typing import Iterable, overload, TYPE_CHECKING
+
+from .backend import USE_NUMPY
 
 # between vectors considered the same
 RADIANS_TOLERANCE = math.radians(10)
@@ -97,7 +99,17 @@ class Vector:
 
         return sum(x * y for x, y in zip(self.data, value.data))
 
-    __rmul__ = __mul__
+    @overload
+    def __rmul__(self, other: float) -> Vector:
+        ...
+
+    @overload
+    def __rmul__(self, other: Vector) -> float:
+        ...
+
+    def __rmul__(self, value: Vector | float) -> Vector | float:
+        # Not an alias of `__mul__`, which mypyc would compile as an attribute
+        return self.__mul__(value)
 
     def __truediv__(self, other: float) -> Vector:
         if not isinstance(other, (float, int)):
@@ -106,7 +118,157 @@ class Vector:
         return Vector(x / other for x in self.data)
 
 
-def cross_product(vec_a: Vector, vec_b: Vector) -> Vector:
+# `Vec3` works on its tuple of values directly, so always builds on the pure
+# Python implementation, even when that is replaced below.
+_TupleVector = Vector
+
+# The flag must be checked first: mypyc compiles anything behind
+# `not TYPE_CHECKING` as unreachable, so it must never be entered when compiled.
+if USE_NUMPY and not TYPE_CHECKING:
+    # Replace the pure Python implementation above; see `backend`.
+    from ._numpy_backend import Vector
+
+
+class Vec3(_TupleVector):
+    """
+    A vector of exactly three floating point values.
+
+    This behaves like (and compares equal to) a `Vector` with the same values,
+    but has its arithmetic written out for three dimensions to avoid the
+    overheads of the generic implementation. Operations between a `Vec3` and
+    any other 3-vector produce a `Vec3`.
+
+    Instances are treated as immutable, which allows the magnitude to be
+    cached.
+    """
+
+    __slots__ = ('data', '_magnitude')
+
+    def __init__(self, x: float, y: float, z: float) -> None:
+        self.data = (x, y, z)
+        self._magnitude: float | None = None
+
+    @classmethod
+    def from_vector(cls, vector: Vector) -> Vec3:
+        """
+        Convert a generic 3-vector to a `Vec3`.
+        """
+        if isinstance(vector, Vec3):
+            return vector
+
+        if len(vector) != 3:
+            raise ValueError(f"Cannot convert {vector!r} to a three-dimensional vector")
+
+        return cls(*vector.data)
+
+    def magnitude(self) -> float:
+        if self._magnitude is None:
+            x, y, z = self.data
+            self._magnitude = math.sqrt(x * x + y * y + z * z)
+        return self._magnitude
+
+    def __repr__(self) -> str:
+        return f'Vec3{self.data!r}'
+
+    def __len__(self) -> int:
+        return 3
+
+    def __round__(self, precision: int) -> Vec3:
+        x, y, z = self.data
+        return Vec3(round(x, precision), round(y, precision), round(z, precision))
+
+    def __neg__(self) -> Vec3:
+        x, y, z = self.data
+        return Vec3(-x, -y, -z)
+
+    def __add__(self, other: Vector) -> Vec3:
+        if not isinstance(other, Vector):
+            return NotImplemented
+
+        a_x, a_y, a_z = self.data
+        try:
+            b_x, b_y, b_z = other.data
+        except ValueError:
+            raise ValueError(
+                f"Dimension mismatch: cannot add 3 to {len(other)}",
+            ) from None
+
+        return Vec3(a_x + b_x, a_y + b_y, a_z + b_z)
+
+    def __radd__(self, other: Vector) -> Vec3:
+        return self.__add__(other)
+
+    def __sub__(self, other: Vector) -> Vec3:
+        if not isinstance(other, Vector):
+            return NotImplemented
+
+        a_x, a_y, a_z = self.data
+        try:
+            b_x, b_y, b_z = other.data
+        except ValueError:
+            raise ValueError(
+                f"Dimension mismatch: cannot subtract {len(other)} from 3",
+            ) from None
+
+        return Vec3(a_x - b_x, a_y - b_y, a_z - b_z)
+
+    def __rsub__(self, other: Vector) -> Vec3:
+        if not isinstance(other, Vector):
+            return NotImplemented
+
+        return -self.__sub__(other)
+
+    @overload
+    def __mul__(self, other: float) -> Vec3:
+        ...
+
+    @overload
+    def __mul__(self, other: Vector) -> float:
+        ...
+
+    def __mul__(self, value: Vector | float) -> Vec3 | float:
+        a_x, a_y, a_z = self.data
+
+        if isinstance(value, (float, int)):
+            return Vec3(value * a_x, value * a_y, value * a_z)
+
+        if not isinstance(value, Vector):
+            return NotImplemented
+
+        try:
+            b_x, b_y, b_z = value.data
+        except ValueError:
+            raise ValueError(
+                f"Dimension mismatch: cannot multiply 3 by {len(value)}",
+            ) from None
+
+        return a_x * b_x + a_y * b_y + a_z * b_z
+
+    @overload
+    def __rmul__(self, other: float) -> Vec3:
+        ...
+
+    @overload
+    def __rmul__(self, other: Vector) -> float:
+        ...
+
+    def __rmul__(self, value: Vector | float) -> Vec3 | float:
+        return self.__mul__(value)
+
+    def __truediv__(self, other: float) -> Vec3:
+        if not isinstance(other, (float, int)):
+            return NotImplemented
+
+        x, y, z = self.data
+        return Vec3(x / other, y / other, z / other)
+
+
+if USE_NUMPY and not TYPE_CHECKING:
+    # A `Vec3` doesn't derive from the NumPy `Vector`, but is still one.
+    Vector.register(Vec3)
+
+
+def cross_product(vec_a: Vector, vec_b: Vector) -> Vec3:
     """
     Cross product of two 3-vectors.
 
@@ -116,11 +278,11 @@ def cross_product(vec_a: Vector, vec_b: Vector) -> Vector:
     a_x, a_y, a_z = vec_a.data
     b_x, b_y, b_z = vec_b.data
 
-    return Vector((
+    return Vec3(
         (a_y * b_z) - (a_z * b_y),
         (a_z * b_x) - (a_x * b_z),
         (a_x * b_y) - (a_y * b_x),
-    ))
+    )
 
 
 def dot_product(vec_a: Vector, vec_b: Vector) -> float:
@@ -152,11 +314,14 @@ def angle_between(vec_a: Vector, vec_b: Vector) -> float:
             ),
         )
 
-    if ZERO_3VECTOR in (vec_a, vec_b):
+    vec_a = Vec3.from_vector(vec_a)
+    vec_b = Vec3.from_vector(vec_b)
+
+    mod_ab = vec_a.magnitude() * vec_b.magnitude()
+    if not mod_ab:
         raise ValueError("Cannot find the angle between an empty vector and another")
 
     dp = dot_product(vec_a, vec_b)
-    mod_ab = vec_a.magnitude() * vec_b.magnitude()
     cos_theta = dp / mod_ab
 
     if abs(cos_theta) > 1:
@@ -0,0 +1,107 @@
+"""
+Stand-ins for the Webots objects which the robot and vision pipeline use, for
+running them without a simulation (in tests and benchmarks).
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+from controller import (
+    Robot as WebotsRobot,
+    Camera as WebotsCamera,
+    CameraRecognitionObject as WebotsRecognitionObject,
+)
+
+
+class FakeRecognitionObject(WebotsRecognitionObject):
+    def __init__(
+        self,
+        model: str = '',
+        position: tuple[float, float, float] = (0, 0, 0),
+        orientation: tuple[float, float, float, float] = (0, 0, 1, 0),
+        position_on_image: tuple[int, int] = (0, 0),
+        size_on_image: tuple[int, int] = (0, 0),
+    ) -> None:
+        self.model = model
+        self.position = position
+        self.orientation = orientation
+        self.position_on_image = position_on_image
+        self.size_on_image = size_on_image
+
+    def getModel(self) -> str:
+        return self.model
+
+    def getPosition(self) -> tuple[float, float, float]:
+        return self.position
+
+    def getOrientation(self) -> tuple[float, float, float, float]:
+        return self.orientation
+
+    def getPositionOnImage(self) -> tuple[int, int]:
+        return self.position_on_image
+
+    def getSizeOnImage(self) -> tuple[int, int]:
+        return self.size_on_image
+
+
+class FakeWebotsRobot(WebotsRobot):
+    """
+    A robot whose simulation time only advances when it is stepped, recording
+    the duration of each step.
+    """
+
+    def __init__(self, steps_until_end: int | None = None, timestep: int = 16) -> None:
+        self.time_ms = 0
+        self.steps: list[int] = []
+        # The simulation ends on this step, if given
+        self.steps_until_end = steps_until_end
+        self.timestep = timestep
+
+    def getBasicTimeStep(self) -> float:
+        return self.timestep
+
+    def getTime(self) -> float:
+        return self.time_ms / 1000
+
+    def step(self, duration: int) -> int:
+        self.steps.append(duration)
+        self.time_ms += duration
+        if self.steps_until_end is not None and len(self.steps) >= self.steps_until_end:
+            return -1
+        return 0
+
+
+class FakeWebotsCamera(WebotsCamera):
+    """
+    A camera which always recognises the given objects.
+    """
+
+    def __init__(
+        self,
+        name: str = 'camera',
+        objects: Sequence[WebotsRecognitionObject] = (),
+    ) -> None:
+        self.name = name
+        self.objects = list(objects)
+        # The sampling periods while enabled, else `None`
+        self.period: int | None = None
+        self.recognition_period: int | None = None
+
+    def getName(self) -> str:
+        return self.name
+
+    def enable(self, samplingPeriod: int) -> None:
+        self.period = samplingPeriod
+
+    def disable(self) -> None:
+        self.period = None
+
+    def recognitionEnable(self, samplingPeriod: int) -> None:
+        self.recognition_period = samplingPeriod
+
+    def recognitionDisable(self) -> None:
+        self.recognition_period = None
+
+    def getRecognitionObjects(self) -> list[WebotsRecognitionObject]:
+        return self.objects
@@ -0,0 +1,223 @@
+"""
+Estimation of the robot's position in the arena from the markers on the walls.
+
+The layout of the wall markers is read once from the arena world file into a
+table indexed by marker id. Each estimate is then a single least squares
+solve over all the markers in a frame.
+
+This module requires NumPy, which is not a hard dependency of the simulator.
+"""
+
+from __future__ import annotations
+
+import re
+import math
+import functools
+from typing import Iterable, Sequence, NamedTuple, TYPE_CHECKING
+from pathlib import Path
+
+import numpy as np
+from numpy.typing import NDArray
+
+if TYPE_CHECKING:
+    from sr.robot3.camera import Marker
+
+ARENA_WORLD = Path(__file__).resolve().parents[3] / 'worlds' / 'Arena.wbt'
+
+WALL_MARKER_RE = re.compile(r'\bWallMarker\s*\{(?P<body>[^{}]*)\}')
+FLOATS = r'((?:\s+-?[\d.]+(?:e-?\d+)?)+)'
+TRANSLATION_RE = re.compile(r'\btranslation' + FLOATS)
+MODEL_RE = re.compile(r'\bmodel\s+"F(?P<id>\d+)"')
+
+# How strongly to trust the given heading relative to the markers. Each marker
+# contributes two equations with unit weight.
+DEFAULT_HEADING_WEIGHT = 1.0
+
+
+class Pose(NamedTuple):
+    """
+    The position of the robot in the arena.
+
+    :param x:        Position along the arena's x axis, in metres.
+    :param y:        Position along the arena's y axis, in metres.
+    :param heading:  The direction the camera faces, in radians anticlockwise
+                     from the arena's x axis, in the range -pi to pi.
+    :param markers:  The number of markers used to make the estimate.
+    :param residual: The root mean square error of the marker positions
+                     implied by the estimate, in metres.
+    """
+
+    x: float
+    y: float
+    heading: float
+    markers: int
+    residual: float
+
+
+class MarkerMap:
+    """
+    The positions of markers in the arena, indexed by marker id.
+    """
+
+    def __init__(self, ids: Sequence[int], positions: NDArray[np.float64]) -> None:
+        if len(set(ids)) != len(ids):
+            raise ValueError("Marker ids must be unique")
+
+        self.ids = np.array(ids, dtype=np.intp)
+        self.positions = positions
+
+        # Maps from marker id to row in the above, or -1 if the marker is not
+        # in the map.
+        self._rows = np.full(max(ids, default=-1) + 1, -1, dtype=np.intp)
+        self._rows[self.ids] = np.arange(len(ids))
+
+    @classmethod
+    def from_world(cls, path: Path = ARENA_WORLD) -> MarkerMap:
+        """
+        Load the wall markers from the given Webots world file.
+        """
+        ids = []
+        positions = []
+
+        for match in WALL_MARKER_RE.finditer(path.read_text()):
+            body = match['body']
+            model = MODEL_RE.search(body)
+            translation = TRANSLATION_RE.search(body)
+            if model is None or translation is None:
+                raise ValueError(f"Unable to parse wall marker from {body!r}")
+
+            ids.append(int(model['id']))
+            positions.append([float(x) for x in translation[1].split()])
+
+        return cls(ids, np.array(positions, dtype=np.float64).reshape(-1, 3))
+
+    def rows(self, ids: NDArray[np.intp]) -> NDArray[np.intp]:
+        """
+        The rows in this map for the given marker ids, or -1 for markers which
+        are not in the map.
+        """
+        rows = np.full(len(ids), -1, dtype=np.intp)
+        known = (ids >= 0) & (ids < len(self._rows))
+        rows[known] = self._rows[ids[known]]
+        return rows
+
+    def __contains__(self, marker_id: object) -> bool:
+        return (
+            isinstance(marker_id, int) and
+            0 <= marker_id < len(self._rows) and
+            bool(self._rows[marker_id] >= 0)
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def heading_from_compass(compass_heading: float) -> float:
+    """
+    Convert a heading from `Compass.get_heading` to the convention used here.
+
+    The compass gives the robot's heading clockwise from north (the arena's y
+    axis), in the range 0 to 2pi. This returns the same direction anticlockwise
+    from the arena's x axis, in the range -pi to pi.
+    """
+    return math.remainder(math.pi / 2 - compass_heading, math.tau)
+
+
+@functools.lru_cache(maxsize=None)
+def arena_marker_map() -> MarkerMap:
+    """
+    The map of the markers on the arena walls, loaded on first use.
+    """
+    return MarkerMap.from_world()
+
+
+def locate(
+    markers: Iterable[Marker],
+    heading: float | None = None,
+    *,
+    marker_map: MarkerMap | None = None,
+    heading_weight: float = DEFAULT_HEADING_WEIGHT,
+) -> Pose | None:
+    """
+    Estimate the pose of the camera in the arena from the markers it sees.
+
+    This treats the arena as flat and ignores the offset of the camera from the
+    centre of the robot.
+
+    :param markers:        The result of `Camera.see`. Markers which aren't in
+                           the map are ignored.
+    :param heading:        The direction the camera faces, in radians
+                           anticlockwise from the arena's x axis, if known. Use
+                           `heading_from_compass` to convert the heading from
+                           a compass. At least one marker is needed if this is
+                           given, two otherwise.
+    :param marker_map:     The markers to locate against, defaulting to those
+                           on the arena walls.
+    :param heading_weight: How strongly to trust the given heading.
+
+    Returns `None` if there are not enough known markers to locate from.
+    """
+    if marker_map is None:
+        marker_map = arena_marker_map()
+
+    markers = list(markers)
+    ids = np.array([x.id for x in markers], dtype=np.intp)
+    rows = marker_map.rows(ids)
+    known = rows >= 0
+
+    count = int(np.count_nonzero(known))
+    if count < (1 if heading is not None else 2):
+        return None
+
+    observed = np.array(
+        [x.position for x, is_known in zip(markers, known.tolist()) if is_known],
+        dtype=np.float64,
+    )
+    distances_m = observed[:, 0] / 1000
+    tan_horizontal = np.tan(observed[:, 1])
+    tan_vertical = np.tan(observed[:, 2])
+
+    # Invert `Position.from_cartesian_metres` to get each marker's position in
+    # the camera's horizontal plane, with x ahead and y to the left.
+    ahead = distances_m / np.sqrt(1 + tan_horizontal ** 2 + tan_vertical ** 2)
+    left = -ahead * tan_horizontal
+
+    world = marker_map.positions[rows[known], :2]
+
+    # Each marker gives two equations which are linear in the unknowns
+    # (x, y, cos(heading), sin(heading)):
+    #   world_x = x + ahead * cos(heading) - left * sin(heading)
+    #   world_y = y + ahead * sin(heading) + left * cos(heading)
+    n_rows = 2 * count + (2 if heading is not None else 0)
+    a = np.zeros((n_rows, 4))
+    b = np.zeros(n_rows)
+
+    a[0:2 * count:2, 0] = 1
+    a[0:2 * count:2, 2] = ahead
+    a[0:2 * count:2, 3] = -left
+    b[0:2 * count:2] = world[:, 0]
+
+    a[1:2 * count:2, 1] = 1
+    a[1:2 * count:2, 2] = left
+    a[1:2 * count:2, 3] = ahead
+    b[1:2 * count:2] = world[:, 1]
+
+    if heading is not None:
+        a[-2, 2] = heading_weight
+        a[-1, 3] = heading_weight
+        b[-2] = heading_weight * math.cos(heading)
+        b[-1] = heading_weight * math.sin(heading)
+
+    solution, _, _, _ = np.linalg.lstsq(a, b, rcond=None)
+    x, y, cos_heading, sin_heading = solution.tolist()
+
+    errors = a[:2 * count] @ solution - b[:2 * count]
+    residual = math.sqrt(float(np.mean(errors ** 2)) * 2)
+
+    return Pose(
+        x=x,
+        y=y,
+        heading=math.atan2(sin_heading, cos_heading),
+        markers=count,
+        residual=residual,
+    )
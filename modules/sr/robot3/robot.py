@@ -2,19 +2,41 @@ from __future__ import annotations
 
 import math
 import time
+import atexit
 import random
 import warnings
-from typing import TypeVar, Collection
+from typing import TypeVar, Callable, Collection
 from pathlib import Path
-from threading import Lock
 
 from sr.robot3 import motor, power, camera, servos, arduino, metadata
 # Webots specific library
 from controller import Robot as WebotsRobot
+from sr.robot3.stats import StepStats, TimedLock, StatsSummary
 
 T = TypeVar('T')
 
 
+class _InstrumentedWebotsRobot(WebotsRobot):
+    """
+    Webots' robot, recording how long each step of the simulation takes.
+    """
+
+    def __init__(self, stats: StepStats, on_end: Callable[[], None]) -> None:
+        super().__init__()
+        self._step_stats = stats
+        self._on_end = on_end
+
+    def step(self, duration: int) -> int:
+        start = time.perf_counter()
+        result = super().step(duration)
+        self._step_stats.record_webots_step(duration, time.perf_counter() - start)
+
+        if result == -1:
+            self._on_end()
+
+        return result
+
+
 class Robot:
     """
     Primary API for access to robot parts.
@@ -50,7 +72,13 @@ class Robot:
                     stacklevel=2,
                 )
 
-        self._webot = WebotsRobot()
+        # Statistics about the stepping of the simulation, which are logged
+        # when it ends (or when the competitor's code does, if sooner).
+        self._stats = StepStats()
+        self._stats_logged = False
+        atexit.register(self._log_stats)
+
+        self._webot: WebotsRobot = _InstrumentedWebotsRobot(self._stats, self._log_stats)
         # returns a float, but should always actually be an integer value
         self._timestep = int(self._webot.getBasicTimeStep())
 
@@ -59,8 +87,9 @@ class Robot:
         # Lock used to guard access to Webot's time stepping machinery, allowing
         # us to safely advance simulation time from *either* the competitor's
         # code (in the form of our `sleep` method) or from our background
-        # thread, but not both.
-        self._step_lock = Lock()
+        # thread, but not both. This is re-entrant so that `run_until` can
+        # hold it while calling a predicate which uses the camera.
+        self._step_lock = TimedLock(self._stats)
 
         # Record the start time so that we can provide a semi-useful
         # `Robot.time` value, while accounting for the fact that Pis clocks
@@ -107,12 +136,32 @@ class Robot:
             )
 
         with self._step_lock:
+            # Counted under the lock, since other threads may also be stepping
+            self._stats.step_calls += 1
+
             # We use Webots in synchronous mode (specifically
             # `synchronization` is left at its default value of `TRUE`). In
             # that mode, Webots returns -1 from step to indicate that the
             # simulation is terminating, or 0 otherwise.
-            result = self._webot.step(duration_ms)
-            return result != -1
+            result = camera.step_cameras(self._webot, self._cameras, duration_ms)
+
+        camera.dispatch_frames(self._cameras)
+        return result != -1
+
+    def stats(self) -> StatsSummary:
+        """
+        Statistics about how time has been spent while running the simulation
+        since the start of the match: in Webots' steps, waiting for the step
+        lock and in the competitor's code between steps.
+        """
+        return self._stats.summary()
+
+    def _log_stats(self) -> None:
+        if self._stats_logged:
+            return
+        self._stats_logged = True
+
+        print(f"Robot statistics:\n{self.stats()}")  # noqa: T201
 
     def print_wifi_details(self) -> None:
         print("The simulated robot does not have WiFi.")  # noqa: T201
@@ -138,6 +187,9 @@ class Robot:
             ):
                 pass
 
+        # Only gather statistics about the match itself
+        self._stats.reset()
+
         print("Starting")  # noqa: T201
 
     def _init_devs(self) -> None:
@@ -181,6 +233,27 @@ class Robot:
         x, = elements
         return x
 
+    @property
+    def cameras(self) -> dict[str, camera.Camera]:
+        return {x.name: x for x in self._cameras}
+
+    def see_all(self) -> dict[str, camera.Detections]:
+        """
+        Advance the simulation to the next frame which all the cameras capture
+        and return what each camera sees in that same frame, keyed by camera
+        name.
+
+        This is cheaper than calling `see` on each camera in turn, which would
+        advance the simulation once per camera. If the cameras have different
+        frame rates, their frames only coincide once every least common
+        multiple of their frame periods.
+        """
+        with self._step_lock:
+            frames = camera.see_all(self._webot, self._cameras)
+
+        camera.dispatch_frames(self._cameras)
+        return frames
+
     @property
     def camera(self) -> camera.Camera:
         return self._singular(self._cameras, 'camera')
@@ -245,3 +318,71 @@ class Robot:
         # do any cleanup if Webots tells us the simulation is terminating. When
         # webots kills the process all the proper tidyup will happen anyway.
         self.webots_step_and_should_continue(duration_ms)
+
+    def run_until(
+        self,
+        predicate: Callable[[], bool],
+        *,
+        timeout: float | None = None,
+        check_every: float = 0,
+    ) -> float:
+        """
+        Advance simulation time until the given predicate returns true,
+        returning how much simulation time passed, in seconds.
+
+        This is equivalent to, but cheaper than, sleeping in a loop:
+
+            while not predicate():
+                robot.sleep(check_every)
+
+        :param predicate: Called between each advance of the simulation. This
+                          may use the camera, though any time it advances
+                          counts towards the timeout.
+        :param timeout: The most simulation time to wait for, in seconds.
+                        `TimeoutError` is raised if the predicate has not
+                        returned true by then.
+        :param check_every: How much simulation time to advance between calls
+                            to the predicate, in seconds. As for `sleep` this
+                            is rounded up to a whole number of steps; by
+                            default the predicate is checked after every step.
+        """
+        if timeout is not None and timeout < 0:
+            raise ValueError('timeout must be non-negative')
+        if check_every < 0:
+            raise ValueError('check_every must be non-negative')
+
+        n_steps = max(1, math.ceil((check_every * 1000) / self._timestep))
+        step_ms = n_steps * self._timestep
+
+        start = self._webot.getTime()
+
+        def elapsed_ms() -> int:
+            return round((self._webot.getTime() - start) * 1000)
+
+        while not predicate():
+            duration_ms = step_ms
+            if timeout is not None:
+                remaining_ms = math.ceil(timeout * 1000) - elapsed_ms()
+                if remaining_ms <= 0:
+                    raise TimeoutError(
+                        f"Predicate did not become true within {timeout} seconds",
+                    )
+                # Stop at the timeout, to the next whole step
+                duration_ms = min(
+                    duration_ms,
+                    math.ceil(remaining_ms / self._timestep) * self._timestep,
+                )
+
+            with self._step_lock:
+                result = camera.step_cameras(self._webot, self._cameras, duration_ms)
+
+            # Outside the lock, so that frame callbacks don't block other
+            # threads, and before the predicate so that it sees their effects.
+            camera.dispatch_frames(self._cameras)
+
+            # As for `sleep`, there's nothing to tidy up if the simulation
+            # is terminating, so just stop waiting.
+            if result == -1:
+                break
+
+        return elapsed_ms() / 1000
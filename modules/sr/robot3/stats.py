@@ -0,0 +1,204 @@
+"""
+Statistics about where a robot's time goes, for diagnosing slow simulations.
+
+These distinguish time spent by Webots (physics and rendering) from time spent
+waiting for the step lock and time spent in the competitor's code between
+steps, using histograms which take a fixed amount of memory regardless of how
+long the simulation runs.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+import threading
+from typing import NamedTuple
+
+# Durations are bucketed logarithmically from a microsecond up to 100 seconds,
+# with a bucket either side for values outside that range.
+MIN_DURATION = 1e-6
+BUCKETS_PER_DECADE = 10
+DECADES = 8
+NUM_BUCKETS = BUCKETS_PER_DECADE * DECADES + 2
+
+
+class HistogramSummary(NamedTuple):
+    samples: int
+    # All durations in seconds
+    total: float
+    mean: float
+    p50: float
+    p90: float
+    p99: float
+    maximum: float
+
+    def __str__(self) -> str:
+        if not self.samples:
+            return "none"
+
+        return (
+            f"samples={self.samples}, total={self.total:.3f}s, "
+            f"mean={self.mean * 1000:.3f}ms, p50={self.p50 * 1000:.3f}ms, "
+            f"p90={self.p90 * 1000:.3f}ms, p99={self.p99 * 1000:.3f}ms, "
+            f"max={self.maximum * 1000:.3f}ms"
+        )
+
+
+class Histogram:
+    """
+    A histogram of durations, in seconds.
+
+    Percentiles are approximate: they are the upper bound of the bucket the
+    percentile falls in, which is within about 25% of the true value.
+    """
+
+    __slots__ = ('counts', 'samples', 'total', 'maximum')
+
+    def __init__(self) -> None:
+        self.counts = [0] * NUM_BUCKETS
+        self.samples = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def record(self, duration: float) -> None:
+        if duration <= MIN_DURATION:
+            index = 0
+        else:
+            index = min(
+                int(math.log10(duration / MIN_DURATION) * BUCKETS_PER_DECADE) + 1,
+                NUM_BUCKETS - 1,
+            )
+
+        self.counts[index] += 1
+        self.samples += 1
+        self.total += duration
+        if duration > self.maximum:
+            self.maximum = duration
+
+    def percentile(self, fraction: float) -> float:
+        """
+        The approximate duration below which the given fraction of the
+        recorded durations fall.
+        """
+        if not self.samples:
+            return 0
+
+        target = fraction * self.samples
+        index = 0
+        seen = self.counts[0]
+        while seen < target and index < NUM_BUCKETS - 1:
+            index += 1
+            seen += self.counts[index]
+
+        if index == NUM_BUCKETS - 1:
+            # The overflow bucket has no upper bound
+            return self.maximum
+
+        upper_bound = MIN_DURATION * 10 ** (index / BUCKETS_PER_DECADE)
+        return min(upper_bound, self.maximum)
+
+    def summary(self) -> HistogramSummary:
+        return HistogramSummary(
+            samples=self.samples,
+            total=self.total,
+            mean=self.total / self.samples if self.samples else 0,
+            p50=self.percentile(0.5),
+            p90=self.percentile(0.9),
+            p99=self.percentile(0.99),
+            maximum=self.maximum,
+        )
+
+
+class StatsSummary(NamedTuple):
+    # The number of calls to `Robot.webots_step_and_should_continue`, which
+    # includes those from `sleep`.
+    step_calls: int
+    # The wall time of each Webots step, including those made by the cameras.
+    webots_step: HistogramSummary
+    # The time spent waiting to acquire the step lock.
+    lock_wait: HistogramSummary
+    # The time between releasing the step lock and next trying to acquire it,
+    # which is (mostly) time spent in the competitor's code.
+    user_code: HistogramSummary
+    # Simulation time divided by wall time; less than one is slower than
+    # real time.
+    real_time_factor: float
+
+    def __str__(self) -> str:
+        return "\n".join([
+            f"Step calls: {self.step_calls}",
+            f"Webots steps: {self.webots_step}",
+            f"Step lock waits: {self.lock_wait}",
+            f"User code: {self.user_code}",
+            f"Real-time factor: {self.real_time_factor:.2f}",
+        ])
+
+
+class StepStats:
+    """
+    Statistics about a robot's stepping of the simulation.
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Discard the statistics gathered so far.
+        """
+        self.step_calls = 0
+        self.webots_step = Histogram()
+        self.lock_wait = Histogram()
+        self.user_code = Histogram()
+
+        self._started_at = time.perf_counter()
+        self._simulated_ms = 0
+
+    def record_webots_step(self, duration_ms: int, wall_time: float) -> None:
+        self.webots_step.record(wall_time)
+        self._simulated_ms += duration_ms
+
+    def summary(self) -> StatsSummary:
+        wall_time = time.perf_counter() - self._started_at
+        return StatsSummary(
+            step_calls=self.step_calls,
+            webots_step=self.webots_step.summary(),
+            lock_wait=self.lock_wait.summary(),
+            user_code=self.user_code.summary(),
+            real_time_factor=self._simulated_ms / 1000 / wall_time if wall_time else 0,
+        )
+
+
+class TimedLock:
+    """
+    A re-entrant lock which records how long it takes to acquire and how long
+    passes between it being released and next being waited for.
+
+    Only the outermost acquisition by a thread is recorded.
+    """
+
+    def __init__(self, stats: StepStats) -> None:
+        self._lock = threading.RLock()
+        self._stats = stats
+        # Only modified while holding the lock
+        self._depth = 0
+        self._released_at: float | None = None
+
+    def __enter__(self) -> bool:
+        start = time.perf_counter()
+        self._lock.acquire()
+
+        self._depth += 1
+        if self._depth == 1:
+            self._stats.lock_wait.record(time.perf_counter() - start)
+            if self._released_at is not None:
+                # Other threads may have started waiting before the release
+                self._stats.user_code.record(max(0, start - self._released_at))
+
+        return True
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            self._released_at = time.perf_counter()
+        self._lock.release()
@@ -0,0 +1,838 @@
+#!/usr/bin/env python
+
+from __future__ import annotations
+
+import math
+import pickle
+import random
+import asyncio
+import unittest
+from unittest import mock
+
+from sr.robot3 import camera, benchmark
+from controller import Robot as WebotsRobot
+from sr.robot3.aio import AsyncRobot
+from sr.robot3.fakes import (
+    FakeWebotsRobot,
+    FakeWebotsCamera,
+    FakeRecognitionObject,
+)
+from sr.robot3.robot import Robot, _InstrumentedWebotsRobot
+from sr.robot3.stats import Histogram, StepStats, TimedLock
+from sr.robot3.vision import convert, Orientation
+from sr.robot3.coordinates import Position, Quaternion
+
+try:
+    import numpy as np
+    from sr.robot3 import localization
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+class MarkerInfoTests(unittest.TestCase):
+    def test_marker_sizes(self) -> None:
+        cases = (
+            (0, 150),
+            (49, 150),
+            (50, 200),
+            (99, 200),
+            (100, 80),
+            (199, 80),
+        )
+
+        for marker_id, expected in cases:
+            with self.subTest(marker_id):
+                self.assertEqual(expected, camera.get_marker_size_mm(marker_id))
+
+    def test_unknown_marker_size(self) -> None:
+        for marker_id in (-1, 200, 999, 1000):
+            with self.subTest(marker_id):
+                with self.assertRaises(ValueError):
+                    camera.get_marker_size_mm(marker_id)
+
+    def test_marker_sizes_change(self) -> None:
+        marker_sizes = camera.MarkerSizes(camera.MARKER_SIZES)
+        with mock.patch.object(camera, 'MARKER_SIZES', marker_sizes):
+            with self.assertRaises(ValueError):
+                camera.get_marker_size_mm(500)
+
+            marker_sizes[range(500, 510)] = 42
+            self.assertEqual(42, camera.get_marker_size_mm(500))
+
+            del marker_sizes[range(500, 510)]
+            with self.assertRaises(ValueError):
+                camera.get_marker_size_mm(500)
+
+            marker_sizes.clear()
+            with self.assertRaises(ValueError):
+                camera.get_marker_size_mm(10)
+
+        self.assertEqual(150, camera.get_marker_size_mm(10))
+
+    def test_parse_marker(self) -> None:
+        recognition_object = FakeRecognitionObject('F52')
+
+        info = camera.parse_marker_info(recognition_object)
+
+        self.assertEqual(
+            camera.MarkerInfo(recognition_object, code=52, size_mm=200),
+            info,
+        )
+
+    def test_parse_non_marker(self) -> None:
+        for model in ('B3', 'F', 'F1234', 'robot'):
+            with self.subTest(model):
+                self.assertIsNone(camera.parse_marker_info(FakeRecognitionObject(model)))
+
+    def test_parse_is_cached(self) -> None:
+        with mock.patch.object(camera, 'MARKER_MODEL_RE') as mock_re:
+            mock_re.match.return_value = None
+
+            camera.parse_marker_info(FakeRecognitionObject('not-a-marker'))
+            camera.parse_marker_info(FakeRecognitionObject('not-a-marker'))
+
+        mock_re.match.assert_called_once_with('not-a-marker')
+
+
+class MarkerTests(unittest.TestCase):
+    POSITION = Position(1000, 0.5, -0.25)
+    ORIENTATION = Orientation(0.1, 0.2, 0.3)
+
+    def setUp(self) -> None:
+        self.marker = camera.Marker(
+            id=12,
+            size=200,
+            position=self.POSITION,
+            orientation=self.ORIENTATION,
+        )
+        self.values = (12, 200, self.POSITION, self.ORIENTATION)
+
+    def test_from_webots(self) -> None:
+        rotation = Quaternion(1, 0, 0, 0)
+        marker = camera.Marker.from_webots(
+            id=3,
+            size=80,
+            position=(1, 0, 0),
+            rotation=rotation,
+        )
+
+        self.assertEqual(
+            camera.Marker(
+                id=3,
+                size=80,
+                position=Position.from_cartesian_metres((1, 0, 0)),
+                orientation=convert.yaw_pitch_roll_from_quaternion(rotation),
+            ),
+            marker,
+        )
+
+    def test_tuple_equality(self) -> None:
+        self.assertEqual(self.values, self.marker)
+        self.assertEqual(self.marker, self.values)
+        self.assertNotEqual(self.marker, (13, *self.values[1:]))
+        self.assertNotEqual(self.marker, [12, 200, self.POSITION, self.ORIENTATION])
+        self.assertNotIsInstance(self.marker, tuple)
+
+    def test_hash(self) -> None:
+        self.assertEqual(hash(self.values), hash(self.marker))
+        self.assertEqual(
+            hash(self.marker),
+            hash(camera.Marker(12, 200, self.POSITION, self.ORIENTATION)),
+        )
+
+    def test_sequence(self) -> None:
+        id_, size, position, orientation = self.marker
+        self.assertEqual(self.values, (id_, size, position, orientation))
+
+        self.assertEqual(4, len(self.marker))
+        self.assertEqual(200, self.marker[1])
+        self.assertEqual(self.ORIENTATION, self.marker[-1])
+        self.assertIn(self.POSITION, self.marker)
+        self.assertEqual(2, self.marker.index(self.POSITION))
+        self.assertEqual(1, self.marker.count(200))
+
+        with self.assertRaises(IndexError):
+            self.marker[4]
+
+    def test_namedtuple_methods(self) -> None:
+        self.assertEqual(('id', 'size', 'position', 'orientation'), self.marker._fields)
+        self.assertEqual(
+            {
+                'id': 12,
+                'size': 200,
+                'position': self.POSITION,
+                'orientation': self.ORIENTATION,
+            },
+            self.marker._asdict(),
+        )
+        self.assertEqual((12, 80, *self.values[2:]), self.marker._replace(size=80))
+        self.assertEqual(self.marker, camera.Marker._make(self.values))
+        self.assertEqual(self.marker, camera.Marker._make(list(self.values)))
+
+        with self.assertRaises(TypeError):
+            camera.Marker._make(self.values[:3])
+
+    def test_pickle(self) -> None:
+        for marker in (
+            self.marker,
+            camera.Marker.from_webots(
+                id=3,
+                size=80,
+                position=(1, 0, 0),
+                rotation=Quaternion(1, 0, 0, 0),
+            ),
+        ):
+            unpickled = pickle.loads(pickle.dumps(marker))
+            self.assertIsInstance(unpickled, camera.Marker)
+            self.assertEqual(marker, unpickled)
+
+
+@unittest.skipUnless(HAS_NUMPY, "NumPy is not available")
+class LocalizationTests(unittest.TestCase):
+    CAMERA_HEIGHT = 0.3
+
+    def observe(self, x: float, y: float, heading: float, marker_id: int) -> camera.Marker:
+        marker_map = localization.arena_marker_map()
+        row, = marker_map.rows(np.array([marker_id]))
+        world_x, world_y, world_z = marker_map.positions[row].tolist()
+
+        offset_x, offset_y = world_x - x, world_y - y
+        ahead = offset_x * math.cos(heading) + offset_y * math.sin(heading)
+        left = -offset_x * math.sin(heading) + offset_y * math.cos(heading)
+
+        return camera.Marker(
+            id=marker_id,
+            size=150,
+            position=Position.from_cartesian_metres(
+                (ahead, left, world_z - self.CAMERA_HEIGHT),
+            ),
+        )
+
+    def test_arena_map(self) -> None:
+        marker_map = localization.arena_marker_map()
+
+        self.assertEqual(28, len(marker_map))
+        self.assertIn(0, marker_map)
+        self.assertNotIn(28, marker_map)
+
+        row, = marker_map.rows(np.array([0]))
+        self.assertEqual([2.154, -2.8749, 0.175], marker_map.positions[row].tolist())
+
+    def test_locate(self) -> None:
+        x, y, heading = 0.5, 1.2, -1.9
+        markers = [self.observe(x, y, heading, marker_id) for marker_id in (0, 1, 2)]
+
+        for given_heading in (heading, None):
+            with self.subTest(heading=given_heading):
+                pose = localization.locate(markers, given_heading)
+                assert pose is not None
+
+                self.assertAlmostEqual(x, pose.x, places=2)
+                self.assertAlmostEqual(y, pose.y, places=2)
+                self.assertAlmostEqual(heading, pose.heading, places=2)
+                self.assertEqual(3, pose.markers)
+                self.assertLess(pose.residual, 0.01)
+
+    def test_heading_from_compass(self) -> None:
+        for compass_heading, heading in (
+            # North, along the arena's y axis
+            (0, math.pi / 2),
+            # East, along the arena's x axis
+            (math.pi / 2, 0),
+            (math.pi, -math.pi / 2),
+            (5 * math.pi / 4, -3 * math.pi / 4),
+            (math.tau - 0.1, math.pi / 2 + 0.1),
+        ):
+            with self.subTest(compass_heading=compass_heading):
+                self.assertAlmostEqual(
+                    heading,
+                    localization.heading_from_compass(compass_heading),
+                )
+
+    def test_locate_with_compass_heading(self) -> None:
+        x, y, heading = -0.8, 0.3, -1.9
+        markers = [self.observe(x, y, heading, marker_id) for marker_id in (5, 6)]
+        # The equivalent clockwise from north, in the range 0 to 2pi
+        compass_heading = (math.pi / 2 - heading) % math.tau
+
+        pose = localization.locate(
+            markers,
+            localization.heading_from_compass(compass_heading),
+        )
+        assert pose is not None
+
+        self.assertAlmostEqual(x, pose.x, places=2)
+        self.assertAlmostEqual(y, pose.y, places=2)
+        self.assertAlmostEqual(heading, pose.heading, places=2)
+
+    def test_too_few_markers(self) -> None:
+        markers = [
+            self.observe(0, 0, 0, 0),
+            # Not an arena marker
+            camera.Marker(id=100, size=80),
+        ]
+
+        self.assertIsNone(localization.locate(markers))
+        self.assertIsNotNone(localization.locate(markers, heading=0))
+        self.assertIsNone(localization.locate([], heading=0))
+
+
+def make_fake_robot(webot: FakeWebotsRobot, timestep: int) -> Robot:
+    # Skip the initialiser, which needs a running simulation
+    robot = Robot.__new__(Robot)
+    robot._webot = webot
+    robot._timestep = timestep
+    robot._stats = StepStats()
+    robot._step_lock = TimedLock(robot._stats)
+    robot._cameras = []
+    return robot
+
+
+class CameraStreamTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.webot = FakeWebotsRobot(timestep=16)
+        self.lock = TimedLock(StepStats())
+        # 32ms per frame
+        self.camera = camera.Camera(
+            self.webot,
+            FakeWebotsCamera(),
+            self.lock,
+            frame_rate=30,
+        )
+
+    def advance(self, duration_ms: int) -> None:
+        with self.lock:
+            camera.step_cameras(self.webot, [self.camera], duration_ms)
+        camera.dispatch_frames([self.camera])
+
+    def test_queues_frames(self) -> None:
+        stream = self.camera.stream()
+        self.assertEqual(0.032, next(stream).timestamp)
+
+        self.advance(64)
+        self.assertEqual([0.064, 0.096], [next(stream).timestamp for _ in range(2)])
+        # Nothing queued, so this steps to the next frame
+        self.assertEqual(0.128, next(stream).timestamp)
+
+    def test_queue_is_bounded(self) -> None:
+        stream = self.camera.stream(max_queued=2)
+        next(stream)
+
+        self.advance(160)
+        self.assertEqual([0.16, 0.192], [next(stream).timestamp for _ in range(2)])
+
+    def test_close_removes_callback(self) -> None:
+        stream = self.camera.stream()
+        next(stream)
+        self.assertEqual(1, len(self.camera._frame_callbacks))
+
+        stream.close()
+        self.assertEqual([], self.camera._frame_callbacks)
+
+    def test_invalid_max_queued(self) -> None:
+        with self.assertRaises(ValueError):
+            next(self.camera.stream(max_queued=0))
+
+
+class CameraTimingTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.webot = FakeWebotsRobot(timestep=16)
+        self.webots_camera = FakeWebotsCamera()
+        self.lock = TimedLock(StepStats())
+        self.camera = camera.Camera(
+            self.webot,
+            self.webots_camera,
+            self.lock,
+            frame_rate=30,
+            idle_timeout=1,
+        )
+
+    def advance(self, duration_ms: int) -> None:
+        with self.lock:
+            camera.step_cameras(self.webot, [self.camera], duration_ms)
+        camera.dispatch_frames([self.camera])
+
+    def test_frame_rate_rounded_to_timesteps(self) -> None:
+        for frame_rate, period_ms in [
+            (30, 32),
+            (20, 48),
+            (1000, 16),
+            (0.5, 2000),
+        ]:
+            with self.subTest(frame_rate=frame_rate):
+                self.camera.frame_rate = frame_rate
+                self.assertEqual(1000 / period_ms, self.camera.frame_rate)
+
+        with self.assertRaises(ValueError):
+            self.camera.frame_rate = 0
+
+    def test_frame_rate_applies_to_enabled_camera(self) -> None:
+        self.assertIsNone(self.webots_camera.period)
+
+        self.camera.see()
+        self.assertEqual(32, self.webots_camera.period)
+        self.assertEqual(32, self.webots_camera.recognition_period)
+
+        self.camera.frame_rate = 20
+        self.assertEqual(48, self.webots_camera.period)
+        self.assertEqual(48, self.webots_camera.recognition_period)
+
+    def test_see_steps_to_next_frame(self) -> None:
+        self.webot.time_ms = 16
+
+        # The first frame is a whole period after the camera is enabled
+        self.assertEqual(0.048, self.camera.see().timestamp)
+        self.assertEqual([32], self.webot.steps)
+
+        self.advance(16)
+        self.assertEqual(0.08, self.camera.see().timestamp)
+        self.assertEqual([32, 16, 16], self.webot.steps)
+
+        # Not eager, so reuses the latest frame without stepping
+        self.advance(16)
+        self.assertEqual(0.08, self.camera.see(eager=False).timestamp)
+        self.assertEqual([32, 16, 16, 16], self.webot.steps)
+
+    def test_time_to_next_frame(self) -> None:
+        self.webot.time_ms = 16
+        self.assertEqual(0.032, self.camera.time_to_next_frame())
+        self.assertEqual(32, self.webots_camera.period)
+
+        self.advance(48)
+        self.assertEqual(0.016, self.camera.time_to_next_frame())
+        self.assertEqual([48], self.webot.steps)
+
+    def test_steps_split_at_frames(self) -> None:
+        frames: list[float] = []
+        self.webot.time_ms = 16
+        self.camera.on_frame(lambda x: frames.append(x.timestamp))
+
+        self.advance(96)
+
+        # Stopping at each frame, which fall 32ms apart from when the camera
+        # was enabled.
+        self.assertEqual([32, 32, 32], self.webot.steps)
+        self.assertEqual([0.048, 0.08, 0.112], frames)
+
+        self.advance(40)
+        self.assertEqual([32, 32, 32, 32, 8], self.webot.steps)
+        self.assertEqual([0.048, 0.08, 0.112, 0.144], frames)
+
+    def test_steps_not_split_without_callbacks(self) -> None:
+        self.camera.see()
+        self.advance(96)
+        self.assertEqual([32, 96], self.webot.steps)
+
+    def test_disabled_when_idle(self) -> None:
+        self.camera.see()
+        self.assertEqual(32, self.webots_camera.period)
+
+        # Exactly the timeout since it was last used isn't long enough
+        self.advance(968)
+        self.assertEqual(32, self.webots_camera.period)
+
+        self.advance(16)
+        self.assertIsNone(self.webots_camera.period)
+        self.assertIsNone(self.webots_camera.recognition_period)
+
+        # Re-enabled on the next use, whose frame is a whole period later
+        self.assertEqual(1.048, self.camera.see().timestamp)
+        self.assertEqual(32, self.webots_camera.period)
+        self.assertEqual(32, self.webots_camera.recognition_period)
+
+    def test_not_disabled_with_callbacks(self) -> None:
+        self.camera.on_frame(lambda x: None)
+        self.advance(2000)
+        self.assertEqual(32, self.webots_camera.period)
+
+
+class SeeAllTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.webot = FakeWebotsRobot(timestep=16)
+        self.lock = TimedLock(StepStats())
+
+    def make_cameras(self, *frame_rates: float) -> list[camera.Camera]:
+        cameras = [
+            camera.Camera(
+                self.webot,
+                FakeWebotsCamera(f'camera{index}'),
+                self.lock,
+                frame_rate=frame_rate,
+            )
+            for index, frame_rate in enumerate(frame_rates)
+        ]
+        for x in cameras:
+            x._peers = cameras
+        return cameras
+
+    def timestamps(self, cameras: list[camera.Camera]) -> dict[str, float]:
+        with self.lock:
+            frames = camera.see_all(self.webot, cameras)
+        return {name: frame.timestamp for name, frame in frames.items()}
+
+    def test_same_frame_rates(self) -> None:
+        cameras = self.make_cameras(30, 30)
+        self.webot.time_ms = 16
+        # Enabled at different times
+        cameras[0].see()
+
+        self.assertEqual({'camera0': 0.08, 'camera1': 0.08}, self.timestamps(cameras))
+        self.assertEqual({'camera0': 0.112, 'camera1': 0.112}, self.timestamps(cameras))
+
+    def test_different_frame_rates(self) -> None:
+        # Frame periods of 32ms and 48ms
+        cameras = self.make_cameras(30, 20)
+
+        self.assertEqual({'camera0': 0.096, 'camera1': 0.096}, self.timestamps(cameras))
+        self.assertEqual({'camera0': 0.192, 'camera1': 0.192}, self.timestamps(cameras))
+
+    def test_no_cameras(self) -> None:
+        self.assertEqual({}, self.timestamps([]))
+        self.assertEqual([], self.webot.steps)
+
+
+class RunUntilTests(unittest.TestCase):
+    TIMESTEP = 16
+
+    def setUp(self) -> None:
+        self.webot = FakeWebotsRobot()
+        self.robot = make_fake_robot(self.webot, self.TIMESTEP)
+
+    def test_already_true(self) -> None:
+        self.assertEqual(0, self.robot.run_until(lambda: True))
+        self.assertEqual([], self.webot.steps)
+
+    def test_steps_until_true(self) -> None:
+        elapsed = self.robot.run_until(lambda: self.webot.time_ms >= 100)
+
+        self.assertEqual(0.112, elapsed)
+        self.assertEqual([self.TIMESTEP] * 7, self.webot.steps)
+
+    def test_check_every(self) -> None:
+        elapsed = self.robot.run_until(
+            lambda: self.webot.time_ms >= 100,
+            check_every=0.05,
+        )
+
+        self.assertEqual(0.128, elapsed)
+        # Rounded up to a whole number of steps
+        self.assertEqual([64, 64], self.webot.steps)
+
+    def test_timeout(self) -> None:
+        with self.assertRaises(TimeoutError):
+            self.robot.run_until(lambda: False, timeout=0.1, check_every=0.05)
+
+        # The last advance stops at the step after the timeout
+        self.assertEqual([64, 48], self.webot.steps)
+
+    def test_zero_timeout(self) -> None:
+        self.assertEqual(0, self.robot.run_until(lambda: True, timeout=0))
+
+        with self.assertRaises(TimeoutError):
+            self.robot.run_until(lambda: False, timeout=0)
+        self.assertEqual([], self.webot.steps)
+
+    def test_invalid_arguments(self) -> None:
+        with self.assertRaises(ValueError):
+            self.robot.run_until(lambda: True, timeout=-1)
+
+        with self.assertRaises(ValueError):
+            self.robot.run_until(lambda: True, check_every=-1)
+
+    def test_simulation_ending(self) -> None:
+        self.webot.steps_until_end = 3
+
+        elapsed = self.robot.run_until(lambda: False)
+
+        self.assertEqual(0.048, elapsed)
+
+    def test_predicate_advancing_time(self) -> None:
+        # The predicate may itself step the simulation (for example by using
+        # the camera)
+        def predicate() -> bool:
+            self.robot.sleep(0.02)
+            return self.webot.time_ms >= 100
+
+        elapsed = self.robot.run_until(predicate, timeout=1)
+
+        self.assertEqual(0.128, elapsed)
+        self.assertEqual([32, 16, 32, 16, 32], self.webot.steps)
+
+    def test_counts_steps(self) -> None:
+        self.robot.sleep(0.02)
+        self.robot.run_until(lambda: self.webot.time_ms >= 100)
+
+        stats = self.robot.stats()
+        self.assertEqual(1, stats.step_calls)
+        # Our fake steps bypass the instrumented Webots robot
+        self.assertEqual(0, stats.webots_step.samples)
+        # The lock is taken for each step
+        self.assertEqual(6, stats.lock_wait.samples)
+        self.assertEqual(5, stats.user_code.samples)
+
+    def test_frame_callbacks(self) -> None:
+        robot = self.robot
+        robot._cameras = [camera.Camera(self.webot, FakeWebotsCamera(), robot._step_lock)]
+        lock_depths = []
+        robot.camera.on_frame(lambda x: lock_depths.append(robot._step_lock._depth))
+
+        elapsed = robot.run_until(lambda: len(lock_depths) >= 2)
+
+        self.assertEqual(0.064, elapsed)
+        # Not holding the step lock
+        self.assertEqual([0, 0], lock_depths)
+
+
+class AsyncRobotTests(unittest.TestCase):
+    TIMESTEP = 16
+
+    def setUp(self) -> None:
+        self.webot = FakeWebotsRobot()
+        self.robot = AsyncRobot(make_fake_robot(self.webot, self.TIMESTEP))
+
+    def test_sleep(self) -> None:
+        self.robot.run(self.robot.sleep(0.1))
+
+        # Rounded up to a whole number of steps, taken all at once
+        self.assertEqual([112], self.webot.steps)
+
+    def test_shared_steps(self) -> None:
+        wake_times: list[int] = []
+
+        async def sleeper(secs: float, times: int) -> None:
+            for _ in range(times):
+                await self.robot.sleep(secs)
+                wake_times.append(self.webot.time_ms)
+
+        async def main() -> None:
+            await asyncio.gather(*(sleeper(0.032, 2) for _ in range(10)), sleeper(0.05, 1))
+
+        self.robot.run(main())
+
+        # The simulation only advances to the next time a task needs to wake
+        self.assertEqual([32, 32], self.webot.steps)
+        self.assertEqual([32] * 10 + [64] * 11, wake_times)
+
+    def test_next_step_and_read(self) -> None:
+        async def main() -> int:
+            await self.robot.next_step()
+            return await self.robot.read(lambda: self.webot.time_ms)
+
+        self.assertEqual(32, self.robot.run(main()))
+        self.assertEqual([16, 16], self.webot.steps)
+
+    def test_wait_until(self) -> None:
+        elapsed = self.robot.run(self.robot.wait_until(
+            lambda: self.webot.time_ms >= 100,
+            check_every=0.05,
+        ))
+
+        self.assertEqual(0.128, elapsed)
+        self.assertEqual([64, 64], self.webot.steps)
+
+    def test_wait_until_timeout(self) -> None:
+        with self.assertRaises(TimeoutError):
+            self.robot.run(self.robot.wait_until(
+                lambda: False,
+                timeout=0.1,
+                check_every=0.05,
+            ))
+
+        self.assertEqual([64, 48], self.webot.steps)
+
+    def test_yielding_does_not_step(self) -> None:
+        async def main() -> None:
+            for _ in range(10):
+                await asyncio.sleep(0)
+
+        self.robot.run(main())
+
+        self.assertEqual([], self.webot.steps)
+
+    def test_camera_see(self) -> None:
+        self.robot.robot._cameras = [camera.Camera(
+            self.webot,
+            FakeWebotsCamera(),
+            self.robot.robot._step_lock,
+        )]
+        robot = AsyncRobot(self.robot.robot)
+
+        async def main() -> list[float]:
+            await robot.sleep(0.016)
+            first = await robot.camera.see()
+            second = await robot.camera.see()
+            return [first.timestamp, second.timestamp]
+
+        self.assertEqual([0.048, 0.08], robot.run(main()))
+        self.assertEqual([16, 32, 32], self.webot.steps)
+
+    def test_cancels_remaining_tasks(self) -> None:
+        cancelled = []
+
+        async def forever() -> None:
+            try:
+                while True:
+                    await self.robot.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        async def main() -> None:
+            asyncio.ensure_future(forever())
+            await self.robot.sleep(0.1)
+
+        self.robot.run(main())
+
+        self.assertEqual([True], cancelled)
+
+
+class AsyncRobotEndingTests(unittest.TestCase):
+    def test_simulation_ending(self) -> None:
+        webot = FakeWebotsRobot(steps_until_end=2)
+        robot = AsyncRobot(make_fake_robot(webot, 16))
+        cleaned_up = []
+
+        async def forever() -> None:
+            try:
+                while True:
+                    await robot.sleep(0.016)
+            finally:
+                # Waiting for the simulation here is cancelled too
+                with self.assertRaises(asyncio.CancelledError):
+                    await robot.sleep(1)
+                cleaned_up.append(True)
+
+        async def main() -> None:
+            await asyncio.gather(forever(), robot.sleep(10))
+
+        with self.assertRaises(asyncio.CancelledError):
+            robot.run(main())
+
+        self.assertEqual([16, 16], webot.steps)
+        self.assertEqual([True], cleaned_up)
+
+
+class InstrumentedWebotsRobotTests(unittest.TestCase):
+    def test_records_steps(self) -> None:
+        stats = StepStats()
+        on_end = mock.Mock()
+        webot = _InstrumentedWebotsRobot(stats, on_end)
+
+        with mock.patch.object(WebotsRobot, 'step', return_value=0):
+            self.assertEqual(0, webot.step(16))
+            self.assertEqual(0, webot.step(32))
+
+        self.assertEqual(2, stats.summary().webots_step.samples)
+        on_end.assert_not_called()
+
+        with mock.patch.object(WebotsRobot, 'step', return_value=-1):
+            self.assertEqual(-1, webot.step(16))
+
+        on_end.assert_called_once_with()
+
+
+class HistogramTests(unittest.TestCase):
+    def test_empty(self) -> None:
+        summary = Histogram().summary()
+
+        self.assertEqual(0, summary.samples)
+        self.assertEqual(0, summary.mean)
+        self.assertEqual(0, summary.p99)
+        self.assertEqual("none", str(summary))
+
+    def test_summary(self) -> None:
+        histogram = Histogram()
+        for _ in range(90):
+            histogram.record(0.001)
+        for _ in range(10):
+            histogram.record(0.1)
+
+        summary = histogram.summary()
+        self.assertEqual(100, summary.samples)
+        self.assertAlmostEqual(1.09, summary.total)
+        self.assertAlmostEqual(0.0109, summary.mean)
+        self.assertEqual(0.1, summary.maximum)
+
+        # Percentiles are only accurate to within a bucket
+        self.assertGreaterEqual(summary.p50, 0.001)
+        self.assertLess(summary.p50, 0.0013)
+        self.assertLess(summary.p90, 0.0013)
+        self.assertEqual(0.1, summary.p99)
+
+    def test_extremes(self) -> None:
+        histogram = Histogram()
+        histogram.record(0)
+        histogram.record(1e-9)
+        histogram.record(1000)
+
+        summary = histogram.summary()
+        self.assertEqual(3, summary.samples)
+        self.assertLessEqual(summary.p50, 1e-6)
+        self.assertEqual(1000, summary.maximum)
+        self.assertEqual(1000, summary.p99)
+
+    def test_fixed_size(self) -> None:
+        histogram = Histogram()
+        size = len(histogram.counts)
+
+        for x in range(1000):
+            histogram.record(x / 1000)
+
+        self.assertEqual(size, len(histogram.counts))
+
+
+class TimedLockTests(unittest.TestCase):
+    def test_records_outermost_acquisitions(self) -> None:
+        stats = StepStats()
+        lock = TimedLock(stats)
+
+        with lock:
+            with lock:
+                pass
+
+        self.assertEqual(1, stats.lock_wait.samples)
+        self.assertEqual(0, stats.user_code.samples)
+
+        with lock:
+            pass
+
+        self.assertEqual(2, stats.lock_wait.samples)
+        self.assertEqual(1, stats.user_code.samples)
+
+    def test_reset(self) -> None:
+        stats = StepStats()
+        lock = TimedLock(stats)
+
+        with lock:
+            stats.step_calls += 1
+            stats.record_webots_step(16, 0.001)
+
+        stats.reset()
+
+        summary = stats.summary()
+        self.assertEqual(0, summary.step_calls)
+        self.assertEqual(0, summary.webots_step.samples)
+        self.assertEqual(0, summary.lock_wait.samples)
+
+
+class BenchmarkTests(unittest.TestCase):
+    def test_benchmarks_run(self) -> None:
+        rand = random.Random(0)
+        objects = [benchmark.random_recognition_object(rand) for _ in range(20)]
+
+        for name, func in benchmark.build_benchmarks(objects).items():
+            with self.subTest(name):
+                func()
+
+    def test_random_objects_are_in_view(self) -> None:
+        rand = random.Random(0)
+        for _ in range(20):
+            recognition_object = benchmark.random_recognition_object(rand)
+            x, y = recognition_object.getPositionOnImage()
+            self.assertTrue(0 <= x <= benchmark.IMAGE_WIDTH, x)
+            self.assertTrue(0 <= y <= benchmark.IMAGE_HEIGHT, y)
+
+
+if __name__ == '__main__':
+    unittest.main()
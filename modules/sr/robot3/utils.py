@@ -19,17 +19,20 @@ def map_to_range(
     return ((value - old_min) / (old_max - old_min)) * (new_max - new_min) + new_min
 
 
-def maybe_get_robot_device(robot: Robot, name: str, kind: type[TDevice]) -> TDevice | None:
+def get_robot_device(robot: Robot, name: str, kind: type[TDevice]) -> TDevice:
     device = robot.getDevice(name)
-    if device is None:
-        return None
     if not isinstance(device, kind):
         raise TypeError
     return device
 
 
-def get_robot_device(robot: Robot, name: str, kind: type[TDevice]) -> TDevice:
-    device = robot.getDevice(name)
-    if not isinstance(device, kind):
-        raise TypeError
-    return device
+def get_robot_devices(robot: Robot, kind: type[TDevice]) -> list[TDevice]:
+    """
+    Find all the devices of the given type on the robot, in the order Webots
+    lists them.
+    """
+    devices = (
+        robot.getDeviceByIndex(index)
+        for index in range(robot.getNumberOfDevices())
+    )
+    return [x for x in devices if isinstance(x, kind)]
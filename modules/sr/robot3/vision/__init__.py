@@ -3,9 +3,12 @@ from __future__ import annotations
 from .api import markers_from_objects
 from .types import Orientation
 from .markers import FiducialMarker
+from .tracking import Track, MarkerTracker
 
 __all__ = (
+    'Track',
     'Orientation',
+    'MarkerTracker',
     'FiducialMarker',
     'markers_from_objects',
 )
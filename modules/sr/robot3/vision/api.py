@@ -1,12 +1,22 @@
 from __future__ import annotations
 
-from typing import TypeVar, Iterable, Protocol, Sequence, TYPE_CHECKING
-
-from sr.robot3.coordinates.vectors import Vector
+import heapq
+from typing import (
+    TypeVar,
+    Callable,
+    Iterable,
+    Iterator,
+    Protocol,
+    Sequence,
+    TYPE_CHECKING,
+)
+
+from sr.robot3.coordinates.vectors import Vec3
 
 from .image import Rectangle
-from .convert import WebotsOrientation, rotation_matrix_from_axis_and_angle
+from .convert import WebotsOrientation, quaternion_from_axis_and_angle
 from .markers import FiducialMarker
+from .occlusion import is_occluded, RectangleIndex, DEFAULT_OCCLUSION_THRESHOLD
 
 if TYPE_CHECKING:
     from controller import CameraRecognitionObject as WebotsRecognitionObject
@@ -25,10 +35,27 @@ class RecognisedObject(Protocol):
 TRecognised = TypeVar('TRecognised', bound=RecognisedObject)
 
 
+def image_rectangle(recognition_object: WebotsRecognitionObject) -> Rectangle:
+    """
+    The bounding box of the given object within the camera image.
+    """
+    # Webots reports the position of the centre of the object.
+    return Rectangle.from_centre(
+        recognition_object.getPositionOnImage(),
+        recognition_object.getSizeOnImage(),
+    )
+
+
 def build_marker_info(
     recognised_object: TRecognised,
+    rectangle: Rectangle | None = None,
 ) -> tuple[FiducialMarker, Rectangle, TRecognised]:
-    recognition_object = recognised_object. recognition_object
+    """
+    Construct the marker for the given recognised object, along with its
+    bounding box within the camera image. The latter is only computed if not
+    given.
+    """
+    recognition_object = recognised_object.recognition_object
 
     # Webots' axes nearly match ours:
     # - x: distance away from the camera
@@ -38,41 +65,83 @@ def build_marker_info(
 
     marker = FiducialMarker(
         size=recognised_object.size_m,
-        position=Vector((x, y, z)),
+        position=Vec3(x, y, z),
     )
-    marker.rotate(rotation_matrix_from_axis_and_angle(
+    marker.rotate(quaternion_from_axis_and_angle(
         WebotsOrientation(*recognition_object.getOrientation()),
     ))
 
-    return (
-        marker,
-        Rectangle(
-            recognition_object.getPositionOnImage(),
-            recognition_object.getSizeOnImage(),
-        ),
-        recognised_object,
-    )
+    if rectangle is None:
+        rectangle = image_rectangle(recognition_object)
+
+    return marker, rectangle, recognised_object
+
+
+def _nearest_first(objects: Iterable[TRecognised]) -> Iterator[tuple[float, TRecognised]]:
+    """
+    Yield the given objects along with their distances, nearest first.
+
+    This uses a heap so that callers which only want the nearest few objects
+    don't pay to sort all of them.
+    """
+    heap = [
+        (Vec3(*x.recognition_object.getPosition()).magnitude(), index, x)
+        for index, x in enumerate(objects)
+    ]
+    heapq.heapify(heap)
+    while heap:
+        distance, _, recognised_object = heapq.heappop(heap)
+        yield distance, recognised_object
 
 
 def markers_from_objects(
     objects: Iterable[TRecognised],
+    occlusion_threshold: float = DEFAULT_OCCLUSION_THRESHOLD,
+    *,
+    include: Callable[[TRecognised], bool] | None = None,
+    max_distance: float | None = None,
+    limit: int | None = None,
 ) -> Sequence[tuple[FiducialMarker, TRecognised]]:
     """
     Constructs markers from the given recognised objects, ignoring any which are
-    judged not to be visible to the camera.
+    judged not to be visible to the camera, either because they are facing away
+    from it or because they are hidden behind nearer objects.
+
+    The markers are returned nearest first. The result can be narrowed before
+    any markers are constructed:
+
+    :param include:      Only markers for which this returns true are returned.
+    :param max_distance: Only markers nearer than this (in metres) are returned.
+    :param limit:        At most this many (nearest) markers are returned.
+
+    Objects which are excluded still hide those behind them.
     """
 
-    markers_with_info = sorted(
-        (
-            build_marker_info(x)
-            for x in objects
-        ),
-        key=lambda x: x[0].position.magnitude(),
-    )
+    markers: list[tuple[FiducialMarker, TRecognised]] = []
+    if limit is not None and limit <= 0:
+        return markers
+
+    nearer = RectangleIndex()
+
+    for distance, recognised_object in _nearest_first(objects):
+        if max_distance is not None and distance >= max_distance:
+            # Everything else is further away, so can neither be included nor
+            # hide anything which is.
+            break
+
+        rectangle = image_rectangle(recognised_object.recognition_object)
+
+        if (
+            (include is None or include(recognised_object)) and
+            not is_occluded(rectangle, nearer, occlusion_threshold)
+        ):
+            marker, _, _ = build_marker_info(recognised_object, rectangle)
+            if marker.is_visible_to_global_origin():
+                markers.append((marker, recognised_object))
+                if len(markers) == limit:
+                    break
 
-    markers = []
-    for marker, _, recognised_object in markers_with_info:
-        if marker.is_visible_to_global_origin():
-            markers.append((marker, recognised_object))
+        # Even occluded objects still hide whatever is behind them.
+        nearer.add(rectangle)
 
     return markers
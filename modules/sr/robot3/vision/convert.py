@@ -7,11 +7,11 @@ competitor-friendly format.
 
 from __future__ import annotations
 
-import math
 import argparse
 from typing import NamedTuple
 
-from sr.robot3.coordinates.matrix import Matrix
+from sr.robot3.coordinates.matrix import Mat3
+from sr.robot3.coordinates.quaternion import Quaternion
 
 from .types import Orientation
 
@@ -23,7 +23,7 @@ class WebotsOrientation(NamedTuple):
     theta: float
 
 
-def rotation_matrix_from_axis_and_angle(orientation: WebotsOrientation) -> Matrix:
+def quaternion_from_axis_and_angle(orientation: WebotsOrientation) -> Quaternion:
     x, y, z, theta = orientation
 
     size = round(x ** 2 + y ** 2 + z ** 2, 5)
@@ -33,65 +33,25 @@ def rotation_matrix_from_axis_and_angle(orientation: WebotsOrientation) -> Matri
             size,
         ))
 
-    cos_theta = math.cos(theta)
-    one_minus_cos_theta = 1 - cos_theta
-    sin_theta = math.sin(theta)
-
-    x_sin_theta = x * sin_theta
-    y_sin_theta = y * sin_theta
-    z_sin_theta = z * sin_theta
-
-    x_y_one_minus_cos_theta = x * y * one_minus_cos_theta
-    x_z_one_minus_cos_theta = x * z * one_minus_cos_theta
-    y_z_one_minus_cos_theta = y * z * one_minus_cos_theta
-
-    # From https://en.wikipedia.org/wiki/Rotation_matrix#Rotation_matrix_from_axis_and_angle
-    return Matrix((
-        (
-            cos_theta + x ** 2 * one_minus_cos_theta,
-            x_y_one_minus_cos_theta - z_sin_theta,
-            x_z_one_minus_cos_theta + y_sin_theta,
-        ),
-        (
-            x_y_one_minus_cos_theta + z_sin_theta,
-            cos_theta + y ** 2 * one_minus_cos_theta,
-            y_z_one_minus_cos_theta - x_sin_theta,
-        ),
-        (
-            x_z_one_minus_cos_theta - y_sin_theta,
-            y_z_one_minus_cos_theta + x_sin_theta,
-            cos_theta + z ** 2 * one_minus_cos_theta,
-        ),
-    ))
+    return Quaternion.from_axis_angle((x, y, z), theta)
 
 
-def yaw_pitch_roll_from_axis_and_angle(orientation: WebotsOrientation) -> Orientation:
-    _x, _y, _z, theta = orientation
+def rotation_matrix_from_axis_and_angle(orientation: WebotsOrientation) -> Mat3:
+    return quaternion_from_axis_and_angle(orientation).to_matrix()
 
-    size = round(_x ** 2 + _y ** 2 + _z ** 2, 5)
-    if size != 1:
-        raise ValueError(
-            f"Orientation vector {orientation[:3]} is not a unit vector (length is {size})",
-        )
-
-    # Remap the axes to match the kit's coordinate system
-    x, y, z = -_x, _y, -_z
-
-    sin_theta = math.sin(theta)
-    one_minus_cos_theta = 1 - math.cos(theta)
-
-    # Calculate the intrinsic Tait-Bryan angles following the z-y'-x'' convention
-    # Approximately https://w.wiki/7cuk with some sign corrections,
-    # adapted to axis-angle and simplified
-    yaw = math.atan2(
-        z * sin_theta - x * y * one_minus_cos_theta,
-        1 - (y ** 2 + z ** 2) * one_minus_cos_theta,
-    )
-    pitch = math.asin(x * z * one_minus_cos_theta + y * sin_theta)
-    roll = math.atan2(
-        x * sin_theta - y * z * one_minus_cos_theta,
-        1 - (x ** 2 + y ** 2) * one_minus_cos_theta,
-    )
+
+def yaw_pitch_roll_from_quaternion(rotation: Quaternion) -> Orientation:
+    w, _x, _y, _z = rotation
+
+    # Remap the axes to match the kit's coordinate system. This is a half turn
+    # about the y axis, which maps the rotation about (x, y, z) to one about
+    # (-x, y, -z).
+    kit_rotation = Quaternion(w, -_x, _y, -_z)
+
+    # The kit's yaw, pitch and roll are Tait-Bryan angles about the remapped
+    # z, y and x axes respectively. Approximately https://w.wiki/7cuk with some
+    # sign corrections.
+    roll, pitch, yaw = kit_rotation.euler_angles()
 
     return Orientation(
         yaw=yaw,
@@ -100,6 +60,10 @@ def yaw_pitch_roll_from_axis_and_angle(orientation: WebotsOrientation) -> Orient
     )
 
 
+def yaw_pitch_roll_from_axis_and_angle(orientation: WebotsOrientation) -> Orientation:
+    return yaw_pitch_roll_from_quaternion(quaternion_from_axis_and_angle(orientation))
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser()
     parser.add_argument('x')
@@ -28,6 +28,12 @@ class Rectangle:
             (p_x + s_x, p_y + s_y),
         )
 
+    @classmethod
+    def from_centre(cls, centre: Point, size: Size) -> Rectangle:
+        c_x, c_y = centre
+        s_x, s_y = size
+        return cls((c_x - s_x // 2, c_y - s_y // 2), size)
+
     @property
     def x_min(self) -> int:
         (x_1, y_1), (x_2, y_2) = self.corners
@@ -48,6 +54,10 @@ class Rectangle:
         (x_1, y_1), (x_2, y_2) = self.corners
         return max(y_1, y_2)
 
+    @property
+    def area(self) -> int:
+        return (self.x_max - self.x_min) * (self.y_max - self.y_min)
+
     def overlaps(self, other: Rectangle) -> bool:
         # If one rectangle fully contains the other then we want the "outer" one
         # to be in `a`. this helps ensure that this is symmetrical.
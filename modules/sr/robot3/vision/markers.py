@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import math
+import functools
 
 from sr.robot3.coordinates import vectors
 from sr.robot3.coordinates.matrix import Matrix
-from sr.robot3.coordinates.vectors import Vector
+from sr.robot3.coordinates.vectors import Vec3, Vector
+from sr.robot3.coordinates.quaternion import Quaternion
 
 DEFAULT_SIZE = 1
 
@@ -12,54 +14,105 @@ NINETY_DEGREES = math.pi / 2
 DEFAULT_ANGLE_TOLERANCE = math.radians(80)
 
 
+# The dimensions here need to end up matching those passed to the marker as
+# defined in `protos/Markers/MarkerBase.proto`.
+THICKNESS = 0.0001
+
+# Choose what Webots thinks of as the "rear" face -- the one nearer the camera.
+FACE_OFFSET = -THICKNESS / 2
+
+IDENTITY = Quaternion.identity()
+
+
+@functools.lru_cache(maxsize=None)
+def _corner_template(size: float) -> tuple[tuple[str, Vec3], ...]:
+    """
+    The corners of an unrotated marker of the given size, relative to its
+    centre. These are shared by all markers of the same size.
+    """
+    half_size = size / 2
+    return (
+        ('top-left', Vec3(FACE_OFFSET, half_size, half_size)),
+        ('bottom-left', Vec3(FACE_OFFSET, half_size, -half_size)),
+
+        ('top-right', Vec3(FACE_OFFSET, -half_size, half_size)),
+        ('bottom-right', Vec3(FACE_OFFSET, -half_size, -half_size)),
+    )
+
+
 class FiducialMarker:
     """
     Represents a 2D fiducial marker which knows its position in space and can be
     rotated.
 
-    Internally this stores its position in space separately from the positions
-    of its corners, which are stored relative to the centre of the square that
-    represents the marker.
+    Internally this stores its position in space and its rotation; the
+    positions of its corners relative to the centre of the square that
+    represents the marker are only computed when asked for. The normal and
+    centre depend only on the rotation, so are computed directly.
 
     Instances of this type must have had their proper orientation applied in the
     world file.
     """
 
+    __slots__ = ('position', 'size', '_rotation')
+
     def __init__(
         self,
         position: Vector,
         size: float = DEFAULT_SIZE,
     ) -> None:
         self.position = position
+        self.size = size
+        self._rotation = IDENTITY
 
-        # The dimensions here need to end up matching those passed to the marker
-        # as defined in `protos/Markers/MarkerBase.proto`.
-
-        thickness = 0.0001 / 2
-        size = size / 2
-
-        # Choose what Webots thinks of as the "rear" face -- the one nearer the
-        # camera.
-        offset = -thickness
-
-        self.corners = {
-            'top-left': Vector((offset, size, size)),
-            'bottom-left': Vector((offset, size, -size)),
-
-            'top-right': Vector((offset, -size, size)),
-            'bottom-right': Vector((offset, -size, -size)),
+    @property
+    def corners(self) -> dict[str, Vec3]:
+        """
+        A mapping of the corners of the marker (named for their apparent
+        position on a reference marker) to their position relative to the
+        centre of the marker.
+        """
+        rotation = self._rotation.to_matrix()
+        return {
+            name: rotation * corner
+            for name, corner in _corner_template(self.size)
         }
 
-    def rotate(self, matrix: Matrix) -> None:
+    @property
+    def rotation(self) -> Quaternion:
         """
-        Rotate the marker by the given rotation matrix.
+        The total rotation which has been applied to the marker.
         """
-        self.corners = {
-            name: matrix * position
-            for name, position in self.corners.items()
-        }
+        return self._rotation
 
-    def corners_global(self) -> dict[str, Vector]:
+    def rotate(self, rotation: Quaternion | Matrix) -> None:
+        """
+        Rotate the marker by the given rotation or rotation matrix.
+
+        A `ValueError` is raised if a matrix is given which isn't a rotation.
+        """
+        if isinstance(rotation, Matrix):
+            if rotation.dimensions != (3, 3):
+                raise ValueError(f"Cannot rotate by a {rotation.dimensions} matrix")
+            rotation = Quaternion.from_matrix(rotation)
+
+        if self._rotation is IDENTITY:
+            self._rotation = rotation
+        else:
+            self._rotation = rotation * self._rotation
+
+    def _x_axis(self) -> Vec3:
+        # All the corners share the same x offset and their other coordinates
+        # cancel out, so their sum is `4 * FACE_OFFSET` along the (rotated) x
+        # axis, which is the first column of the rotation matrix.
+        w, x, y, z = self._rotation
+        return Vec3(
+            1 - 2 * (y * y + z * z),
+            2 * (x * y + w * z),
+            2 * (x * z - w * y),
+        )
+
+    def corners_global(self) -> dict[str, Vec3]:
         """
         A mapping of the corners of the marker (named for their apparent
         position on a reference marker) to the current position of that corner
@@ -71,24 +124,21 @@ class FiducialMarker:
             for name, position in self.corners.items()
         }
 
-    def normal(self) -> Vector:
+    def normal(self) -> Vec3:
         """
         A unit vector expressing the direction normal to the marker.
         """
-        return vectors.unit_vector(sum(
-            self.corners.values(),
-            vectors.ZERO_3VECTOR,
-        ))
+        # The sum of the corners points along the x axis, away from the face
+        # (since the offset is negative).
+        x_axis = self._x_axis()
+        return x_axis / -x_axis.magnitude()
 
-    def centre_global(self) -> Vector:
+    def centre_global(self) -> Vec3:
         """
         The position of the centre of the marker, relative to the same origin as
         used to define the general position of the marker.
         """
-        corners = self.corners_global().values()
-        assert len(corners) == 4
-        normal = sum(corners, vectors.ZERO_3VECTOR)
-        return normal / 4
+        return FACE_OFFSET * self._x_axis() + self.position
 
     def angle_to_global_origin(self) -> float:
         direction_to_origin = -self.centre_global()
@@ -111,17 +161,11 @@ class FiducialMarker:
         angle_to_origin = self.angle_to_global_origin()
         return abs(angle_to_origin) < angle_tolerance
 
-    def top_midpoint(self) -> Vector:
+    def top_midpoint(self) -> Vec3:
         """
         The midpoint of the edge which the marker determines to be the "top"
         edge. It usually doesn't actually matter which edge this is, though in
         some games it does.
         """
-        corners = [
-            v
-            for n, v in self.corners.items()
-            if 'top' in n
-        ]
-        assert len(corners) == 2, "Wrong number of corners for 'top' edge"
-        a, b = corners
-        return (a + b) / 2
+        # The top corners are at (offset, ±size/2, size/2) before rotation.
+        return self._rotation.rotate(Vec3(FACE_OFFSET, 0, self.size / 2))
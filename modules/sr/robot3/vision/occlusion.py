@@ -0,0 +1,232 @@
+"""
+Detection of objects which are hidden behind nearer objects in an image.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Sequence
+
+from .image import Rectangle
+
+# Objects which have more than this fraction of their area covered by nearer
+# objects are considered to be occluded.
+DEFAULT_OCCLUSION_THRESHOLD = 0.5
+
+# Seeded so that the shape of the `RectangleIndex` trees is reproducible.
+_PRIORITIES = random.Random(0)
+
+
+class _Node:
+    __slots__ = (
+        'rectangle',
+        'x_min',
+        'x_max',
+        'y_min',
+        'y_max',
+        'priority',
+        'subtree_x_max',
+        'left',
+        'right',
+    )
+
+    def __init__(self, rectangle: Rectangle, priority: float) -> None:
+        self.rectangle = rectangle
+        self.x_min = rectangle.x_min
+        self.x_max = rectangle.x_max
+        self.y_min = rectangle.y_min
+        self.y_max = rectangle.y_max
+        self.priority = priority
+        # The largest `x_max` of any rectangle in this subtree
+        self.subtree_x_max = self.x_max
+        self.left: _Node | None = None
+        self.right: _Node | None = None
+
+    def update(self) -> None:
+        subtree_x_max = self.x_max
+        if self.left is not None and self.left.subtree_x_max > subtree_x_max:
+            subtree_x_max = self.left.subtree_x_max
+        if self.right is not None and self.right.subtree_x_max > subtree_x_max:
+            subtree_x_max = self.right.subtree_x_max
+        self.subtree_x_max = subtree_x_max
+
+
+def _insert(node: _Node | None, new: _Node) -> _Node:
+    if node is None:
+        return new
+
+    if new.x_min < node.x_min:
+        node.left = child = _insert(node.left, new)
+        if child.priority > node.priority:
+            # Rotate right
+            node.left = child.right
+            child.right = node
+            node.update()
+            node = child
+    else:
+        node.right = child = _insert(node.right, new)
+        if child.priority > node.priority:
+            # Rotate left
+            node.right = child.left
+            child.left = node
+            node.update()
+            node = child
+
+    node.update()
+    return node
+
+
+def _overlapping(node: _Node | None, query: _Node, result: list[Rectangle]) -> None:
+    # Subtrees whose rectangles all end before the query starts can't overlap
+    # it, nor can any which start after it ends (which, since the tree is
+    # ordered by `x_min`, includes everything to the right of such a node).
+    if node is None or node.subtree_x_max <= query.x_min:
+        return
+
+    _overlapping(node.left, query, result)
+
+    if node.x_min < query.x_max:
+        if (
+            node.x_max > query.x_min and
+            node.y_min < query.y_max and
+            node.y_max > query.y_min
+        ):
+            result.append(node.rectangle)
+
+        _overlapping(node.right, query, result)
+
+
+class RectangleIndex:
+    """
+    An index of rectangles which supports finding those which overlap a given
+    rectangle without comparing against every rectangle in the index.
+
+    This is an interval tree over the rectangles' x ranges, kept balanced as a
+    treap (with random priorities). Adding a rectangle takes O(log n) expected
+    time and finding the m rectangles which overlap a query in x takes
+    O((m + 1) log n), regardless of the sizes of the rectangles.
+    """
+
+    def __init__(self) -> None:
+        self._root: _Node | None = None
+
+    def add(self, rectangle: Rectangle) -> None:
+        self._root = _insert(self._root, _Node(rectangle, _PRIORITIES.random()))
+
+    def overlapping(self, rectangle: Rectangle) -> list[Rectangle]:
+        """
+        The rectangles in the index which overlap the given one, in order of
+        their minimum x coordinate.
+        """
+        result: list[Rectangle] = []
+        _overlapping(self._root, _Node(rectangle, 0), result)
+        return result
+
+
+class _CoverageTree:
+    """
+    A segment tree over a fixed set of y coordinates which tracks the total
+    length covered by the ranges added to it.
+    """
+
+    def __init__(self, ys: Sequence[int]) -> None:
+        self._ys = ys
+        self._segments = len(ys) - 1
+        self._counts = [0] * (4 * self._segments)
+        self._lengths = [0] * (4 * self._segments)
+
+    @property
+    def covered(self) -> int:
+        return self._lengths[1]
+
+    def add(self, start: int, end: int, delta: int) -> None:
+        """
+        Add (or, with a negative delta, remove) a range, given as indices into
+        the y coordinates.
+        """
+        self._add(1, 0, self._segments, start, end, delta)
+
+    def _add(
+        self,
+        node: int,
+        node_start: int,
+        node_end: int,
+        start: int,
+        end: int,
+        delta: int,
+    ) -> None:
+        if end <= node_start or node_end <= start:
+            return
+
+        if start <= node_start and node_end <= end:
+            self._counts[node] += delta
+        else:
+            middle = (node_start + node_end) // 2
+            self._add(2 * node, node_start, middle, start, end, delta)
+            self._add(2 * node + 1, middle, node_end, start, end, delta)
+
+        if self._counts[node] > 0:
+            self._lengths[node] = self._ys[node_end] - self._ys[node_start]
+        elif node_end - node_start == 1:
+            self._lengths[node] = 0
+        else:
+            self._lengths[node] = self._lengths[2 * node] + self._lengths[2 * node + 1]
+
+
+def covered_area(rectangle: Rectangle, others: Sequence[Rectangle]) -> int:
+    """
+    The area of the given rectangle which is covered by the union of the other
+    rectangles.
+
+    This sweeps across the rectangles in x, tracking the covered length in y,
+    so takes O(k log k) time for k other rectangles.
+    """
+    clipped = [
+        (
+            max(other.x_min, rectangle.x_min),
+            min(other.x_max, rectangle.x_max),
+            max(other.y_min, rectangle.y_min),
+            min(other.y_max, rectangle.y_max),
+        )
+        for other in others
+    ]
+    clipped = [x for x in clipped if x[0] < x[1] and x[2] < x[3]]
+    if not clipped:
+        return 0
+
+    ys = sorted({y for _, _, y_min, y_max in clipped for y in (y_min, y_max)})
+    y_indices = {y: index for index, y in enumerate(ys)}
+
+    events = sorted(
+        event
+        for x_min, x_max, y_min, y_max in clipped
+        for event in (
+            (x_min, 1, y_indices[y_min], y_indices[y_max]),
+            (x_max, -1, y_indices[y_min], y_indices[y_max]),
+        )
+    )
+
+    coverage = _CoverageTree(ys)
+    area = 0
+    previous_x = events[0][0]
+    for x, delta, start, end in events:
+        area += coverage.covered * (x - previous_x)
+        coverage.add(start, end, delta)
+        previous_x = x
+
+    return area
+
+
+def is_occluded(
+    rectangle: Rectangle,
+    nearer: RectangleIndex,
+    threshold: float = DEFAULT_OCCLUSION_THRESHOLD,
+) -> bool:
+    """
+    Whether the given rectangle is mostly covered by those of nearer objects.
+    """
+    area = rectangle.area
+    if not area:
+        return False
+    covered = covered_area(rectangle, nearer.overlapping(rectangle))
+    return covered / area > threshold
@@ -2,17 +2,46 @@
 
 from __future__ import annotations
 
+import math
+import random
 import unittest
-from typing import Tuple
+import dataclasses
+from typing import Tuple, Callable, Sequence, NamedTuple
 
-from sr.robot3.coordinates import vectors
+from controller import CameraRecognitionObject as WebotsRecognitionObject
+from sr.robot3.fakes import FakeRecognitionObject
+from sr.robot3.camera import Marker, Detections
+from sr.robot3.vision import convert, occlusion
+from sr.robot3.vision.api import markers_from_objects
+from sr.robot3.coordinates import vectors, Position, Quaternion
 from sr.robot3.vision.image import Rectangle
 from sr.robot3.vision.markers import FiducialMarker
+from sr.robot3.vision.tracking import MarkerTracker
+from sr.robot3.coordinates.matrix import Matrix
 from sr.robot3.coordinates.vectors import Vector
 
 SimpleVector = Tuple[float, float, float]
 
 
+@dataclasses.dataclass(frozen=True)
+class SimpleMarkerInfo:
+    recognition_object: WebotsRecognitionObject
+    size_m: float = 0.2
+
+
+def random_marker_info(rand: random.Random) -> SimpleMarkerInfo:
+    axis = vectors.unit_vector(Vector(rand.uniform(-1, 1) for _ in range(3)))
+    x, y, z = axis.data
+    distance = rand.uniform(0.1, 5)
+    size = int(20 / distance)
+    return SimpleMarkerInfo(FakeRecognitionObject(
+        position=(distance, rand.uniform(-2, 2), rand.uniform(-1, 1)),
+        orientation=(x, y, z, rand.uniform(-math.pi, math.pi)),
+        position_on_image=(rand.randrange(800), rand.randrange(600)),
+        size_on_image=(size, size),
+    ))
+
+
 class FaceTests(unittest.TestCase):
     def test_normals(self) -> None:
         marker = FiducialMarker(
@@ -41,6 +70,50 @@ class FaceTests(unittest.TestCase):
             "Wrong top edge midpoint",
         )
 
+    def test_rotate_by_non_rotation(self) -> None:
+        marker = FiducialMarker(position=Vector((2, 0, 0)))
+
+        with self.assertRaises(ValueError):
+            marker.rotate(Matrix(((2, 0, 0), (0, 2, 0), (0, 0, 2))))
+
+        with self.assertRaises(ValueError):
+            marker.rotate(Matrix(((1, 0), (0, 1))))
+
+        self.assertEqual(Quaternion.identity(), marker.rotation)
+
+    def test_rotated(self) -> None:
+        marker = FiducialMarker(
+            position=Vector((2, 0, 0)),
+            size=0.2,
+        )
+        eighth_turn = convert.rotation_matrix_from_axis_and_angle(
+            convert.WebotsOrientation(0, 0, 1, math.pi / 4),
+        )
+        marker.rotate(eighth_turn)
+        marker.rotate(eighth_turn)
+
+        self.assertEqual(
+            Vector((0, -1, 0)),
+            round(marker.normal(), 10),
+            "Wrong normal unit vector",
+        )
+        self.assertEqual(
+            Vector((2, -0.0001 / 2, 0)),
+            round(marker.centre_global(), 10),
+            "Wrong centre",
+        )
+        self.assertEqual(
+            Vector((-0.1, -0.0001 / 2, 0.1)),
+            round(marker.corners['top-left'], 10),
+            "Wrong top-left corner",
+        )
+        corners_sum = sum(marker.corners_global().values(), vectors.ZERO_3VECTOR)
+        self.assertEqual(
+            round(marker.centre_global(), 10),
+            round(corners_sum / 4, 10),
+            "Centre should be the mean of the corners",
+        )
+
 
 class RectangleTests(unittest.TestCase):
     def test_no_overlap(self) -> None:
@@ -69,6 +142,15 @@ class RectangleTests(unittest.TestCase):
         self.assertTrue(a.overlaps(b), f"{a} should overlap {b}")
         self.assertTrue(b.overlaps(a), f"{b} should overlap {a}")
 
+    def test_from_centre(self) -> None:
+        self.assertEqual(
+            Rectangle((1, 2), (4, 6)),
+            Rectangle.from_centre((3, 5), (4, 6)),
+        )
+
+    def test_area(self) -> None:
+        self.assertEqual(6, Rectangle((1, 1), (2, 3)).area)
+
     def test_has_overlap_contained(self) -> None:
         a = Rectangle((1, 1), (5, 5))
         b = Rectangle((2, 2), (2, 2))
@@ -77,5 +159,312 @@ class RectangleTests(unittest.TestCase):
         self.assertTrue(b.overlaps(a), f"{b} should overlap {a}")
 
 
+def find_occluded(
+    rectangles: Sequence[Rectangle],
+    threshold: float = occlusion.DEFAULT_OCCLUSION_THRESHOLD,
+) -> set[int]:
+    """
+    The indices of the given rectangles, ordered nearest first, which are
+    occluded, checked the same way as `markers_from_objects` does.
+    """
+    occluded = set()
+    index = occlusion.RectangleIndex()
+    for position, rectangle in enumerate(rectangles):
+        if occlusion.is_occluded(rectangle, index, threshold):
+            occluded.add(position)
+        index.add(rectangle)
+    return occluded
+
+
+class OcclusionTests(unittest.TestCase):
+    def test_not_occluded(self) -> None:
+        rectangles = [
+            Rectangle((0, 0), (10, 10)),
+            Rectangle((20, 0), (10, 10)),
+            # Partly covered
+            Rectangle((5, 5), (10, 10)),
+        ]
+
+        self.assertEqual(set(), find_occluded(rectangles))
+
+    def test_covered_by_nearer(self) -> None:
+        rectangles = [
+            Rectangle((0, 0), (10, 10)),
+            Rectangle((2, 2), (5, 5)),
+        ]
+
+        self.assertEqual({1}, find_occluded(rectangles))
+
+    def test_not_covered_by_further(self) -> None:
+        rectangles = [
+            Rectangle((2, 2), (5, 5)),
+            Rectangle((0, 0), (10, 10)),
+        ]
+
+        self.assertEqual(set(), find_occluded(rectangles))
+
+    def test_covered_by_several_nearer(self) -> None:
+        rectangles = [
+            Rectangle((0, 0), (4, 10)),
+            Rectangle((6, 0), (4, 10)),
+            # Partly covered by the previous two
+            Rectangle((3, 8), (4, 2)),
+            Rectangle((0, 0), (10, 10)),
+        ]
+
+        self.assertEqual({3}, find_occluded(rectangles))
+        self.assertEqual(set(), find_occluded(rectangles, threshold=0.9))
+
+    def test_covered_area(self) -> None:
+        target = Rectangle((0, 0), (10, 10))
+        others = [
+            Rectangle((-5, -5), (10, 10)),
+            Rectangle((0, 0), (5, 5)),
+            Rectangle((8, 8), (10, 10)),
+        ]
+
+        self.assertEqual(29, occlusion.covered_area(target, others))
+
+    def test_index(self) -> None:
+        index = occlusion.RectangleIndex()
+        wide = Rectangle((0, 0), (100, 5))
+        narrow = Rectangle((90, 0), (5, 5))
+        distant = Rectangle((200, 0), (5, 5))
+        for rectangle in (wide, narrow, distant):
+            index.add(rectangle)
+
+        self.assertEqual(
+            [wide, narrow],
+            index.overlapping(Rectangle((92, 2), (1, 1))),
+        )
+
+    def test_wide_occluder(self) -> None:
+        # A wide rectangle in front of many narrow ones, some of which are
+        # behind it and some of which are below it.
+        rectangles = [Rectangle((0, 0), (1000, 10))]
+        for x in range(0, 1000, 10):
+            rectangles.append(Rectangle((x, 5 if x % 20 else 20), (5, 10)))
+
+        self.assertEqual(
+            {position for position in range(1, 101) if position % 2 == 0},
+            find_occluded(rectangles, threshold=0.4),
+        )
+
+        index = occlusion.RectangleIndex()
+        for rectangle in rectangles:
+            index.add(rectangle)
+
+        self.assertEqual(
+            [rectangles[0], rectangles[52]],
+            index.overlapping(Rectangle((510, 8), (2, 2))),
+        )
+
+    def test_index_matches_brute_force(self) -> None:
+        rand = random.Random(0)
+        rectangles = [
+            Rectangle(
+                (rand.randrange(200), rand.randrange(200)),
+                (rand.randrange(1, 100), rand.randrange(1, 20)),
+            )
+            for _ in range(100)
+        ]
+
+        index = occlusion.RectangleIndex()
+        for position, rectangle in enumerate(rectangles):
+            nearer = rectangles[:position]
+            expected = [
+                other
+                for other in nearer
+                if (
+                    other.x_min < rectangle.x_max and
+                    other.x_max > rectangle.x_min and
+                    other.y_min < rectangle.y_max and
+                    other.y_max > rectangle.y_min
+                )
+            ]
+            actual = index.overlapping(rectangle)
+            self.assertEqual(
+                sorted(expected, key=lambda x: x.corners),
+                sorted(actual, key=lambda x: x.corners),
+            )
+            self.assertEqual(
+                sum(
+                    1
+                    for x in range(rectangle.x_min, rectangle.x_max)
+                    for y in range(rectangle.y_min, rectangle.y_max)
+                    if any(
+                        other.x_min <= x < other.x_max and
+                        other.y_min <= y < other.y_max
+                        for other in expected
+                    )
+                ),
+                occlusion.covered_area(rectangle, actual),
+            )
+
+            index.add(rectangle)
+
+    def test_markers_from_objects(self) -> None:
+        infos = [
+            SimpleMarkerInfo(FakeRecognitionObject(
+                position=(2, 0, 0),
+                orientation=(0, 0, 1, 0),
+                position_on_image=(400, 300),
+                size_on_image=(20, 20),
+            )),
+            SimpleMarkerInfo(FakeRecognitionObject(
+                position=(1, 0, 0),
+                orientation=(0, 0, 1, 0),
+                position_on_image=(400, 300),
+                size_on_image=(40, 40),
+            )),
+        ]
+
+        self.assertEqual(
+            [infos[1]],
+            [x for _, x in markers_from_objects(infos)],
+        )
+
+
+class Query(NamedTuple):
+    include: Callable[[SimpleMarkerInfo], bool] | None = None
+    max_distance: float | None = None
+    limit: int | None = None
+
+
+class FilterTests(unittest.TestCase):
+    QUERIES = [
+        Query(include=lambda x: x.recognition_object.getPosition()[1] > 0),
+        Query(max_distance=2.5),
+        Query(limit=3),
+        Query(limit=0),
+        Query(
+            include=lambda x: x.recognition_object.getPosition()[2] > 0,
+            max_distance=4,
+            limit=2,
+        ),
+    ]
+
+    def setUp(self) -> None:
+        rand = random.Random(11)
+        self.infos = [random_marker_info(rand) for _ in range(100)]
+
+    def filtered(
+        self,
+        infos: Sequence[SimpleMarkerInfo],
+        query: Query,
+    ) -> list[SimpleMarkerInfo]:
+        max_distance = math.inf if query.max_distance is None else query.max_distance
+        matching = [
+            x
+            for x in infos
+            if (
+                (query.include is None or query.include(x)) and
+                Vector(x.recognition_object.getPosition()).magnitude() < max_distance
+            )
+        ]
+        return matching[:query.limit]
+
+    def test_markers_from_objects(self) -> None:
+        unfiltered = [x for _, x in markers_from_objects(self.infos)]
+
+        for query in self.QUERIES:
+            with self.subTest(query):
+                actual = markers_from_objects(
+                    self.infos,
+                    include=query.include,
+                    max_distance=query.max_distance,
+                    limit=query.limit,
+                )
+                self.assertEqual(
+                    self.filtered(unfiltered, query),
+                    [x for _, x in actual],
+                )
+
+
+class TrackerTests(unittest.TestCase):
+    def frame(self, timestamp: float, *positions: tuple[int, Position]) -> Detections:
+        return Detections(
+            [Marker(id=x, size=200, position=y) for x, y in positions],
+            timestamp=timestamp,
+        )
+
+    def test_new_track(self) -> None:
+        tracker = MarkerTracker()
+        position = Position(1000, 0.1, 0.2)
+
+        tracker.update(self.frame(1, (4, position)))
+
+        track = tracker[4]
+        self.assertEqual(position, track.position)
+        self.assertEqual(0, track.radial_velocity)
+        self.assertEqual(0, track.angular_velocity)
+        self.assertEqual((1, 1), (track.first_seen, track.last_seen))
+        self.assertIsNone(tracker.get(5))
+
+    def test_velocity(self) -> None:
+        tracker = MarkerTracker(smoothing=1)
+
+        tracker.update(self.frame(1, (4, Position(1000, 0.1, 0))))
+        tracker.update(self.frame(1.5, (4, Position(1100, 0.2, 0))))
+
+        track = tracker[4]
+        self.assertEqual(Position(1100, 0.2, 0), track.position)
+        self.assertAlmostEqual(200, track.radial_velocity)
+        self.assertAlmostEqual(0.2, track.angular_velocity)
+        self.assertEqual(1.5, track.last_seen)
+
+    def test_smoothing(self) -> None:
+        tracker = MarkerTracker(smoothing=0.5)
+
+        tracker.update(self.frame(0, (4, Position(1000, 0, 0))))
+        tracker.update(self.frame(1, (4, Position(2000, 0, 0))))
+        tracker.update(self.frame(2, (4, Position(2000, 0, 0))))
+
+        track = tracker[4]
+        self.assertEqual(1750, track.position.distance)
+        self.assertEqual(375, track.radial_velocity)
+
+    def test_angle_wraps(self) -> None:
+        tracker = MarkerTracker(smoothing=1)
+
+        tracker.update(self.frame(0, (4, Position(1000, math.pi - 0.1, 0))))
+        tracker.update(self.frame(1, (4, Position(1000, -math.pi + 0.1, 0))))
+
+        self.assertAlmostEqual(0.2, tracker[4].angular_velocity)
+
+    def test_smoothed_angle_wraps(self) -> None:
+        tracker = MarkerTracker(smoothing=0.5)
+
+        tracker.update(self.frame(0, (4, Position(1000, math.pi - 0.05, 0))))
+        tracker.update(self.frame(1, (4, Position(1000, -math.pi + 0.15, 0))))
+
+        # Halfway between the two, the short way round across the seam
+        self.assertAlmostEqual(-math.pi + 0.05, tracker[4].position.horizontal_angle)
+        self.assertAlmostEqual(0.1, tracker[4].angular_velocity)
+
+    def test_nearest_duplicate_used(self) -> None:
+        tracker = MarkerTracker()
+
+        tracker.update(self.frame(
+            0,
+            (4, Position(1000, 0, 0)),
+            (4, Position(2000, 0, 0)),
+        ))
+
+        self.assertEqual(1000, tracker[4].position.distance)
+
+    def test_expiry(self) -> None:
+        tracker = MarkerTracker(max_age=1)
+
+        tracker.update(self.frame(0, (4, Position(1000, 0, 0))))
+        tracker.update(self.frame(1, (5, Position(1000, 0, 0))))
+        self.assertEqual([4, 5], [x.id for x in tracker])
+
+        tracker.update(self.frame(1.5))
+        self.assertNotIn(4, tracker)
+        self.assertIn(5, tracker)
+        self.assertEqual(1, len(tracker))
+
+
 if __name__ == '__main__':
     unittest.main()
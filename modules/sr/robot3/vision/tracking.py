@@ -0,0 +1,187 @@
+"""
+Tracking of markers across successive frames from a camera.
+"""
+
+from __future__ import annotations
+
+import math
+import dataclasses
+from typing import Iterator, TYPE_CHECKING
+
+from sr.robot3.coordinates import Position
+
+if TYPE_CHECKING:
+    from sr.robot3.camera import Marker, Detections
+
+# How much weight to give each new observation when smoothing, between 0
+# (ignore new observations) and 1 (no smoothing).
+DEFAULT_SMOOTHING = 0.5
+
+# How long a marker can go unseen before its track is dropped, in seconds.
+DEFAULT_MAX_AGE = 1.0
+
+
+def _blend(old: float, new: float, smoothing: float) -> float:
+    return old + smoothing * (new - old)
+
+
+def _angle_difference(a: float, b: float) -> float:
+    """
+    The signed difference `a - b` between two angles, in the range -pi to pi.
+    """
+    return math.remainder(a - b, math.tau)
+
+
+def _blend_angle(old: float, new: float, smoothing: float) -> float:
+    """
+    Blend two angles the short way round, giving a result in the range -pi to
+    pi.
+    """
+    return math.remainder(old + smoothing * _angle_difference(new, old), math.tau)
+
+
+@dataclasses.dataclass
+class Track:
+    """
+    The history of a single marker as seen by the camera.
+
+    :param id:               The id of the marker being tracked.
+    :param position:         The smoothed position of the marker.
+    :param radial_velocity:  The rate at which the marker's distance from the
+                             camera is changing, in millimetres per second.
+                             Positive values indicate that it is moving away.
+    :param angular_velocity: The rate at which the marker's horizontal angle is
+                             changing, in radians per second. Positive values
+                             indicate that it is moving to the right.
+    :param first_seen:       The time at which the marker was first seen.
+    :param last_seen:        The time at which the marker was most recently seen.
+    :param marker:           The most recent unsmoothed sighting of the marker.
+    """
+
+    id: int  # noqa: A003 # match Marker
+    position: Position
+    radial_velocity: float
+    angular_velocity: float
+    first_seen: float
+    last_seen: float
+    marker: Marker
+
+    def _update(self, marker: Marker, timestamp: float, smoothing: float) -> None:
+        old = self.position
+        new = marker.position
+        elapsed = timestamp - self.last_seen
+
+        self.position = Position(
+            distance=_blend(old.distance, new.distance, smoothing),
+            horizontal_angle=_blend_angle(
+                old.horizontal_angle,
+                new.horizontal_angle,
+                smoothing,
+            ),
+            vertical_angle=_blend_angle(old.vertical_angle, new.vertical_angle, smoothing),
+        )
+
+        radial_velocity = (self.position.distance - old.distance) / elapsed
+        angular_velocity = _angle_difference(
+            self.position.horizontal_angle,
+            old.horizontal_angle,
+        ) / elapsed
+
+        if self.first_seen == self.last_seen:
+            # No previous estimate to smooth against.
+            self.radial_velocity = radial_velocity
+            self.angular_velocity = angular_velocity
+        else:
+            self.radial_velocity = _blend(self.radial_velocity, radial_velocity, smoothing)
+            self.angular_velocity = _blend(self.angular_velocity, angular_velocity, smoothing)
+
+        self.last_seen = timestamp
+        self.marker = marker
+
+
+class MarkerTracker:
+    """
+    Keeps track of the markers seen in successive frames from a camera,
+    associating sightings by marker id.
+
+    Usage:
+
+        tracker = MarkerTracker()
+        while True:
+            tracker.update(robot.camera.see())
+            track = tracker.get(target_id)
+            if track is not None:
+                ...
+
+    :param smoothing: How much weight to give each new sighting, between 0
+                      (exclusive) and 1 (no smoothing).
+    :param max_age:   How long a marker can go unseen before its track is
+                      dropped, in seconds.
+    """
+
+    def __init__(
+        self,
+        *,
+        smoothing: float = DEFAULT_SMOOTHING,
+        max_age: float = DEFAULT_MAX_AGE,
+    ) -> None:
+        if not 0 < smoothing <= 1:
+            raise ValueError(f"Smoothing must be in the range (0, 1], not {smoothing!r}")
+
+        self.smoothing = smoothing
+        self.max_age = max_age
+        self._tracks: dict[int, Track] = {}
+
+    def update(self, detections: Detections) -> None:
+        """
+        Update the tracks from a frame returned by `Camera.see`.
+
+        Frames must be passed in the order they were captured. If a frame
+        contains several markers with the same id then only the first (which
+        is the nearest) is used.
+        """
+        timestamp = detections.timestamp
+
+        for marker in detections:
+            track = self._tracks.get(marker.id)
+            if track is None:
+                self._tracks[marker.id] = Track(
+                    id=marker.id,
+                    position=marker.position,
+                    radial_velocity=0,
+                    angular_velocity=0,
+                    first_seen=timestamp,
+                    last_seen=timestamp,
+                    marker=marker,
+                )
+            elif track.last_seen < timestamp:
+                track._update(marker, timestamp, self.smoothing)
+
+        expired = [
+            marker_id
+            for marker_id, track in self._tracks.items()
+            if timestamp - track.last_seen > self.max_age
+        ]
+        for marker_id in expired:
+            del self._tracks[marker_id]
+
+    def get(self, marker_id: int) -> Track | None:
+        """
+        Get the track for the given marker, if it has been seen recently.
+        """
+        return self._tracks.get(marker_id)
+
+    def clear(self) -> None:
+        self._tracks.clear()
+
+    def __getitem__(self, marker_id: int) -> Track:
+        return self._tracks[marker_id]
+
+    def __contains__(self, marker_id: object) -> bool:
+        return marker_id in self._tracks
+
+    def __iter__(self) -> Iterator[Track]:
+        return iter(self._tracks.values())
+
+    def __len__(self) -> int:
+        return len(self._tracks)
@@ -260,6 +260,9 @@ class Field:
     def setMFColor(self, index: int, values: list[float]) -> None: ...
     def setMFString(self, index: int, value: str) -> None: ...
 
+    def getCount(self) -> int: ...
+    def importMFNodeFromString(self, position: int, nodeString: str) -> None: ...
+
 
 class Node:
     def getField(self, fieldName: str) -> Field: ...
@@ -287,6 +290,8 @@ class Robot:
     # them from the stub to prevent use.
 
     def getDevice(self, name: str) -> Device | None: ...
+    def getNumberOfDevices(self) -> int: ...
+    def getDeviceByIndex(self, index: int) -> Device: ...
 
 
 # Beware: this type doesn't actually exist in Webots. It's just here for type
@@ -1,2 +1,3 @@
 class Device:
     def getModel(self) -> str: ...
+    def getName(self) -> str: ...